@@ -2,13 +2,16 @@
 FastAPI Backend - Xử lý async, không bị timeout
 File: app/backend.py
 """
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, HTTPException, Request, Query
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
 import uvicorn
 from pathlib import Path
 import asyncio
+import uuid
+import threading
 import sys
 import os
 
@@ -16,10 +19,16 @@ import os
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.utils.logger import setup_logger, logger
-from src.utils.file_handler import is_valid_audio_file, format_file_size
+from src.utils.file_handler import format_file_size
 from config.settings import APP
 from src.services.health_service import HealthService
 from src.services.job_service import job_service
+from src.services.job_scheduler import QueueFullError
+from src.services.job_events import stream_job_events
+from src.services.upload_service import (
+    upload_service, MultipartUpload, UploadTooLargeError, UploadOffsetError,
+    UploadBusyError, MultipartFormatError
+)
 
 # Setup
 setup_logger("voicemeet_api", APP.logs_dir)
@@ -38,81 +47,261 @@ static_dir = Path(__file__).parent / "static"
 static_dir.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
+@app.on_event("startup")
+async def startup():
+    """Start job workers, requeue unfinished jobs and warm up Whisper in the background"""
+    job_service.scheduler.start()
+    job_service.recover()
+    job_service.start_maintenance()
+    threading.Thread(
+        target=job_service.pipeline.residency.start,
+        name="whisper-preload",
+        daemon=True
+    ).start()
+
 # Valid file extensions
 VALID_EXTENSIONS = {'.m4a', '.mp4', '.mp3', '.wav', '.flac'}
 
-@app.post("/api/upload")
-async def upload_audio(file: UploadFile = File(...)):
-    """Upload audio và bắt đầu xử lý"""
+def _queue_full_response(retry_after: int) -> HTTPException:
+    """429 with Retry-After header when the job queue is full"""
+    return HTTPException(
+        status_code=429,
+        detail=f"Hệ thống đang quá tải, vui lòng thử lại sau {retry_after} giây",
+        headers={"Retry-After": str(retry_after)}
+    )
+
+def _validate_extension(filename: str):
+    file_ext = Path(filename).suffix.lower()
+    if file_ext not in VALID_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Định dạng file không được hỗ trợ. Hỗ trợ: {', '.join(VALID_EXTENSIONS)}"
+        )
+
+def _too_large_response() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File quá lớn. Tối đa: {format_file_size(APP.max_file_size)}"
+    )
+
+def _content_length(request: Request) -> int:
+    """Declared body size (0 if missing or invalid, e.g. chunked transfer)"""
+    try:
+        return max(0, int(request.headers.get("content-length", 0)))
+    except ValueError:
+        return 0
+
+def _start_job(
+    filename: str,
+    upload_path: Path,
+    file_size: int,
+    content_hash: str,
+    keep_upload: bool = False
+) -> dict:
+    """
+    Create a job for a fully received upload and queue it
+
+    With keep_upload the file is left at upload_path when the queue is
+    full, so the client can retry without uploading again.
+    """
+    if file_size == 0:
+        upload_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail="File rỗng")
+
+    # Create job entry (content hash = result cache key)
+    job_id = job_service.create_job(filename, file_size, content_hash)
+
+    audio_path = APP.temp_dir / f"{job_id}_{Path(filename).name}"
+    upload_path.replace(audio_path)
+
+    # Queue for background processing (bounded worker pool)
     try:
-        # Validate file extension
-        file_ext = Path(file.filename).suffix.lower()
-        if file_ext not in VALID_EXTENSIONS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Định dạng file không được hỗ trợ. Hỗ trợ: {', '.join(VALID_EXTENSIONS)}"
-            )
-        
-        # Read file content
-        content = await file.read()
-        file_size = len(content)
-        
-        # Validate file size
-        if file_size > APP.max_file_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File quá lớn ({format_file_size(file_size)}). Tối đa: {format_file_size(APP.max_file_size)}"
-            )
-        
-        if file_size == 0:
-            raise HTTPException(status_code=400, detail="File rỗng")
-        
-        # Create job entry
-        job_id = job_service.create_job(file.filename, file_size)
-        
-        # Save uploaded file
-        APP.temp_dir.mkdir(exist_ok=True)
-        audio_path = APP.temp_dir / f"{job_id}_{file.filename}"
-        
-        with open(audio_path, "wb") as f:
-            f.write(content)
-        
-        # Validate saved file
-        is_valid, error_msg = is_valid_audio_file(audio_path)
-        if not is_valid:
+        queue_position = job_service.submit_job(job_id, audio_path)
+    except QueueFullError as e:
+        if keep_upload:
+            audio_path.replace(upload_path)
+        else:
             audio_path.unlink(missing_ok=True)
-            raise HTTPException(status_code=400, detail=error_msg or "File không hợp lệ")
-        
-        # Start background processing with exception handling
-        async def safe_process():
-            try:
-                await asyncio.to_thread(job_service.process_job, job_id, audio_path)
-                logger.info(f"Background task for {job_id} finished successfully")
-            except Exception as e:
-                logger.error(f"Background task {job_id} exception: {e}", exc_info=True)
-
-        asyncio.create_task(safe_process())
-        
-        logger.info(f"Job {job_id} created for file: {file.filename} ({format_file_size(file_size)})")
-        
-        return JSONResponse({
-            "success": True,
-            "job_id": job_id,
-            "message": "Đã bắt đầu xử lý",
-            "filename": file.filename,
-            "file_size": file_size
-        })
-        
+        raise _queue_full_response(e.retry_after)
+
+    logger.info(f"Job {job_id} created for file: {filename} ({format_file_size(file_size)})")
+
+    return {
+        "success": True,
+        "job_id": job_id,
+        "message": "Đã đưa vào hàng đợi xử lý",
+        "filename": filename,
+        "file_size": file_size,
+        "queue_position": queue_position
+    }
+
+# Multipart boundaries, part headers and small form fields around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+@app.post("/api/upload")
+async def upload_audio(request: Request):
+    """Upload audio (multipart, field "file") và bắt đầu xử lý"""
+    # Reject before reading the body: declared size too large or queue full
+    if _content_length(request) > APP.max_file_size + MULTIPART_OVERHEAD:
+        raise _too_large_response()
+    if job_service.is_queue_full():
+        raise _queue_full_response(job_service.retry_after())
+
+    # Parse the multipart body as it arrives and stream the file part to disk;
+    # abort as soon as the size limit is exceeded
+    APP.temp_dir.mkdir(exist_ok=True)
+    try:
+        form = MultipartUpload(
+            request.headers.get("content-type", ""),
+            APP.temp_dir / f"upload_{uuid.uuid4().hex}.part",
+            max_size=APP.max_file_size,
+            check_filename=_validate_extension
+        )
+    except MultipartFormatError:
+        raise HTTPException(status_code=400, detail="Cần gửi file dạng multipart/form-data (trường 'file')")
+
+    try:
+        async for piece in request.stream():
+            if piece:
+                await asyncio.to_thread(form.feed, piece)
+        upload = await asyncio.to_thread(form.finish)
+
+        # Job creation writes to SQLite: keep it off the event loop
+        response = await asyncio.to_thread(_start_job, form.filename, upload.path, upload.size, upload.sha256)
+        return JSONResponse(response)
+
+    except UploadTooLargeError:
+        form.discard()
+        raise _too_large_response()
     except HTTPException:
+        form.discard()
         raise
+    except MultipartFormatError:
+        form.discard()
+        raise HTTPException(status_code=400, detail="Request multipart không hợp lệ hoặc thiếu file (trường 'file')")
     except Exception as e:
+        form.discard()
         logger.error(f"Upload failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Lỗi khi upload: {str(e)}")
 
+# ---------- Resumable (chunked) upload ----------
+
+class UploadInitRequest(BaseModel):
+    filename: str
+    file_size: int
+
+def _get_session(upload_id: str) -> dict:
+    session = upload_service.describe(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Không tìm thấy phiên upload")
+    return session
+
+@app.post("/api/uploads")
+async def init_upload(body: UploadInitRequest):
+    """Bắt đầu upload nhiều phần (cho file vài trăm MB)"""
+    _validate_extension(body.filename)
+
+    if body.file_size <= 0:
+        raise HTTPException(status_code=400, detail="File rỗng")
+    if body.file_size > APP.max_file_size:
+        raise _too_large_response()
+    if job_service.is_queue_full():
+        raise _queue_full_response(job_service.retry_after())
+
+    session = upload_service.create_session(body.filename, body.file_size)
+    return JSONResponse({"success": True, **session})
+
+@app.get("/api/uploads/{upload_id}")
+async def get_upload(upload_id: str):
+    """Số byte đã nhận - client tiếp tục upload từ offset này"""
+    return JSONResponse({"success": True, **_get_session(upload_id)})
+
+def _offset_conflict(expected: int) -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=f"Sai offset, cần gửi từ byte {expected}",
+        headers={"Upload-Offset": str(expected)}
+    )
+
+def _upload_busy() -> HTTPException:
+    return HTTPException(status_code=409, detail="Phiên upload đang được xử lý bởi request khác")
+
+@app.put("/api/uploads/{upload_id}")
+async def upload_chunk(upload_id: str, request: Request, offset: int = 0):
+    """Gửi một phần file (raw body, streamed) tại offset"""
+    session = _get_session(upload_id)
+
+    # Checked again while reading: Content-Length may be missing or wrong
+    max_request = APP.upload_chunk_size * APP.upload_max_request_chunks
+    declared = _content_length(request)
+    if declared > max_request or offset + declared > session["file_size"]:
+        raise _too_large_response()
+
+    try:
+        writer = upload_service.open_chunk(upload_id, offset)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Không tìm thấy phiên upload")
+    except UploadOffsetError as e:
+        raise _offset_conflict(e.expected)
+    except UploadBusyError:
+        raise _upload_busy()
+
+    received = 0
+    try:
+        async for piece in request.stream():
+            received += len(piece)
+            if received > max_request:
+                raise _too_large_response()
+            if piece:
+                # Refuses bytes past the session's declared file size
+                await asyncio.to_thread(writer.write, piece)
+    except UploadTooLargeError:
+        raise _too_large_response()
+    finally:
+        # Keep what was written: the client resumes from GET's "received"
+        total = await asyncio.to_thread(upload_service.close_chunk, upload_id)
+
+    return JSONResponse({"success": True, "upload_id": upload_id, "received": total})
+
+@app.post("/api/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str):
+    """Kết thúc upload và đưa job vào hàng đợi (gọi lại được sau 429)"""
+    try:
+        result = upload_service.complete(upload_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Không tìm thấy phiên upload")
+    except UploadBusyError:
+        raise _upload_busy()
+    except UploadOffsetError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Chưa nhận đủ file (mới có {e.expected} byte)",
+            headers={"Upload-Offset": str(e.expected)}
+        )
+
+    try:
+        response = await asyncio.to_thread(
+            _start_job, result["filename"], result["path"], result["size"], result["sha256"], keep_upload=True
+        )
+    except Exception:
+        # Queue full (or other error): the file stays, /complete can be retried
+        upload_service.release(upload_id)
+        raise
+
+    upload_service.finish(upload_id)
+    return JSONResponse(response)
+
+@app.delete("/api/uploads/{upload_id}")
+async def abort_upload(upload_id: str):
+    """Huỷ phiên upload"""
+    if not upload_service.abort(upload_id):
+        raise HTTPException(status_code=404, detail="Không tìm thấy phiên upload")
+    return JSONResponse({"success": True})
+
 @app.get("/api/status/{job_id}")
 async def get_status(job_id: str):
     """Lấy trạng thái job"""
-    job = job_service.get_job(job_id)
+    job = await asyncio.to_thread(job_service.get_job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Không tìm thấy job")
     
@@ -121,10 +310,44 @@ async def get_status(job_id: str):
         "job": job
     })
 
+@app.get("/api/status/{job_id}/transcript")
+async def get_partial_transcript(job_id: str, since: int = 0):
+    """Transcript đang chạy (các segment đã decode), dùng since để lấy phần mới"""
+    partial = await asyncio.to_thread(job_service.get_partial_transcript, job_id, max(0, since))
+    if partial is None:
+        raise HTTPException(status_code=404, detail="Không tìm thấy job")
+
+    return JSONResponse({
+        "success": True,
+        **partial
+    })
+
+@app.get("/api/events/{job_id}")
+async def job_events(job_id: str, since: int = 0):
+    """Server-Sent Events: progress, segments (transcript đang chạy), completed/failed"""
+    subscribed = await asyncio.to_thread(
+        job_service.subscribe, job_id, max(0, since), asyncio.get_running_loop()
+    )
+    if subscribed is None:
+        raise HTTPException(status_code=404, detail="Không tìm thấy job")
+
+    subscription, initial = subscribed
+    return StreamingResponse(
+        stream_job_events(
+            job_service.events,
+            subscription,
+            initial,
+            coalesce_interval=APP.event_coalesce_interval,
+            keepalive_interval=APP.event_keepalive_interval
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/download/{job_id}/{file_type}")
 async def download_file(job_id: str, file_type: str):
     """Download transcript, summary, hoặc docx"""
-    job = job_service.get_job(job_id)
+    job = await asyncio.to_thread(job_service.get_job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Không tìm thấy job")
 
@@ -159,19 +382,57 @@ async def download_file(job_id: str, file_type: str):
     )
 
 @app.get("/api/jobs")
-async def list_jobs():
-    """List tất cả jobs"""
-    jobs = job_service.list_jobs()
+async def list_jobs(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    status: str = None,
+    before: float = None,
+    include_total: bool = None
+):
+    """
+    List jobs (mới nhất trước), phân trang bằng limit/offset hoặc before=created_at
+
+    total chỉ được đếm ở trang đầu (hoặc khi include_total=true): COUNT(*)
+    tăng theo số job, các trang sau dùng next_before.
+    """
+    if include_total is None:
+        include_total = offset == 0 and before is None
+    jobs, total = await asyncio.to_thread(
+        job_service.list_jobs,
+        limit=limit, offset=offset, status=status, before=before, include_total=include_total
+    )
     return JSONResponse({
         "success": True,
         "jobs": jobs,
-        "total": len(jobs)
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_before": jobs[-1]["created_at"] if len(jobs) == limit else None
     })
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Metrics: queue depth, utilization từng stage, cache hit/miss"""
+    return JSONResponse({
+        "success": True,
+        **job_service.get_metrics()
+    })
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus scrape endpoint: thời gian từng stage/span, hàng đợi, cache"""
+    return PlainTextResponse(
+        job_service.get_prometheus_metrics(),
+        media_type="text/plain; version=0.0.4"
+    )
+
 @app.get("/api/health")
 async def health_check():
     """Kiểm tra trạng thái hệ thống"""
-    result = HealthService.check_system()
+    result = HealthService.check_system(
+        residency=job_service.pipeline.residency.status(),
+        llm_client=job_service.pipeline.qwen_service.client
+    )
     status_code = 200 if result["status"] == "healthy" else 503
     return JSONResponse(status_code=status_code, content=result)
 
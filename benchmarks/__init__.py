@@ -0,0 +1 @@
+"""Benchmark suite (see run_suite.py)"""
@@ -0,0 +1,185 @@
+"""
+Offline load test of JobService against the mock Ollama server
+
+Submits many concurrent jobs through the real scheduler and LLM client while
+Ollama is replaced by benchmarks/mock_ollama.py (with optional latency, a
+parallel-slot limit and failure injection). Transcripts are pre-seeded in the
+result cache, so FFmpeg and Whisper are skipped and the run measures queueing,
+LLM retries/parallelism and export only - no GPU or model download needed.
+
+Usage:
+    python benchmarks/load_test.py --jobs 20 --llm-workers 2 --num-parallel 2
+    python benchmarks/load_test.py --jobs 50 --fail-rate 0.1 --fail-status 503 --malformed-rate 0.2
+    python benchmarks/load_test.py --jobs 20 --llm-workers 2 --endpoints 3 --num-parallel 2
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.mock_ollama import MockOllamaServer, add_behaviour_arguments, behaviour_from_args
+from benchmarks.run_suite import percentile, config_snapshot, git_commit
+from benchmarks.synthetic import generate_audio, generate_transcript
+
+TERMINAL = ("completed", "failed")
+
+
+def configure(args, ollama_urls: List[str], workdir: Path):
+    """Isolate all app state in workdir and point the LLM at the mock(s) (before job_service is imported)"""
+    from config.settings import SUMMARIZATION, SCHEDULER, CACHE, APP
+
+    SUMMARIZATION.base_url = ollama_urls[0]
+    SUMMARIZATION.endpoints = ollama_urls if len(ollama_urls) > 1 else []
+    SUMMARIZATION.model = "mock"
+    SUMMARIZATION.llm_mode = args.llm_mode
+    SUMMARIZATION.backend = args.backend
+    if args.max_parallel_chunks:
+        SUMMARIZATION.max_parallel_chunks = args.max_parallel_chunks
+
+    SCHEDULER.mode = args.mode
+    SCHEDULER.max_queued_jobs = max(SCHEDULER.max_queued_jobs, args.jobs)
+    SCHEDULER.llm_workers = args.llm_workers
+    SCHEDULER.max_concurrent_jobs = args.llm_workers
+
+    CACHE.enabled = True  # Seeded transcripts stand in for FFmpeg + Whisper
+    for name in ("output_dir", "temp_dir", "cache_dir"):
+        setattr(APP, name, workdir / name.replace("_dir", ""))
+        getattr(APP, name).mkdir(parents=True, exist_ok=True)
+    APP.jobs_db = workdir / "jobs.db"
+
+
+def seed_jobs(service, args, workdir: Path) -> List[Path]:
+    """Distinct short WAVs whose transcripts are already in the cache"""
+    from src.services.result_cache import hash_file
+
+    paths = []
+    for i in range(args.jobs):
+        path = generate_audio(workdir / "audio" / f"job_{i:04d}.wav", minutes=0.05, seed=args.seed + i)
+        transcript = generate_transcript(args.minutes, seed=args.seed + i)
+        service.cache.put("transcript", service.cache.transcript_key(hash_file(path)), transcript)
+        paths.append(path)
+    return paths
+
+
+def run_jobs(service, paths: List[Path], timeout: float) -> List[Dict[str, Any]]:
+    """Submit every job at once and wait until all reach a terminal state"""
+    from src.services.job_scheduler import QueueFullError
+    from src.services.result_cache import hash_file
+
+    job_ids = []
+    for path in paths:
+        job_id = service.create_job(path.name, path.stat().st_size, hash_file(path))
+        while True:
+            try:
+                service.submit_job(job_id, path)
+                break
+            except QueueFullError:
+                job_id = service.create_job(path.name, path.stat().st_size, hash_file(path))
+                time.sleep(0.1)
+        job_ids.append(job_id)
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        jobs = [service.get_job(job_id) for job_id in job_ids]
+        if all(job and job["status"] in TERMINAL for job in jobs):
+            return jobs
+        time.sleep(0.2)
+
+    raise TimeoutError(f"Jobs still running after {timeout:.0f}s")
+
+
+def summarize(jobs: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    latencies = [
+        (job.get("completed_at") or job.get("failed_at")) - job["created_at"]
+        for job in jobs if job.get("completed_at") or job.get("failed_at")
+    ]
+    spans: Dict[str, List[float]] = {}
+    for job in jobs:
+        for name, seconds in (job.get("timings") or {}).items():
+            spans.setdefault(name, []).append(seconds)
+
+    failed = [job for job in jobs if job["status"] == "failed"]
+    return {
+        "jobs": len(jobs),
+        "completed": len(jobs) - len(failed),
+        "failed": len(failed),
+        "errors": sorted({job.get("error") or job.get("message", "") for job in failed}),
+        "elapsed_seconds": round(elapsed, 3),
+        "jobs_per_minute": round(len(jobs) / elapsed * 60, 2) if elapsed else None,
+        "p50_job_seconds": round(percentile(latencies, 50), 3) if latencies else None,
+        "p95_job_seconds": round(percentile(latencies, 95), 3) if latencies else None,
+        "span_p50_seconds": {name: round(percentile(values, 50), 4) for name, values in sorted(spans.items())}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JobService load test against a mock Ollama")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--minutes", type=float, default=10, help="Synthetic transcript length per job")
+    parser.add_argument("--mode", choices=("staged", "sequential"), default="staged")
+    parser.add_argument("--llm-workers", type=int, default=1, help="Jobs in the LLM stage at once")
+    parser.add_argument("--llm-mode", choices=("separate", "combined"), default="separate")
+    parser.add_argument("--backend", choices=("ollama", "openai"), default="ollama",
+                        help="LLM API spoken to the mock (openai = /v1/chat/completions)")
+    parser.add_argument("--max-parallel-chunks", type=int, default=0, help="Override SUMMARIZATION.max_parallel_chunks")
+    parser.add_argument("--endpoints", type=int, default=1, help="Mock servers, load balanced by the LLM client")
+    parser.add_argument("--timeout", type=float, default=1800)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    add_behaviour_arguments(parser)
+    args = parser.parse_args()
+    args.seed = args.seed or 0
+
+    workdir = Path(tempfile.mkdtemp(prefix="voicemeet_load_"))
+    with ExitStack() as stack:
+        servers = [
+            stack.enter_context(MockOllamaServer("mock", **behaviour_from_args(args)))
+            for _ in range(max(1, args.endpoints))
+        ]
+        ollama = servers[0]
+        configure(args, [server.base_url for server in servers], workdir)
+
+        from src.services.job_service import job_service as service
+        paths = seed_jobs(service, args, workdir)
+        for server in servers:
+            server.state.reset()
+
+        print(
+            f"Submitting {args.jobs} jobs ({args.mode}, {args.llm_workers} LLM worker(s)) to "
+            f"{', '.join(server.base_url for server in servers)}"
+        )
+        started = time.perf_counter()
+        jobs = run_jobs(service, paths, args.timeout)
+        elapsed = time.perf_counter() - started
+
+        report = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": {**config_snapshot(), "scheduler_mode": args.mode, "llm_workers": args.llm_workers},
+            "mock_llm": {**behaviour_from_args(args), **ollama.state.stats()},
+            "mock_endpoints": [server.state.stats() for server in servers] if len(servers) > 1 else None,
+            "results": summarize(jobs, elapsed)
+        }
+        service.scheduler.shutdown()
+
+    results = report["results"]
+    print(
+        f"{results['completed']}/{results['jobs']} completed in {results['elapsed_seconds']:.1f}s "
+        f"({results['jobs_per_minute']} jobs/min), p50 {results['p50_job_seconds']}s, "
+        f"p95 {results['p95_job_seconds']}s, peak LLM concurrency {report['mock_llm']['peak_in_flight']}"
+    )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+"""
+Local Ollama-compatible mock server for offline benchmarks and load tests
+
+Implements /api/tags, /api/show, /api/generate (streaming NDJSON and non-streaming,
+`format: json`) and /api/pull (streamed progress), plus the OpenAI-compatible
+/v1/models and /v1/chat/completions (SSE streaming, response_format) used by
+SUMMARIZATION.backend = "openai", with deterministic responses,
+simulated latency / tokens-per-second, a parallel-slot limit like
+OLLAMA_NUM_PARALLEL, a per-slot prompt prefix cache like Ollama's KV cache
+reuse, and failure injection. Counters are served at /mock/stats
+(POST /mock/reset clears them).
+
+Usage:
+    python benchmarks/mock_ollama.py --port 11434 --latency 0.5 --tokens-per-second 40
+    python benchmarks/mock_ollama.py --fail-rate 0.1 --malformed-rate 0.2 --num-parallel 2
+    python benchmarks/mock_ollama.py --prompt-tokens-per-second 500 --num-parallel 2
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Iterator
+
+# Valid extraction result (top-level keys of config.prompts.COMBINED_SCHEMA,
+# a superset of EXTRACTION_SCHEMA, so it serves both LLM modes)
+EXTRACTION_RESPONSE = {
+    "summary_points": [
+        "Cuộc họp bàn về doanh thu và chiến dịch marketing ramen",
+        "Thống nhất tăng ngân sách quảng cáo"
+    ],
+    "meeting_info": {
+        "main_purpose": "Lên kế hoạch chiến dịch marketing quý tới",
+        "topics_discussed": ["Doanh thu", "Chiến dịch ramen"],
+        "participants_mentioned": ["Anh Minh", "Tanaka-san"]
+    },
+    "discussions": [
+        {
+            "topic": "Chiến dịch ramen",
+            "points": [{"speaker": "Anh Minh", "content": "Tăng ngân sách quảng cáo", "type": "proposal"}],
+            "conclusion": "Thống nhất tăng ngân sách"
+        }
+    ],
+    "decisions": [{"content": "Tăng ngân sách quảng cáo 10%", "made_by": "Anh Minh"}],
+    "action_items": [
+        {"task": "Chuẩn bị kế hoạch truyền thông", "assignee": "Tanaka-san", "deadline": "Thứ 6", "priority": "high"}
+    ],
+    "other_notes": None,
+    "terminology": ["売上 - doanh thu", "キャンペーン - chiến dịch"]
+}
+
+SUMMARY_RESPONSE = (
+    "## Tóm tắt\n"
+    "- Cuộc họp bàn về doanh thu và chiến dịch marketing ramen.\n"
+    "- Thống nhất tăng ngân sách quảng cáo.\n"
+    "## Công việc\n"
+    "- Tanaka-san chuẩn bị kế hoạch truyền thông trước thứ 6."
+)
+
+# Approximate characters per token, used to size simulated generation
+CHARS_PER_TOKEN = 4
+
+# Trained context window reported by /api/show
+CONTEXT_LENGTH = 32768
+
+
+class MockOllamaState:
+    """Behaviour settings and counters shared by all request handlers"""
+
+    def __init__(
+        self,
+        model: str,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        prompt_tokens_per_second: float = 0.0,
+        num_parallel: int = 0,
+        fail_rate: float = 0.0,
+        fail_status: int = 500,
+        malformed_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        hang_seconds: float = 600.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            model: Model name reported by /api/tags
+            latency: Fixed seconds before the first token (prompt evaluation)
+            tokens_per_second: Simulated generation speed (0 = instant)
+            prompt_tokens_per_second: Simulated prompt evaluation speed for
+                the uncached part of the prompt (0 = instant)
+            num_parallel: Requests generated at once; others wait (0 = unlimited).
+                Also the number of cached prompts (one per slot, at least 1)
+            fail_rate: Share of generate calls answered with fail_status
+            fail_status: HTTP status for injected failures (503 is retried by the client transport)
+            malformed_rate: Share of format=json calls returning truncated JSON
+            hang_rate: Share of generate calls that stall for hang_seconds (client timeouts)
+            hang_seconds: Stall duration
+            seed: RNG seed for reproducible failure patterns
+        """
+        self.model = model
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.malformed_rate = malformed_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.slots = threading.BoundedSemaphore(num_parallel) if num_parallel > 0 else None
+        self.num_parallel = num_parallel
+        # Last prompt evaluated in each slot (Ollama keeps its KV cache per slot)
+        self.prompt_cache = [""] * max(1, num_parallel)
+
+        self.lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = {"tags": 0, "generate": 0, "pull": 0}
+            self.injected = {"failed": 0, "malformed": 0, "hung": 0, "cancelled": 0}
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.queued_seconds = 0.0
+            self.prompt_tokens = 0
+            self.cached_prompt_tokens = 0
+            self.prompt_cache = [""] * len(self.prompt_cache)
+
+    def count(self, kind: str):
+        with self.lock:
+            self.requests[kind] += 1
+
+    def roll(self, rate: float) -> bool:
+        with self.lock:
+            return rate > 0 and self._random.random() < rate
+
+    def inject(self, kind: str):
+        with self.lock:
+            self.injected[kind] += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "requests": dict(self.requests),
+                "injected": dict(self.injected),
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "queued_seconds": round(self.queued_seconds, 3),
+                "prompt_tokens": self.prompt_tokens,
+                "cached_prompt_tokens": self.cached_prompt_tokens,
+                "num_parallel": self.num_parallel
+            }
+
+    def acquire_slot(self):
+        """Wait for a generation slot (like OLLAMA_NUM_PARALLEL) and track concurrency"""
+        waited = time.perf_counter()
+        if self.slots is not None:
+            self.slots.acquire()
+        with self.lock:
+            self.queued_seconds += time.perf_counter() - waited
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release_slot(self):
+        with self.lock:
+            self.in_flight -= 1
+        if self.slots is not None:
+            self.slots.release()
+
+    def evaluate_prompt(self, text: str) -> int:
+        """
+        Reuse the longest cached prefix, like Ollama picking the slot whose KV
+        cache best matches a new prompt, and cache the new prompt in that slot
+
+        Returns:
+            Prompt tokens that still need evaluating
+        """
+        with self.lock:
+            best, best_length = 0, -1
+            for i, cached in enumerate(self.prompt_cache):
+                length = len(os.path.commonprefix([cached, text]))
+                if length > best_length:
+                    best, best_length = i, length
+            self.prompt_cache[best] = text
+
+            total = max(1, len(text) // CHARS_PER_TOKEN)
+            cached_tokens = min(total - 1, best_length // CHARS_PER_TOKEN)
+            self.prompt_tokens += total
+            self.cached_prompt_tokens += cached_tokens
+            return total - cached_tokens
+
+    def prompt_seconds(self, tokens: int) -> float:
+        return tokens / self.prompt_tokens_per_second if self.prompt_tokens_per_second > 0 else 0.0
+
+    def token_interval(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+def _tokens(text: str) -> Iterator[str]:
+    """Split a response into ~CHARS_PER_TOKEN-sized pieces"""
+    for i in range(0, len(text), CHARS_PER_TOKEN):
+        yield text[i:i + CHARS_PER_TOKEN]
+
+
+def _make_handler(state: MockOllamaState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real server
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, obj, status: int = 200):
+            body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _start_stream(self, content_type: str = "application/x-ndjson"):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+        def _stream_line(self, obj):
+            self._stream_raw(json.dumps(obj, ensure_ascii=False) + "\n")
+
+        def _stream_event(self, obj):
+            """One server-sent event (OpenAI streaming)"""
+            self._stream_raw(f"data: {obj if isinstance(obj, str) else json.dumps(obj, ensure_ascii=False)}\n\n")
+
+        def _stream_raw(self, text: str):
+            data = text.encode("utf-8")
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def _end_stream(self):
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+        def _read_json(self) -> dict:
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            if self.path == "/api/tags":
+                state.count("tags")
+                self._send_json({"models": [{"name": state.model}]})
+            elif self.path == "/v1/models":
+                state.count("tags")
+                self._send_json({
+                    "object": "list",
+                    "data": [{"id": state.model, "object": "model", "max_model_len": CONTEXT_LENGTH}]
+                })
+            elif self.path == "/mock/stats":
+                self._send_json(state.stats())
+            else:
+                self._send_json({"error": "not found"}, 404)
+
+        def do_POST(self):
+            if self.path == "/api/generate":
+                self._generate(self._read_json())
+            elif self.path == "/v1/chat/completions":
+                self._chat(self._read_json())
+            elif self.path == "/api/pull":
+                self._pull(self._read_json())
+            elif self.path == "/api/show":
+                self._read_json()
+                self._send_json({"model_info": {"mock.context_length": CONTEXT_LENGTH}})
+            elif self.path == "/mock/reset":
+                state.reset()
+                self._send_json({"status": "ok"})
+            else:
+                self._send_json({"error": "not found"}, 404)
+
+        def _pull(self, payload: dict):
+            state.count("pull")
+            steps = ["pulling manifest", "downloading", "verifying sha256 digest", "writing manifest", "success"]
+            if payload.get("stream") is False:
+                self._send_json({"status": "success"})
+                return
+
+            self._start_stream()
+            for status in steps:
+                self._stream_line({"status": status})
+            self._end_stream()
+
+        def _chat(self, body: dict):
+            """OpenAI chat completions, served by the /api/generate simulation"""
+            messages = body.get("messages") or []
+            payload = {
+                "model": body.get("model", state.model),
+                "system": "\n".join(m["content"] for m in messages if m.get("role") == "system"),
+                "prompt": "\n".join(m["content"] for m in messages if m.get("role") != "system"),
+                "stream": bool(body.get("stream", False)),
+                "format": (body.get("response_format") or {}).get("type") in ("json_object", "json_schema"),
+                "options": {"num_predict": body.get("max_tokens")}
+            }
+            self._generate(payload, chat=True)
+
+        def _generate(self, payload: dict, chat: bool = False):
+            state.count("generate")
+
+            if state.roll(state.fail_rate):
+                state.inject("failed")
+                error = {"message": "injected failure"} if chat else "injected failure"
+                self._send_json({"error": error}, state.fail_status)
+                return
+
+            wants_json = bool(payload.get("format"))
+            text = json.dumps(EXTRACTION_RESPONSE, ensure_ascii=False) if wants_json else SUMMARY_RESPONSE
+            if wants_json and state.roll(state.malformed_rate):
+                state.inject("malformed")
+                text = text[:len(text) // 2]
+
+            # Honour num_predict like the real server (truncates output)
+            limit = (payload.get("options") or {}).get("num_predict")
+            if limit and limit > 0:
+                text = text[:limit * CHARS_PER_TOKEN]
+
+            state.acquire_slot()
+            try:
+                if state.roll(state.hang_rate):
+                    state.inject("hung")
+                    time.sleep(state.hang_seconds)
+
+                started = time.perf_counter()
+                # The system prompt is rendered before the prompt, as in the chat template
+                prompt_text = f"{payload.get('system', '')}\n{payload.get('prompt', '')}"
+                prompt_tokens = state.evaluate_prompt(prompt_text)
+                time.sleep(state.latency + state.prompt_seconds(prompt_tokens))
+                prompt_done = time.perf_counter()
+                eval_tokens = max(1, len(text) // CHARS_PER_TOKEN)
+                model = payload.get("model", state.model)
+
+                def final(response: str) -> dict:
+                    now = time.perf_counter()
+                    return {
+                        "model": model,
+                        "response": response,
+                        "done": True,
+                        "prompt_eval_count": prompt_tokens,
+                        "prompt_eval_duration": int((prompt_done - started) * 1e9),
+                        "eval_count": eval_tokens,
+                        "eval_duration": int((now - prompt_done) * 1e9),
+                        "total_duration": int((now - started) * 1e9)
+                    }
+
+                if chat:
+                    self._chat_response(text, model, prompt_text, prompt_tokens, eval_tokens, payload["stream"])
+                    return
+
+                # Ollama streams by default
+                if payload.get("stream", True):
+                    self._start_stream()
+                    try:
+                        for piece in _tokens(text):
+                            time.sleep(state.token_interval())
+                            self._stream_line({"model": model, "response": piece, "done": False})
+                        self._stream_line(final(""))
+                        self._end_stream()
+                    except (BrokenPipeError, ConnectionResetError):
+                        # Client stopped reading (early abort), like Ollama cancelling
+                        state.inject("cancelled")
+                        self.close_connection = True
+                    return
+
+                time.sleep(eval_tokens * state.token_interval())
+                self._send_json(final(text))
+            finally:
+                state.release_slot()
+
+        def _chat_response(self, text: str, model: str, prompt_text: str, evaluated: int, eval_tokens: int, stream: bool):
+            total = max(1, len(prompt_text) // CHARS_PER_TOKEN)
+            usage = {
+                "prompt_tokens": total,
+                "completion_tokens": eval_tokens,
+                "total_tokens": total + eval_tokens,
+                "prompt_tokens_details": {"cached_tokens": total - evaluated}
+            }
+
+            def chunk(delta: dict, finish_reason: Optional[str] = None) -> dict:
+                return {
+                    "object": "chat.completion.chunk",
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                }
+
+            if stream:
+                self._start_stream("text/event-stream")
+                try:
+                    for piece in _tokens(text):
+                        time.sleep(state.token_interval())
+                        self._stream_event(chunk({"content": piece}))
+                    self._stream_event(chunk({}, "stop"))
+                    self._stream_event({"object": "chat.completion.chunk", "model": model, "choices": [], "usage": usage})
+                    self._stream_event("[DONE]")
+                    self._end_stream()
+                except (BrokenPipeError, ConnectionResetError):
+                    state.inject("cancelled")
+                    self.close_connection = True
+                return
+
+            time.sleep(eval_tokens * state.token_interval())
+            self._send_json({
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage
+            })
+
+    return Handler
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients abort streams on purpose (early JSON stop); don't print tracebacks
+        pass
+
+
+class MockOllamaServer:
+    """Threaded mock server, usable as a context manager
+
+    Extra keyword arguments are passed to MockOllamaState (failure injection etc.).
+    """
+
+    def __init__(self, model: str, host: str = "127.0.0.1", port: int = 0, **behaviour):
+        """
+        Args:
+            model: Model name reported by /api/tags
+            host: Bind address
+            port: Port (0 = pick a free one)
+            **behaviour: MockOllamaState options (latency, tokens_per_second, fail_rate, ...)
+        """
+        self.state = MockOllamaState(model, **behaviour)
+        self.server = _QuietHTTPServer((host, port), _make_handler(self.state))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockOllamaServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_behaviour_arguments(parser: argparse.ArgumentParser):
+    """CLI flags for MockOllamaState (shared with load_test.py)"""
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated generation speed")
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=0.0,
+                        help="Simulated evaluation speed of uncached prompt tokens")
+    parser.add_argument("--num-parallel", type=int, default=0, help="Concurrent generations (0 = unlimited)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of generate calls that fail")
+    parser.add_argument("--fail-status", type=int, default=500, help="HTTP status of injected failures")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of JSON responses truncated")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Share of generate calls that stall")
+    parser.add_argument("--hang-seconds", type=float, default=600.0)
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed for failure injection")
+
+
+def behaviour_from_args(args) -> dict:
+    return {
+        "latency": args.latency,
+        "tokens_per_second": args.tokens_per_second,
+        "prompt_tokens_per_second": args.prompt_tokens_per_second,
+        "num_parallel": args.num_parallel,
+        "fail_rate": args.fail_rate,
+        "fail_status": args.fail_status,
+        "malformed_rate": args.malformed_rate,
+        "hang_rate": args.hang_rate,
+        "hang_seconds": args.hang_seconds,
+        "seed": args.seed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Ollama-compatible mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--model", default="mock", help="Model name in /api/tags (match SUMMARIZATION.model)")
+    add_behaviour_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockOllamaServer(args.model, args.host, args.port, **behaviour_from_args(args))
+    print(f"Mock Ollama listening on {server.base_url} (model {args.model})")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Prompt-prefix cache benchmark: prompt-evaluation time saved per job
+
+Runs the LLM stage (summary + extraction, or the combined pass) of several
+synthetic meetings back to back against one loaded model and reports, per
+job, how many prompt tokens were sent, how many Ollama actually had to
+evaluate (prompt_eval_count excludes the prefix reused from its KV cache)
+and the prompt-evaluation time that reuse saved. The first job pays for the
+shared system prompt and task headers; later jobs should only pay for
+their transcripts.
+
+Runs offline against benchmarks/mock_ollama.py (which simulates the per-slot
+prefix cache), or against a real Ollama with --ollama-url.
+
+Usage:
+    python benchmarks/prompt_cache.py --jobs 5 --minutes 30
+    python benchmarks/prompt_cache.py --llm-mode combined --num-parallel 4
+    python benchmarks/prompt_cache.py --ollama-url http://localhost:11434 --model gemma4:e4b
+    python benchmarks/prompt_cache.py --backend openai --ollama-url http://localhost:8000 --model google/gemma-3-4b-it
+"""
+import argparse
+import json
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.mock_ollama import MockOllamaServer, add_behaviour_arguments, behaviour_from_args
+from benchmarks.run_suite import config_snapshot, git_commit
+from benchmarks.synthetic import generate_transcript
+
+
+def count_sent_tokens(client, counter: Dict[str, int]):
+    """Wrap the client's generate calls to tally estimated tokens of system + prompt"""
+    from src.utils.text_processor import estimate_tokens
+
+    def wrap(func):
+        def wrapped(payload, *args, **kwargs):
+            if payload.get("prompt"):
+                counter["sent"] += estimate_tokens(payload.get("system", "")) + estimate_tokens(payload["prompt"])
+            return func(payload, *args, **kwargs)
+        return wrapped
+
+    client.generate = wrap(client.generate)
+    client.generate_stream = wrap(client.generate_stream)
+
+
+def run_job(service, extractor, transcript: str, llm_mode: str):
+    if llm_mode == "combined":
+        extractor.extract_combined(transcript)
+    else:
+        service.summarize(transcript)
+        extractor.extract(transcript)
+
+
+def job_stats(calls: List[Dict[str, Any]], sent: int, cached: Optional[int], seconds: float) -> Dict[str, Any]:
+    """
+    Prompt counters of one job
+
+    Args:
+        calls: llm.generate span records of the job
+        sent: Prompt tokens sent (mock counter, else client-side estimate)
+        cached: Prompt tokens served from cache (mock counter; None = sent - evaluated)
+        seconds: Wall time of the job
+
+    Returns:
+        Per-job stats dict
+    """
+    evaluated = sum(c.get("prompt_eval_tokens") or 0 for c in calls)
+    eval_seconds = sum(c.get("prompt_eval_seconds") or 0.0 for c in calls)
+    if cached is None:
+        cached = max(0, sent - evaluated)
+    # Time the cached tokens would have taken at this job's prompt-eval speed
+    per_token = eval_seconds / evaluated if evaluated else 0.0
+    return {
+        "calls": len(calls),
+        "prompt_tokens_sent": sent,
+        "prompt_tokens_evaluated": evaluated,
+        "prompt_tokens_cached": cached,
+        "cache_hit_ratio": round(cached / sent, 3) if sent else 0.0,
+        "prompt_eval_seconds": round(eval_seconds, 3),
+        "prompt_eval_seconds_saved": round(cached * per_token, 3),
+        "wall_seconds": round(seconds, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt-prefix cache benchmark (prompt-eval time saved per job)")
+    parser.add_argument("--jobs", type=int, default=5, help="Meetings processed back to back")
+    parser.add_argument("--minutes", type=float, default=30, help="Length of each synthetic meeting")
+    parser.add_argument("--llm-mode", choices=("separate", "combined"), default="separate")
+    parser.add_argument("--backend", choices=("ollama", "openai"), default="ollama", help="LLM server API")
+    parser.add_argument("--ollama-url", help="Benchmark a real server (of --backend type) instead of the mock")
+    parser.add_argument("--model", default="mock", help="Model name (with --ollama-url)")
+    parser.add_argument("--output", type=Path, help="Write the report as JSON")
+    add_behaviour_arguments(parser)
+    # Mock defaults: CPU-like prompt evaluation, two slots like OLLAMA_NUM_PARALLEL=2
+    parser.set_defaults(prompt_tokens_per_second=2000.0, num_parallel=2)
+    args = parser.parse_args()
+
+    mock = None if args.ollama_url else MockOllamaServer("mock", **behaviour_from_args(args))
+    with mock or nullcontext():
+        from config.settings import SUMMARIZATION
+        SUMMARIZATION.base_url = args.ollama_url or mock.base_url
+        SUMMARIZATION.model = args.model
+        SUMMARIZATION.llm_mode = args.llm_mode
+        SUMMARIZATION.backend = args.backend
+
+        from src.summarization.qwen_service import LLMService
+        from src.summarization.extractor import MeetingExtractor
+        from src.utils import tracing
+
+        service = LLMService()
+        extractor = MeetingExtractor(service)
+        counter = {"sent": 0}
+        count_sent_tokens(service.client, counter)
+
+        calls: List[Dict[str, Any]] = []
+        tracing.add_listener(lambda record: calls.append(record) if record["name"] == "llm.generate" else None)
+
+        jobs = []
+        for i in range(args.jobs):
+            # A different meeting per job: only the prompt prefix may be reused
+            transcript = generate_transcript(args.minutes, seed=(args.seed or 0) + i)
+            calls.clear()
+            counter["sent"] = 0
+            before = mock.state.stats() if mock else None
+
+            started = time.perf_counter()
+            run_job(service, extractor, transcript, args.llm_mode)
+            seconds = time.perf_counter() - started
+
+            if mock:
+                after = mock.state.stats()
+                sent = after["prompt_tokens"] - before["prompt_tokens"]
+                cached = after["cached_prompt_tokens"] - before["cached_prompt_tokens"]
+            else:
+                sent, cached = counter["sent"], None
+            stats = job_stats(list(calls), sent, cached, seconds)
+            jobs.append(stats)
+            print(
+                f"job {i + 1}: {stats['calls']:>3} calls  sent {stats['prompt_tokens_sent']:>7}  "
+                f"evaluated {stats['prompt_tokens_evaluated']:>7}  hit {stats['cache_hit_ratio']:>6.1%}  "
+                f"prompt eval {stats['prompt_eval_seconds']:>7.2f}s  saved {stats['prompt_eval_seconds_saved']:>7.2f}s"
+            )
+
+    warm = jobs[1:] or jobs
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": config_snapshot(),
+        "ollama": args.ollama_url or {"mock": behaviour_from_args(args)},
+        "minutes": args.minutes,
+        "jobs": jobs,
+        "warm_mean": {
+            key: round(sum(j[key] for j in warm) / len(warm), 3)
+            for key in ("cache_hit_ratio", "prompt_eval_seconds", "prompt_eval_seconds_saved")
+        }
+    }
+    print(
+        f"\nWarm jobs: {report['warm_mean']['cache_hit_ratio']:.1%} of prompt tokens cached, "
+        f"{report['warm_mean']['prompt_eval_seconds_saved']:.2f}s prompt eval saved per job"
+    )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+End-to-end benchmark suite on synthetic meetings (CPU-only, Whisper tiny)
+
+Generates synthetic audio/transcripts for each length, starts a local Ollama
+stand-in, then times every pipeline stage in isolation and the full pipeline.
+Results (RTF, throughput, p50/p95 latency, CPU time, peak RSS) are written as
+JSON so runs can be compared between commits.
+
+Usage:
+    python benchmarks/run_suite.py --minutes 1 10 --repeat 3
+    python benchmarks/run_suite.py --minutes 60 120 --stages whisper e2e
+    python benchmarks/run_suite.py --minutes 1 --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.mock_ollama import MockOllamaServer
+from benchmarks.synthetic import generate_audio, generate_transcript
+
+STAGES = ("ffmpeg", "whisper", "llm", "export", "e2e")
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def measure(name: str, func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Run func `repeat` times inside a tracing span and aggregate"""
+    from src.utils.tracing import span
+
+    runs = []
+    for _ in range(repeat):
+        with span(f"bench.{name}") as record:
+            func()
+        runs.append(record)
+
+    latencies = [r["wall_seconds"] for r in runs]
+    return {
+        "runs": len(runs),
+        "p50_seconds": round(percentile(latencies, 50), 4),
+        "p95_seconds": round(percentile(latencies, 95), 4),
+        "mean_seconds": round(sum(latencies) / len(latencies), 4),
+        "cpu_seconds": round(sum(r["cpu_seconds"] for r in runs) / len(runs), 4),
+        "peak_rss_mb": round(max(r["peak_rss_bytes"] for r in runs) / (1024 * 1024), 1)
+    }
+
+
+def configure(args, ollama_url: str, workdir: Path):
+    """Point the app config at the CPU / tiny model / mock Ollama setup"""
+    from config.settings import TRANSCRIPTION, SUMMARIZATION, CACHE, RESIDENCY, APP
+
+    TRANSCRIPTION.model = args.model
+    TRANSCRIPTION.device = "cpu"
+    TRANSCRIPTION.compute_type = "int8"
+    SUMMARIZATION.base_url = ollama_url
+    SUMMARIZATION.model = "mock"
+    CACHE.enabled = False  # Every repeat must do the real work
+    RESIDENCY.whisper_policy = "always"
+    APP.output_dir = workdir / "output"
+    APP.output_dir.mkdir(parents=True, exist_ok=True)
+
+
+def config_snapshot() -> Dict[str, Any]:
+    from config.settings import TRANSCRIPTION, SUMMARIZATION, FFMPEG
+    return {
+        "whisper_model": TRANSCRIPTION.model,
+        "compute_type": TRANSCRIPTION.compute_type,
+        "inference_mode": TRANSCRIPTION.inference_mode,
+        "chunked_mode": TRANSCRIPTION.chunked_mode,
+        "num_workers": TRANSCRIPTION.num_workers,
+        "ffmpeg_in_memory": FFMPEG.in_memory,
+        "llm_backend": SUMMARIZATION.backend,
+        "llm_mode": SUMMARIZATION.llm_mode,
+        "num_ctx": SUMMARIZATION.num_ctx,
+        "max_parallel_chunks": SUMMARIZATION.max_parallel_chunks
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent.parent
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def bench_length(pipeline, minutes: float, args, workdir: Path) -> Dict[str, Any]:
+    """All requested stages for one synthetic meeting length"""
+    audio_path = generate_audio(workdir / f"meeting_{minutes:g}min.wav", minutes, seed=args.seed, source=args.source)
+    audio_seconds = minutes * 60
+    transcript = generate_transcript(minutes, seed=args.seed)
+    print(f"\n== {minutes:g} min ({audio_path.stat().st_size / 1e6:.1f} MB WAV, {len(transcript)} chars transcript)")
+
+    results: Dict[str, Any] = {"audio_seconds": audio_seconds, "transcript_chars": len(transcript), "stages": {}}
+    samples = None
+
+    for stage in args.stages:
+        if stage == "ffmpeg":
+            stats = measure(stage, lambda: pipeline.audio_processor.load_pcm(audio_path), args.repeat)
+        elif stage == "whisper":
+            if samples is None:
+                samples = pipeline.audio_processor.load_pcm(audio_path)
+            stats = measure(stage, lambda: pipeline.whisper_service.transcribe(samples), args.repeat)
+        elif stage == "llm":
+            def run_llm():
+                pipeline.qwen_service.summarize(transcript)
+                pipeline.extractor.extract(transcript)
+            stats = measure(stage, run_llm, args.repeat)
+            stats["chars_per_second"] = round(len(transcript) / stats["p50_seconds"], 1)
+        elif stage == "export":
+            extracted = pipeline.extractor.extract(transcript)
+            stats = measure(
+                stage,
+                lambda: pipeline._save_outputs("bench", transcript, "Tóm tắt", extracted),
+                args.repeat
+            )
+        else:
+            stats = measure(stage, lambda: pipeline.process(audio_path, remove_temp=True), args.repeat)
+
+        if stage != "llm":
+            stats["rtf"] = round(stats["p50_seconds"] / audio_seconds, 5)
+            stats["throughput_x_realtime"] = round(audio_seconds / stats["p50_seconds"], 2) if stats["p50_seconds"] else None
+
+        results["stages"][stage] = stats
+        print(
+            f"  {stage:<8} p50 {stats['p50_seconds']:>9.3f}s  p95 {stats['p95_seconds']:>9.3f}s  "
+            f"RTF {stats.get('rtf', '-')!s:<9} peak {stats['peak_rss_mb']:.0f} MB"
+        )
+
+    return results
+
+
+def compare(current: Dict[str, Any], baseline_path: Path, threshold: float):
+    """Print p50 changes against a previous result file; returns True on regression"""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    print(f"\nCompared with {baseline_path.name} (commit {baseline.get('commit')}):")
+    regressed = False
+    for length, result in current["lengths"].items():
+        base_stages = baseline.get("lengths", {}).get(length, {}).get("stages", {})
+        for stage, stats in result["stages"].items():
+            if stage not in base_stages:
+                continue
+            before, after = base_stages[stage]["p50_seconds"], stats["p50_seconds"]
+            change = (after - before) / before if before else 0.0
+            flag = "REGRESSION" if change > threshold else ""
+            regressed = regressed or bool(flag)
+            print(f"  {length:>6} {stage:<8} {before:>9.3f}s -> {after:>9.3f}s ({change:+.1%}) {flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voicemeet benchmark suite (synthetic meetings)")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--model", default="tiny", help="Whisper model (default: tiny, CPU int8)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--source", type=Path, help="Loop a real recording instead of synthetic tones")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Mock Ollama fixed latency per call")
+    parser.add_argument("--llm-tps", type=float, default=50.0, help="Mock Ollama tokens per second")
+    parser.add_argument("--output", type=Path, help="Result JSON path (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="Previous result JSON to diff against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="p50 slowdown counted as regression")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="voicemeet_bench_"))
+    with MockOllamaServer("mock", latency=args.llm_latency, tokens_per_second=args.llm_tps) as ollama:
+        configure(args, ollama.base_url, workdir)
+
+        from src.pipeline.meeting_pipeline import MeetingPipeline
+        pipeline = MeetingPipeline(cache=None)
+
+        load_start = time.perf_counter()
+        pipeline.whisper_service.load_model()
+        load_seconds = time.perf_counter() - load_start
+        print(f"Whisper {args.model} loaded on {pipeline.whisper_service.loaded_device} in {load_seconds:.2f}s")
+
+        report = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "machine": {
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "cpu_count": os.cpu_count()
+            },
+            "config": config_snapshot(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "mock_llm": {"latency": args.llm_latency, "tokens_per_second": args.llm_tps},
+            "whisper_load_seconds": round(load_seconds, 3),
+            "lengths": {}
+        }
+        for minutes in args.minutes:
+            report["lengths"][f"{minutes:g}min"] = bench_length(pipeline, minutes, args, workdir)
+        report["mock_llm"]["requests"] = dict(ollama.state.requests)
+
+    output = args.output or RESULTS_DIR / f"{report['timestamp'].replace(':', '')}_{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+    if args.compare and compare(report, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
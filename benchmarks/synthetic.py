@@ -0,0 +1,123 @@
+"""
+Deterministic synthetic meeting audio and transcripts for benchmarks
+"""
+import random
+import subprocess
+import wave
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Vocabulary for synthetic bilingual (Việt-Nhật) F&B meeting transcripts
+_SPEAKERS = ["Anh Minh", "Chị Lan", "Tanaka-san", "Sato-san", "Anh Hùng"]
+_TOPICS = ["doanh thu tháng này", "chiến dịch ramen", "menu phở mới", "khách hàng Nhật", "ngân sách quảng cáo"]
+_PHRASES = [
+    "Tôi nghĩ chúng ta nên tập trung vào {topic}.",
+    "Về {topic}, số liệu tuần trước tăng khoảng {n} phần trăm.",
+    "{topic}については、来週までに資料を準備します。",
+    "Đề xuất là tăng ngân sách cho {topic} thêm {n} triệu.",
+    "Ai sẽ phụ trách {topic}? Hạn là thứ {d} tuần sau.",
+    "マーケティングの観点から、{topic}は重要です。",
+    "Chúng ta thống nhất sẽ thử nghiệm {topic} trong {n} ngày.",
+]
+
+
+def generate_audio(
+    path: Path,
+    minutes: float,
+    seed: int = 0,
+    source: Optional[Path] = None
+) -> Path:
+    """
+    Write a 16 kHz mono WAV of the requested length
+
+    Without a source, speech-like bursts (harmonic tones with a syllable-rate
+    envelope) alternate with pauses so VAD and chunking behave as on a real
+    meeting. With a source, that recording is looped to the length via FFmpeg.
+
+    Args:
+        path: Output WAV path
+        minutes: Length in minutes
+        seed: RNG seed (same seed = identical file)
+        source: Optional real recording to loop
+
+    Returns:
+        path
+    """
+    seconds = minutes * 60
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if source is not None:
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-stream_loop", "-1", "-i", str(source),
+                "-t", f"{seconds:.3f}", "-ar", str(SAMPLE_RATE), "-ac", "1",
+                "-acodec", "pcm_s16le", str(path)
+            ],
+            check=True
+        )
+        return path
+
+    rng = np.random.default_rng(seed)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+
+        written = 0
+        total = int(seconds * SAMPLE_RATE)
+        while written < total:
+            # Utterance of 2-12 s followed by a 0.3-2.5 s pause
+            talk = int(rng.uniform(2, 12) * SAMPLE_RATE)
+            pause = int(rng.uniform(0.3, 2.5) * SAMPLE_RATE)
+            t = np.arange(talk) / SAMPLE_RATE
+
+            pitch = rng.uniform(100, 220)
+            voice = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+            syllables = 0.5 * (1 + np.sin(2 * np.pi * rng.uniform(3, 6) * t))
+            noise = rng.normal(0, 0.05, talk)
+            block = np.concatenate([
+                0.25 * voice * syllables + noise,
+                rng.normal(0, 0.005, pause)
+            ])
+
+            block = block[:total - written]
+            wav.writeframes((np.clip(block, -1, 1) * 32767).astype("<i2").tobytes())
+            written += len(block)
+
+    return path
+
+
+def generate_transcript(minutes: float, seed: int = 0, words_per_minute: int = 150) -> str:
+    """
+    Synthetic transcript with roughly the text volume of a real meeting
+
+    Args:
+        minutes: Meeting length in minutes
+        seed: RNG seed
+        words_per_minute: Speaking rate used to size the text
+
+    Returns:
+        Transcript text, one utterance per line with a blank line between turns
+    """
+    rng = random.Random(seed)
+    target_words = int(minutes * words_per_minute)
+    lines, words = [], 0
+
+    while words < target_words:
+        speaker = rng.choice(_SPEAKERS)
+        for _ in range(rng.randint(1, 4)):
+            line = rng.choice(_PHRASES).format(
+                topic=rng.choice(_TOPICS),
+                n=rng.randint(2, 40),
+                d=rng.randint(2, 7)
+            )
+            lines.append(f"{speaker}: {line}")
+            words += len(line.split())
+        lines.append("")
+
+    return "\n".join(lines).strip()
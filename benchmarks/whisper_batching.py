@@ -0,0 +1,86 @@
+"""
+Benchmark: sequential vs batched Whisper inference (real-time factor)
+
+Usage:
+    python benchmarks/whisper_batching.py [audio] [--batch-sizes 4 8 16] [--repeat 2]
+
+RTF = transcription time / audio duration (lower is better). Model loading is
+excluded; the same loaded model is reused for every run.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import TRANSCRIPTION, FFMPEG
+from src.transcription.audio_processor import AudioProcessor
+from src.transcription.whisper_service import WhisperService
+
+DEFAULT_AUDIO = Path(__file__).parent.parent / "examples" / "sample_meeting.m4a"
+
+
+def run_once(service: WhisperService, samples, mode: str, batch_size: int) -> dict:
+    TRANSCRIPTION.inference_mode = mode
+    TRANSCRIPTION.batch_size = batch_size
+
+    start = time.perf_counter()
+    text = service.transcribe(samples)
+    elapsed = time.perf_counter() - start
+
+    duration = len(samples) / FFMPEG.sample_rate
+    return {
+        "mode": mode,
+        "batch_size": batch_size if mode == "batched" else None,
+        "seconds": round(elapsed, 2),
+        "rtf": round(elapsed / duration, 4) if duration else None,
+        "chars": len(text)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs batched Whisper RTF")
+    parser.add_argument("audio", nargs="?", type=Path, default=DEFAULT_AUDIO)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per configuration (best is kept)")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args()
+
+    # Decode once so FFmpeg time is not part of the comparison
+    samples = AudioProcessor().load_pcm(args.audio)
+    duration = len(samples) / FFMPEG.sample_rate
+
+    service = WhisperService()
+    # Chunked windows would add a second form of parallelism to the sequential runs
+    TRANSCRIPTION.chunked_mode = "off"
+    service.load_model()
+    print(f"Audio: {args.audio.name} ({duration:.1f}s), model {TRANSCRIPTION.model} on {service.loaded_device}")
+
+    configs = [("sequential", TRANSCRIPTION.batch_size)] + [("batched", b) for b in args.batch_sizes]
+    results = []
+    for mode, batch_size in configs:
+        runs = [run_once(service, samples, mode, batch_size) for _ in range(max(1, args.repeat))]
+        best = min(runs, key=lambda r: r["seconds"])
+        results.append(best)
+        label = mode if mode == "sequential" else f"batched(bs={batch_size})"
+        print(f"{label:<20} {best['seconds']:>8.2f}s  RTF {best['rtf']:.4f}  ({best['chars']} chars)")
+
+    baseline = results[0]["seconds"]
+    for result in results[1:]:
+        result["speedup"] = round(baseline / result["seconds"], 2) if result["seconds"] else None
+        print(f"batch_size={result['batch_size']}: {result['speedup']}x vs sequential")
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "audio": str(args.audio),
+            "duration": duration,
+            "model": TRANSCRIPTION.model,
+            "device": service.loaded_device,
+            "results": results
+        }, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
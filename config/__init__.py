@@ -3,10 +3,16 @@ from .settings import (
     TRANSCRIPTION,
     SUMMARIZATION,
     FFMPEG,
+    RESIDENCY,
+    SCHEDULER,
+    CACHE,
     APP,
     TranscriptionConfig,
     SummarizationConfig,
     FFmpegConfig,
+    ResidencyConfig,
+    SchedulerConfig,
+    CacheConfig,
     AppConfig
 )
 
@@ -14,10 +20,16 @@ __all__ = [
     'TRANSCRIPTION',
     'SUMMARIZATION',
     'FFMPEG',
+    'RESIDENCY',
+    'SCHEDULER',
+    'CACHE',
     'APP',
     'TranscriptionConfig',
     'SummarizationConfig',
     'FFmpegConfig',
+    'ResidencyConfig',
+    'SchedulerConfig',
+    'CacheConfig',
     'AppConfig'
 ]
 
@@ -2,38 +2,84 @@
 Prompt templates for LLM interactions (Gemma 4 / Qwen - bilingual Việt-Nhật)
 File: config/prompts.py
 """
+import hashlib
 import json
 
+# Bump when prompt handling in code changes (e.g. text_processor.render_summary)
+# so cached summaries/extractions are invalidated
+PROMPT_VERSION = "3"
+
+# Prompt layout (keeps Ollama's KV cache warm across calls):
+#   system  = SYSTEM_PROMPT, identical for every call of every task
+#   prompt  = task instructions (identical for every call of that task)
+#             + transcript / partial summaries last
+# Ollama reuses the evaluated tokens of the longest common prefix with a
+# previous request, so only the variable suffix is evaluated per call.
+# Keep everything call-specific out of SYSTEM_PROMPT and the task headers.
+
 # ============================================
-# CHUNK SUMMARIZATION PROMPT
+# SYSTEM PROMPT (shared by summary, extraction and combined calls)
 # ============================================
-CHUNK_SUMMARIZE_PROMPT = """Tóm tắt ngắn gọn đoạn cuộc họp song ngữ Việt-Nhật sau bằng tiếng Việt.
+SYSTEM_PROMPT = """Bạn là trợ lý chuyên nghiệp phân tích và tóm tắt cuộc họp song ngữ Việt-Nhật.
+Đây là các cuộc họp marketing của công ty F&B (thực phẩm Việt Nam) tại thị trường Nhật Bản.
+
+QUY TẮC CHUNG:
+1. Viết bằng tiếng Việt
+2. KHÔNG bịa thông tin không có trong transcript
+3. Giữ nguyên tên riêng tiếng Việt VÀ tiếng Nhật, tên công ty, địa danh
+4. Thuật ngữ Nhật: giữ nguyên kèm nghĩa Việt trong ngoặc (ví dụ: 売上 - doanh thu)
+5. Số liệu (doanh thu, %, ngân sách) → ghi chính xác
+6. Ngắn gọn, súc tích"""
+
+# ============================================
+# SUMMARY PROMPTS (one per LLMService summary style)
+# ============================================
+SUMMARY_FORMAT = """# TÓM TẮT CUỘC HỌP
+
+## NỘI DUNG CHÍNH
+[Tóm tắt 3-5 điểm chính: vấn đề gì được bàn, ai nói gì]
+
+## CÁC QUYẾT ĐỊNH
+[Quyết định cụ thể nào được đưa ra? Số liệu? Timeline?]
+
+## HÀNH ĐỘNG CẦN LÀM
+[Ai làm gì, deadline khi nào - format: "- Người: Công việc (deadline)"]
+
+## THUẬT NGỮ CHUYÊN NGÀNH
+[Liệt kê thuật ngữ Nhật-Việt quan trọng xuất hiện trong cuộc họp]
+
+Chỉ trả về nội dung tóm tắt, không giải thích thêm."""
+
+CHUNK_SUMMARIZE_PROMPT = """NHIỆM VỤ: Tóm tắt ngắn gọn đoạn cuộc họp sau.
 Giữ lại các thông tin quan trọng: ai nói gì, quyết định gì, việc gì cần làm.
-Thuật ngữ tiếng Nhật: giữ nguyên kèm nghĩa tiếng Việt trong ngoặc (ví dụ: 売上 - doanh thu).
-Không thêm thông tin không có trong transcript.
 
 TRANSCRIPT:
 ---
-{transcript}
+{text}
 ---
 
 TÓM TẮT:
 """
 
+SUMMARY_PROMPTS = {
+    "complete": "NHIỆM VỤ: Tóm tắt cuộc họp theo định dạng sau.\n\n" + SUMMARY_FORMAT
+                + "\n\nNội dung cuộc họp:\n{text}",
+    "chunk": CHUNK_SUMMARIZE_PROMPT,
+    "merge": """NHIỆM VỤ: Gộp các tóm tắt phụ (theo thứ tự thời gian) của một cuộc họp thành một tóm tắt ngắn gọn.
+Giữ đầy đủ quyết định, số liệu, người phụ trách và deadline.
+
+Các tóm tắt phụ:
+{text}""",
+    "final": "NHIỆM VỤ: Tóm tắt cuộc họp theo định dạng sau.\n\n" + SUMMARY_FORMAT
+             + "\n\nCác tóm tắt phụ:\n{text}"
+}
+
 # ============================================
 # JSON EXTRACTION PROMPT
 # ============================================
-EXTRACTION_PROMPT = """Bạn là trợ lý phân tích cuộc họp song ngữ Việt-Nhật (marketing F&B tại Nhật Bản).
-
-NHIỆM VỤ: Phân tích transcript và trích xuất thông tin theo JSON schema.
-
-QUY TẮC BẮT BUỘC:
-1. CHỈ trả về JSON, không có text nào khác
-2. KHÔNG bịa thông tin không có trong transcript
-3. Nếu không chắc chắn, để null
-4. Giữ nguyên tên riêng tiếng Việt VÀ tiếng Nhật
-5. Thuật ngữ Nhật: giữ nguyên kèm nghĩa Việt trong ngoặc (ví dụ: 売上 - doanh thu)
-6. Tóm tắt ngắn gọn, súc tích
+EXTRACTION_PROMPT = """NHIỆM VỤ: Phân tích transcript và trích xuất thông tin theo JSON schema.
+- CHỈ trả về JSON, không có text nào khác
+- Nếu không chắc chắn, để null
 
 JSON SCHEMA:
 ```json
@@ -87,6 +133,35 @@ EXTRACTION_SCHEMA = {
     "other_notes": "string or null - Ghi chú khác"
 }
 
+# ============================================
+# COMBINED SUMMARY + EXTRACTION (one JSON call per chunk)
+# ============================================
+# Extraction schema plus the summary-only fields; the markdown summary is
+# rendered locally from the result (text_processor.render_summary)
+COMBINED_SCHEMA = {
+    "summary_points": ["string - 3-5 điểm chính: vấn đề gì được bàn, ai nói gì"],
+    **EXTRACTION_SCHEMA,
+    "terminology": ["string - Thuật ngữ Nhật kèm nghĩa Việt (ví dụ: 売上 - doanh thu)"]
+}
+
+COMBINED_PROMPT = """NHIỆM VỤ: Tóm tắt transcript VÀ trích xuất thông tin theo JSON schema, trong cùng một JSON.
+- CHỈ trả về JSON, không có text nào khác
+- Nếu không chắc chắn, để null
+- summary_points: 3-5 câu tóm tắt ngắn gọn
+
+JSON SCHEMA:
+```json
+{schema}
+```
+
+TRANSCRIPT:
+---
+{transcript}
+---
+
+JSON OUTPUT:
+"""
+
 # ============================================
 # Helper function to get schema as formatted JSON string
 # ============================================
@@ -98,3 +173,80 @@ def get_extraction_schema_json() -> str:
         Formatted JSON schema string
     """
     return json.dumps(EXTRACTION_SCHEMA, indent=2, ensure_ascii=False)
+
+
+def get_combined_schema_json() -> str:
+    """
+    Get combined summary + extraction schema as formatted string
+
+    Returns:
+        Formatted JSON schema string
+    """
+    return json.dumps(COMBINED_SCHEMA, indent=2, ensure_ascii=False)
+
+
+def _field_schema(example) -> dict:
+    """JSON Schema for one field of an example schema ("string or null - ...", "a | b", [..], {..})"""
+    if isinstance(example, dict):
+        return {
+            "type": "object",
+            "properties": {key: _field_schema(value) for key, value in example.items()},
+            "required": list(example.keys())
+        }
+    if isinstance(example, list):
+        return {"type": "array", "items": _field_schema(example[0]) if example else {}}
+
+    spec, _, description = str(example).partition(" - ")
+    spec = spec.strip()
+    schema: dict
+    if "|" in spec:
+        options = [o.strip() for o in spec.split("|")]
+        values = [o for o in options if o != "null"]
+        nullable = "null" in options
+        schema = {"type": ["string", "null"] if nullable else "string", "enum": values + ([None] if nullable else [])}
+    elif spec == "string or null":
+        schema = {"type": ["string", "null"]}
+    else:
+        schema = {"type": "string"}
+    if description:
+        schema["description"] = description.strip()
+    return schema
+
+
+def build_json_schema(example: dict) -> dict:
+    """
+    Convert an example schema (EXTRACTION_SCHEMA style) to a JSON Schema
+
+    Used as Ollama's structured-output `format`, which constrains generation
+    to the schema (valid JSON, every key present, enum values only).
+
+    Args:
+        example: Dict whose leaves are "type - description" strings
+
+    Returns:
+        JSON Schema dict
+    """
+    return _field_schema(example)
+
+
+EXTRACTION_JSON_SCHEMA = build_json_schema(EXTRACTION_SCHEMA)
+COMBINED_JSON_SCHEMA = build_json_schema(COMBINED_SCHEMA)
+
+
+def get_prompt_fingerprint() -> str:
+    """
+    Short hash identifying the current prompt set (used as a cache key part)
+
+    Returns:
+        Hex digest of PROMPT_VERSION + prompt templates + schema
+    """
+    payload = "\n".join([
+        PROMPT_VERSION,
+        SYSTEM_PROMPT,
+        *(SUMMARY_PROMPTS[style] for style in sorted(SUMMARY_PROMPTS)),
+        EXTRACTION_PROMPT,
+        get_extraction_schema_json(),
+        COMBINED_PROMPT,
+        get_combined_schema_json()
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
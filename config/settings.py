@@ -11,7 +11,7 @@ import psutil
 from enum import Enum
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, List
 
 # ============================================
 # Platform & Hardware Detection
@@ -108,11 +108,31 @@ class TranscriptionConfig:
         )
     )
 
-    # Workers: reduce on low RAM
+    # Workers: reduce on low RAM. On CPU this is the number of windows
+    # transcribed in parallel (ctranslate2 inter_threads); GPU always uses 1
     num_workers: int = field(default_factory=lambda:
         2 if SYSTEM_INFO["is_low_ram"] else 4
     )
 
+    # Threads per worker on CPU when chunking is enabled (0 = cpu_count // num_workers).
+    # Short files then run on one worker; chunked_mode="off" (or batched
+    # inference) loads one worker with CTranslate2's default threads
+    cpu_threads: int = 0
+
+    # Inference: "sequential" = WhisperModel.transcribe, "batched" = faster-whisper
+    # BatchedInferencePipeline (VAD segments decoded batch_size at a time)
+    inference_mode: str = "sequential"  # sequential | batched
+    batch_size: int = field(default_factory=lambda:
+        4 if SYSTEM_INFO["is_low_ram"] else 8
+    )
+
+    # Chunked long-audio mode: split at VAD silences and transcribe windows
+    # in parallel. "auto" = only on CPU for audio >= chunk_min_duration
+    chunked_mode: str = "auto"  # auto | on | off
+    chunk_length: float = 300.0  # seconds per window
+    chunk_overlap: float = 2.0  # padding on each side of a window
+    chunk_min_duration: float = 900.0
+
 # ============================================
 # Qwen LLM Configuration (Auto-optimized)
 # ============================================
@@ -140,7 +160,76 @@ class SummarizationConfig:
         else (2000 if SYSTEM_INFO["is_low_ram"] else 4000)
     )
 
+    # "separate": summary and extraction are two LLM passes over the transcript
+    # "combined": one JSON call per chunk returns the extraction fields plus
+    #             summary points; the markdown summary is rendered locally
+    #             (halves prompt processing, which dominates on GPU)
+    llm_mode: str = "separate"  # separate | combined
+
+    # Context window requested from Ollama (options.num_ctx, sent with every
+    # call so the model is never reloaded with a different size). Capped at the
+    # model's trained context_length from /api/show. Transcript chunks are sized
+    # to fit: num_ctx - max_tokens - prompt, minus chunk_safety_margin.
+    num_ctx: int = field(default_factory=lambda:
+        16384 if ACTIVE_PROFILE == ModelProfile.OPTIMIZED
+        else (8192 if SYSTEM_INFO["is_low_ram"] else 16384)
+    )
+    chunk_safety_margin: float = 0.1   # token estimates are approximate
+    chunk_overlap_tokens: int = 100    # context repeated between chunks
+
+    # Inference server API:
+    # "ollama": Ollama /api/generate (default)
+    # "openai": any OpenAI-compatible /v1/chat/completions server with
+    #           continuous batching (vLLM, llama.cpp server --parallel N):
+    #           raise max_parallel_chunks to its slot count. num_ctx,
+    #           keep_alive and model downloads are then server-side settings.
+    backend: str = "ollama"  # ollama | openai
     base_url: str = "http://localhost:11434"
+    # Several servers of that backend (overrides base_url), e.g. from
+    # LLM_ENDPOINTS="http://gpu1:11434,http://gpu2:11434". Requests go to the
+    # healthy endpoint with the fewest outstanding requests; endpoints failing
+    # a request or the model-list probe (every health_check_interval seconds)
+    # are ejected until a probe succeeds, and the request moves to another one.
+    endpoints: List[str] = field(default_factory=lambda: [
+        url.strip() for url in os.getenv("LLM_ENDPOINTS", "").split(",") if url.strip()
+    ])
+    health_check_interval: float = 10.0
+    # Bearer token for "openai" servers started with an API key
+    api_key: str = field(default_factory=lambda: os.getenv("LLM_API_KEY", ""))
+
+    # Parallel chunk summarization - keep <= OLLAMA_NUM_PARALLEL on the server
+    # (per endpoint: the total scales with the number of healthy endpoints)
+    max_parallel_chunks: int = field(default_factory=lambda:
+        2 if SYSTEM_INFO["is_low_ram"] else 4
+    )
+    chunk_retries: int = 2       # extra attempts per chunk after a failure
+    chunk_timeout: int = 300     # seconds per chunk request
+    # Hierarchical reduce: chunk summaries merged per LLM call at each level
+    # (also capped by the context window). Levels run in parallel like chunks.
+    reduce_fan_in: int = 6
+    # Chunked extraction: items across chunks at least this similar
+    # (normalized text, difflib ratio) are merged as duplicates
+    dedup_similarity: float = 0.85
+
+    # HTTP client: pooled keep-alive connections to Ollama
+    http_pool_size: int = 8
+    connect_timeout: float = 5.0
+    read_timeout: float = 300.0
+    http_retries: int = 3         # connection errors (any method) / 502-504 (GET only), with backoff
+    retry_backoff: float = 0.5    # seconds, doubled per retry
+    model_check_ttl: float = 60.0 # cache /api/tags result for this long
+
+    # Send the extraction JSON Schema as Ollama's `format` (structured outputs,
+    # Ollama >= 0.5): output always parses and has every key. False = format "json"
+    structured_output: bool = True
+
+    # Stream responses: gives time-to-first-token / tokens-per-second per call
+    # and lets JSON calls stop as soon as the object is complete or invalid
+    stream: bool = True
+
+    # Ollama keep_alive sent with every request: how long Ollama keeps the
+    # model in VRAM after a call ("5m", "1h", "-1" = forever, "0" = unload now)
+    keep_alive: str = "5m"
 
 @dataclass
 class FFmpegConfig:
@@ -151,6 +240,63 @@ class FFmpegConfig:
     normalize: bool = False
     # silence removal disabled = faster
     remove_silence: bool = False
+    # Pipe decoded PCM straight into Whisper (no temp WAV write + re-read).
+    # False = write the 16 kHz WAV to disk first (debugging)
+    in_memory: bool = True
+
+@dataclass
+class ResidencyConfig:
+    """Model residency: when Whisper stays in (V)RAM vs. hands it to Ollama"""
+    # "always": keep Whisper loaded (no 10-20s cold start)
+    # "idle_timeout": unload after whisper_idle_timeout seconds without jobs
+    # "unload_before_llm": unload before the LLM stage so Gemma gets the VRAM
+    whisper_policy: str = field(default_factory=lambda:
+        "idle_timeout" if SYSTEM_INFO["is_low_ram"] else "always"
+    )
+    whisper_idle_timeout: float = 600.0
+
+    # Load Whisper when the server starts instead of on the first job
+    preload_on_startup: bool = True
+
+    # Ask Ollama to drop its model (keep_alive=0) before transcribing
+    # (skipped while another job is in the LLM stage, e.g. staged scheduler)
+    unload_llm_before_whisper: bool = False
+
+@dataclass
+class SchedulerConfig:
+    """Job scheduling configuration (bounded queue + per-stage concurrency)"""
+    # "staged": each stage has its own queue/workers, so job N+1 is transcribed
+    #           while job N is summarized (Whisper and LLM both busy)
+    # "sequential": each worker runs the whole pipeline for one job
+    mode: str = "staged"
+
+    # Jobs waiting (in any stage queue); uploads beyond this get HTTP 429
+    max_queued_jobs: int = 20
+
+    # Sequential mode only: jobs running through the pipeline at the same time
+    max_concurrent_jobs: int = 2
+
+    # Per-stage concurrency: FFmpeg is CPU-bound, Whisper/LLM share one model each
+    ffmpeg_workers: int = field(default_factory=lambda:
+        1 if SYSTEM_INFO["is_low_ram"] else 2
+    )
+    whisper_workers: int = 1
+    llm_workers: int = 1
+    export_workers: int = 1
+
+    # Staged mode: max jobs waiting between two stages. Upstream workers block
+    # when it is reached, which bounds decoded audio held in RAM.
+    stage_buffer: int = 1
+
+    # Retry-After hint (seconds) when no job has finished yet
+    default_retry_after: int = 60
+
+@dataclass
+class CacheConfig:
+    """Content-addressed result cache (re-uploads skip FFmpeg/Whisper/LLM)"""
+    enabled: bool = True
+    # Disk budget; least-recently-used entries are evicted beyond this
+    max_size_bytes: int = 1024 * 1024 * 1024  # 1 GB
 
 @dataclass
 class AppConfig:
@@ -165,6 +311,8 @@ class AppConfig:
     models_cache: Path = base_dir / "models"
     logs_dir: Path = base_dir / "logs"
     temp_dir: Path = base_dir / "temp"
+    cache_dir: Path = base_dir / "cache"
+    jobs_db: Path = base_dir / "data" / "jobs.db"
 
     # Performance (auto-tuned based on RAM)
     max_audio_length: int = 7200  # 2 hours in seconds
@@ -184,6 +332,21 @@ class AppConfig:
         else 2 * 1024 * 1024 * 1024  # 2 GB
     )
 
+    # Uploads are streamed to disk in chunks of this size (never fully in RAM)
+    upload_chunk_size: int = 1024 * 1024  # 1 MB
+    # One resumable PUT may carry at most this many chunks (413 beyond)
+    upload_max_request_chunks: int = 8
+    # Resumable upload sessions idle longer than this are discarded
+    upload_session_ttl: int = 3600
+
+    # Progress push (SSE): updates within this window are merged into one event
+    event_coalesce_interval: float = 0.25
+    event_keepalive_interval: float = 15.0
+
+    # Finished jobs (and their output files) are deleted after this many seconds
+    job_ttl: int = 7 * 24 * 3600
+    job_prune_interval: int = 3600
+
     # Output
     output_formats: list = None
     include_metadata: bool = True
@@ -198,11 +361,16 @@ class AppConfig:
         self.models_cache.mkdir(exist_ok=True)
         self.logs_dir.mkdir(exist_ok=True)
         self.temp_dir.mkdir(exist_ok=True)
+        self.cache_dir.mkdir(exist_ok=True)
+        self.jobs_db.parent.mkdir(exist_ok=True)
 
 # Global configuration instances (auto-configured)
 TRANSCRIPTION = TranscriptionConfig()
 SUMMARIZATION = SummarizationConfig()
 FFMPEG = FFmpegConfig()
+RESIDENCY = ResidencyConfig()
+SCHEDULER = SchedulerConfig()
+CACHE = CacheConfig()
 APP = AppConfig()
 
 # ============================================
@@ -225,9 +393,17 @@ def print_config_info():
     print(f"Compute Type:   {TRANSCRIPTION.compute_type}")
     print(f"Language:       {TRANSCRIPTION.language or 'auto-detect'}")
     print(f"Workers:        {TRANSCRIPTION.num_workers}")
+    print(f"Chunked Mode:   {TRANSCRIPTION.chunked_mode} ({TRANSCRIPTION.chunk_length:.0f}s windows)")
+    print(f"Inference:      {TRANSCRIPTION.inference_mode} (batch size {TRANSCRIPTION.batch_size})")
+    print(f"Residency:      {RESIDENCY.whisper_policy} (preload: {RESIDENCY.preload_on_startup})")
+    print("-"*60)
+    print(f"LLM Model:      {SUMMARIZATION.model} ({SUMMARIZATION.backend} @ {', '.join(SUMMARIZATION.endpoints) or SUMMARIZATION.base_url})")
+    print(f"Max Tokens:     {SUMMARIZATION.max_tokens} (context {SUMMARIZATION.num_ctx})")
+    print(f"LLM Mode:       {SUMMARIZATION.llm_mode}")
+    print(f"Chunk Parallel: {SUMMARIZATION.max_parallel_chunks}")
     print("-"*60)
-    print(f"LLM Model:      {SUMMARIZATION.model}")
-    print(f"Max Tokens:     {SUMMARIZATION.max_tokens}")
+    print(f"Scheduler:      {SCHEDULER.mode} (queue limit: {SCHEDULER.max_queued_jobs})")
+    print(f"Stage Workers:  ffmpeg={SCHEDULER.ffmpeg_workers} whisper={SCHEDULER.whisper_workers} llm={SCHEDULER.llm_workers}")
     print("-"*60)
     print(f"Chunk Size:     {APP.chunk_size}")
     print(f"Max File Size:  {APP.max_file_size / (1024*1024):.0f} MB")
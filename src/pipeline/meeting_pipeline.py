@@ -1,12 +1,18 @@
 """
 Main pipeline for meeting transcription and summarization
 """
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Callable, Tuple
+from typing import Optional, Callable, Tuple, Dict, List
 from datetime import datetime
 
+import numpy as np
+
 from ..transcription.audio_processor import AudioProcessor
 from ..transcription.whisper_service import WhisperService
+from ..transcription.model_residency import ModelResidencyManager
 from ..summarization.qwen_service import QwenService
 from ..summarization.extractor import MeetingExtractor
 from ..export.docx_exporter import MeetingDocxExporter
@@ -16,142 +22,341 @@ from ..utils.file_handler import (
     is_valid_audio_file, get_file_size, format_file_size
 )
 from ..utils.text_processor import clean_text
-from config.settings import APP, TRANSCRIPTION, SUMMARIZATION
+from ..utils.tracing import JobTrace, span
+from config.settings import APP, TRANSCRIPTION, SUMMARIZATION, FFMPEG
+
+
+# Pipeline stages in execution order
+STAGES = ("ffmpeg", "whisper", "llm", "export")
+
+
+@dataclass
+class PipelineContext:
+    """Per-job state handed from one stage to the next"""
+    audio_file: Path
+    progress_callback: Optional[Callable[[float, str], None]] = None
+    segment_callback: Optional[Callable[[dict], None]] = None
+    remove_temp: bool = True
+    started_at: datetime = field(default_factory=datetime.now)
+
+    # SHA-256 of the uploaded audio (cache key); computed on demand if missing
+    audio_hash: Optional[str] = None
+    cached_stages: List[str] = field(default_factory=list)
+    trace: JobTrace = field(default_factory=JobTrace)
+
+    # Stage outputs
+    preprocessed_path: Optional[Path] = None
+    # Decoded 16 kHz mono PCM when FFMPEG.in_memory (released after Whisper)
+    audio_samples: Optional[np.ndarray] = None
+    transcript: Optional[str] = None
+    summary: Optional[str] = None
+    extracted_data: Optional[dict] = None
+    outputs: Optional[Tuple[Path, Path, Path]] = None
+
+    def report(self, progress: float, status: str):
+        if self.progress_callback:
+            self.progress_callback(progress, status)
 
 
 class MeetingPipeline:
     """Main processing pipeline"""
     
-    def __init__(self):
-        """Initialize pipeline components"""
+    def __init__(self, stage_limits: Optional[Dict[str, int]] = None, cache=None):
+        """
+        Initialize pipeline components
+
+        Args:
+            stage_limits: Max concurrent jobs per stage (see STAGES).
+                Stages not listed are unlimited.
+            cache: ResultCache used to skip stages whose inputs are unchanged
+        """
         self.audio_processor = AudioProcessor()
         self.whisper_service = WhisperService()
         self.qwen_service = QwenService()
         self.extractor = MeetingExtractor(self.qwen_service)
-        self.docx_exporter = MeetingDocxExporter()
+        self.residency = ModelResidencyManager(self.whisper_service, self.qwen_service)
+        self.cache = cache
+
+        self._stage_slots = {
+            name: threading.BoundedSemaphore(max(1, limit))
+            for name, limit in (stage_limits or {}).items()
+        }
+
+    @contextmanager
+    def _stage(self, name: str):
+        """Hold a concurrency slot for a pipeline stage"""
+        slot = self._stage_slots.get(name)
+        if slot is None:
+            yield
+            return
+
+        if not slot.acquire(blocking=False):
+            logger.info(f"Waiting for free {name} slot")
+            slot.acquire()
+        try:
+            yield
+        finally:
+            slot.release()
         
-    def process(
+    def create_context(
         self,
         audio_file: Path,
         progress_callback: Optional[Callable[[float, str], None]] = None,
-        remove_temp: bool = True
-    ) -> Tuple[Path, Path, Path]:
+        remove_temp: bool = True,
+        segment_callback: Optional[Callable[[dict], None]] = None,
+        audio_hash: Optional[str] = None,
+        trace: Optional[JobTrace] = None
+    ) -> PipelineContext:
         """
-        Process audio file: preprocess, transcribe, summarize, extract, export
+        Validate input and create the per-job context used by run_stage()
 
         Args:
             audio_file: Input audio file path
             progress_callback: Callback function(progress: float, status: str)
             remove_temp: Whether to remove temporary files
+            segment_callback: Called with each transcript segment as it is decoded
+            audio_hash: SHA-256 of the audio file, if already known
+            trace: Span collector for this job (a new one if omitted)
 
         Returns:
-            Tuple of (transcript_path, summary_path, docx_path)
+            PipelineContext for this job
         """
         logger.info(f"Starting pipeline: {audio_file.name}")
-        start_time = datetime.now()
-        
+        trace = trace or JobTrace()
+
         # Validate input file
-        is_valid, error_msg = is_valid_audio_file(audio_file)
-        if not is_valid:
-            raise ValueError(error_msg)
-        
-        file_size = get_file_size(audio_file)
+        with trace.activate(), span("validate"):
+            is_valid, error_msg = is_valid_audio_file(audio_file)
+            if not is_valid:
+                raise ValueError(error_msg)
+
+            file_size = get_file_size(audio_file)
         logger.info(f"Input file: {audio_file.name} ({format_file_size(file_size)})")
-        
+
+        return PipelineContext(
+            audio_file=audio_file,
+            progress_callback=progress_callback,
+            segment_callback=segment_callback,
+            remove_temp=remove_temp,
+            audio_hash=audio_hash,
+            trace=trace
+        )
+
+    def run_stage(self, stage: str, ctx: PipelineContext):
+        """
+        Run one pipeline stage on a job context
+
+        Args:
+            stage: One of STAGES
+            ctx: Job context, updated in place
+        """
+        handlers = {
+            "ffmpeg": self._run_ffmpeg,
+            "whisper": self._run_whisper,
+            "llm": self._run_llm,
+            "export": self._run_export
+        }
+        if stage not in handlers:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+
         try:
-            # Step 1: Preprocess audio
-            if progress_callback:
-                progress_callback(5, "Preparing audio...")
-            
-            logger.info("Step 1/3: Preprocessing audio")
-            preprocessed_path = self.audio_processor.preprocess(audio_file)
-            
-            if progress_callback:
-                progress_callback(10, "Converting speech to text...")
-            
-            # Step 2: Transcribe
-            logger.info("Step 2/3: Transcribing")
+            with ctx.trace.activate(), span(f"stage.{stage}"):
+                handlers[stage](ctx)
+        except MemoryError as e:
+            logger.error(f"Out of memory: {e}")
+            raise RuntimeError("Out of memory. Please close other applications and try again.") from e
+
+    def finish(self, ctx: PipelineContext):
+        """Cleanup temp files of a finished (or failed) job"""
+        ctx.audio_samples = None
+
+        # Only remove this job's WAV - other jobs may be using the temp dir
+        if ctx.remove_temp and ctx.preprocessed_path is not None:
             try:
-                transcript = self.whisper_service.transcribe(
-                    preprocessed_path,
-                    progress_callback=progress_callback
-                )
+                if ctx.preprocessed_path.exists():
+                    ctx.preprocessed_path.unlink()
             except Exception as e:
-                logger.error(f"Transcription error: {e}", exc_info=True)
-                # Try to continue with empty transcript or re-raise
-                raise RuntimeError(f"Transcription failed: {e}") from e
-            
-            # Clean transcript
-            transcript = clean_text(transcript)
-            
-            if progress_callback:
-                progress_callback(80, "Generating summary...")
-            
-            # Step 3: Summarize
-            logger.info("Step 3/5: Summarizing")
-            summary = self.qwen_service.summarize(
-                transcript,
-                progress_callback=progress_callback
-            )
+                logger.warning(f"Failed to remove temp file: {e}")
 
-            # Step 4: Extract structured data
-            if progress_callback:
-                progress_callback(85, "Extracting meeting information...")
+        if ctx.outputs is not None:
+            duration = (datetime.now() - ctx.started_at).total_seconds()
+            logger.info(f"Pipeline completed in {duration:.2f}s")
 
-            logger.info("Step 4/5: Extracting structured data")
-            extracted_data = self.extractor.extract(
-                transcript,
-                progress_callback=progress_callback
-            )
+    def process(
+        self,
+        audio_file: Path,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        remove_temp: bool = True,
+        segment_callback: Optional[Callable[[dict], None]] = None,
+        audio_hash: Optional[str] = None
+    ) -> Tuple[Path, Path, Path]:
+        """
+        Process audio file: preprocess, transcribe, summarize, extract, export
 
-            # Step 5: Generate DOCX
-            if progress_callback:
-                progress_callback(95, "Generating DOCX report...")
+        Args:
+            audio_file: Input audio file path
+            progress_callback: Callback function(progress: float, status: str)
+            remove_temp: Whether to remove temporary files
+            segment_callback: Called with each transcript segment as it is decoded
+            audio_hash: SHA-256 of the audio file, if already known
 
-            logger.info("Step 5/5: Generating DOCX report")
+        Returns:
+            Tuple of (transcript_path, summary_path, docx_path)
+        """
+        ctx = self.create_context(audio_file, progress_callback, remove_temp, segment_callback, audio_hash)
+        return self.run(ctx)
 
-            # Save outputs
-            logger.info("Saving outputs")
-            transcript_path, summary_path, docx_path = self._save_outputs(
-                audio_file.stem,
-                transcript,
-                summary,
-                extracted_data
-            )
+    def run(self, ctx: PipelineContext) -> Tuple[Path, Path, Path]:
+        """
+        Run all stages in order on a context from create_context()
 
-            if progress_callback:
-                progress_callback(100, "Completed!")
-            
-            # Cleanup
-            if remove_temp:
-                from ..utils.file_handler import clean_temp_files
-                clean_temp_files(preprocessed_path.parent)
-                if preprocessed_path.exists():
-                    preprocessed_path.unlink()
-            
-            # Log completion
-            duration = (datetime.now() - start_time).total_seconds()
-            logger.info(f"Pipeline completed in {duration:.2f}s")
+        Returns:
+            Tuple of (transcript_path, summary_path, docx_path)
+        """
+        try:
+            for stage in STAGES:
+                with self._stage(stage):
+                    self.run_stage(stage, ctx)
+
+            return ctx.outputs
 
-            return transcript_path, summary_path, docx_path
-            
         except KeyboardInterrupt:
             logger.warning("Pipeline interrupted by user")
             raise
-        except MemoryError as e:
-            logger.error(f"Out of memory: {e}")
-            raise RuntimeError("Out of memory. Please close other applications and try again.") from e
         except Exception as e:
             logger.error(f"Pipeline failed: {e}", exc_info=True)
             raise
         finally:
-            # TEMPORARILY DISABLED - Testing if this causes crash with small model
-            # Always unload Whisper model to free memory
-            # try:
-            #     self.whisper_service.unload_model()
-            # except Exception as e:
-            #     logger.warning(f"Error unloading model: {e}")
-            pass
+            # Whisper unloading is handled by self.residency (see ResidencyConfig)
+            self.finish(ctx)
+
+    def _cache_get(self, ctx: PipelineContext, kind: str, key: str):
+        if self.cache is None or not self.cache.enabled:
+            return None
+        value = self.cache.get(kind, key)
+        if value is not None:
+            ctx.cached_stages.append(kind)
+        return value
+
+    def _cache_put(self, kind: str, key: str, value):
+        if self.cache is not None and self.cache.enabled:
+            self.cache.put(kind, key, value)
+
+    def _run_ffmpeg(self, ctx: PipelineContext):
+        """Step 1: Preprocess audio (skipped if the transcript is cached)"""
+        ctx.report(5, "Preparing audio...")
+
+        if self.cache is not None and self.cache.enabled:
+            if ctx.audio_hash is None:
+                from ..services.result_cache import hash_file
+                with span("ffmpeg.hash"):
+                    ctx.audio_hash = hash_file(ctx.audio_file)
+
+            cached = self._cache_get(ctx, "transcript", self.cache.transcript_key(ctx.audio_hash))
+            if cached is not None:
+                logger.info("Transcript found in cache, skipping FFmpeg + Whisper")
+                ctx.transcript = cached
+                ctx.report(80, "Generating summary...")
+                return
+
+        logger.info("Step 1/5: Preprocessing audio")
+        with span("ffmpeg.decode", in_memory=FFMPEG.in_memory):
+            if FFMPEG.in_memory:
+                ctx.audio_samples = self.audio_processor.load_pcm(ctx.audio_file)
+            else:
+                ctx.preprocessed_path = self.audio_processor.preprocess(ctx.audio_file)
+
+        ctx.report(10, "Converting speech to text...")
+
+    def _run_whisper(self, ctx: PipelineContext):
+        """Step 2: Transcribe"""
+        if ctx.transcript is not None:
+            return
+
+        logger.info("Step 2/5: Transcribing")
+        audio = ctx.audio_samples if ctx.audio_samples is not None else ctx.preprocessed_path
+        try:
+            with self.residency.use_whisper(), span("whisper.transcribe"):
+                transcript = self.whisper_service.transcribe(
+                    audio,
+                    progress_callback=ctx.progress_callback,
+                    segment_callback=ctx.segment_callback
+                )
+        except Exception as e:
+            logger.error(f"Transcription error: {e}", exc_info=True)
+            raise RuntimeError(f"Transcription failed: {e}") from e
+        finally:
+            # Release the decoded audio before the (long) LLM stage
+            ctx.audio_samples = None
+            del audio
+
+        # Clean transcript
+        with span("clean"):
+            ctx.transcript = clean_text(transcript)
+        if self.cache is not None and ctx.audio_hash is not None and ctx.transcript:
+            self._cache_put("transcript", self.cache.transcript_key(ctx.audio_hash), ctx.transcript)
+
+        # WAV is no longer needed once transcribed
+        if ctx.remove_temp and ctx.preprocessed_path is not None and ctx.preprocessed_path.exists():
+            ctx.preprocessed_path.unlink()
+
+        ctx.report(80, "Generating summary...")
+
+    def _run_llm(self, ctx: PipelineContext):
+        """Steps 3-4: Summarize and extract structured data"""
+        with self.residency.use_llm():
+            summary_key = self.cache.summary_key(ctx.transcript) if self.cache is not None else None
+            extraction_key = self.cache.extraction_key(ctx.transcript) if self.cache is not None else None
+
+            if SUMMARIZATION.llm_mode == "combined":
+                ctx.summary = self._cache_get(ctx, "summary", summary_key)
+                ctx.extracted_data = self._cache_get(ctx, "extraction", extraction_key)
+                if ctx.summary is None or ctx.extracted_data is None:
+                    logger.info("Steps 3-4/5: Summarizing + extracting (combined)")
+                    ctx.summary, ctx.extracted_data = self.extractor.extract_combined(
+                        ctx.transcript,
+                        progress_callback=ctx.progress_callback
+                    )
+                    self._cache_put("summary", summary_key, ctx.summary)
+                    if not ctx.extracted_data.get("_fallback"):
+                        self._cache_put("extraction", extraction_key, ctx.extracted_data)
+                return
+
+            ctx.summary = self._cache_get(ctx, "summary", summary_key)
+            if ctx.summary is None:
+                logger.info("Step 3/5: Summarizing")
+                ctx.summary = self.qwen_service.summarize(
+                    ctx.transcript,
+                    progress_callback=ctx.progress_callback
+                )
+                self._cache_put("summary", summary_key, ctx.summary)
+
+            ctx.report(85, "Extracting meeting information...")
+
+            ctx.extracted_data = self._cache_get(ctx, "extraction", extraction_key)
+            if ctx.extracted_data is None:
+                logger.info("Step 4/5: Extracting structured data")
+                ctx.extracted_data = self.extractor.extract(
+                    ctx.transcript,
+                    progress_callback=ctx.progress_callback
+                )
+                # Don't cache the fallback structure - the next run should retry the LLM
+                if not ctx.extracted_data.get("_fallback"):
+                    self._cache_put("extraction", extraction_key, ctx.extracted_data)
+
+    def _run_export(self, ctx: PipelineContext):
+        """Step 5: Save transcript, summary and DOCX"""
+        ctx.report(95, "Generating DOCX report...")
+
+        logger.info("Step 5/5: Generating DOCX report")
+        ctx.outputs = self._save_outputs(
+            ctx.audio_file.stem,
+            ctx.transcript,
+            ctx.summary,
+            ctx.extracted_data
+        )
+
+        ctx.report(100, "Completed!")
     
     def _save_outputs(
         self,
@@ -184,16 +389,18 @@ class MeetingPipeline:
         full_transcript = self._format_transcript(transcript)
 
         # Save text files
-        save_text_file(full_transcript, transcript_file)
-        save_text_file(summary, summary_file)
-
-        # Generate DOCX
-        self.docx_exporter.export(
-            extracted_data=extracted_data,
-            transcript=transcript,
-            output_path=str(docx_file),
-            include_transcript=True
-        )
+        with span("export.write"):
+            save_text_file(full_transcript, transcript_file)
+            save_text_file(summary, summary_file)
+
+        # Generate DOCX (exporter keeps per-document state, so one per call)
+        with span("export.docx"):
+            MeetingDocxExporter().export(
+                extracted_data=extracted_data,
+                transcript=transcript,
+                output_path=str(docx_file),
+                include_transcript=True
+            )
 
         logger.info(f"Transcript saved: {transcript_file.name}")
         logger.info(f"Summary saved: {summary_file.name}")
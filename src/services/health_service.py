@@ -4,17 +4,32 @@ import shutil
 import datetime
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from src.utils.system_checker import check_python_version, check_ffmpeg, check_ollama
 from config.settings import APP, TRANSCRIPTION, SUMMARIZATION
 
 class HealthService:
     @staticmethod
-    def check_system() -> Dict[str, Any]:
-        """Kiểm tra trạng thái toàn bộ hệ thống"""
+    def check_system(
+        residency: Optional[Dict[str, Any]] = None,
+        llm_client=None
+    ) -> Dict[str, Any]:
+        """Kiểm tra trạng thái toàn bộ hệ thống
+
+        Args:
+            residency: ModelResidencyManager.status() snapshot (model load state)
+            llm_client: The pipeline's LLMBackend, so endpoint health and load
+                are those of the client carrying the traffic (a temporary one
+                is created if omitted)
+        """
         checks = {}
         overall_status = "healthy"
+        use_llm_client = SUMMARIZATION.backend != "ollama" or bool(SUMMARIZATION.endpoints)
+        own_client = None
+        if use_llm_client and llm_client is None:
+            from src.summarization.backends import create_backend
+            llm_client = own_client = create_backend(SUMMARIZATION)
         
         # 1. Python version
         try:
@@ -61,16 +76,35 @@ class HealthService:
             checks["ffmpeg"] = {"status": "error", "message": str(e)}
             overall_status = "degraded"
         
-        # 3. Ollama
+        # 3. Ollama (or the OpenAI-compatible server of SUMMARIZATION.backend)
         try:
-            ollama_ok, ollama_msg = check_ollama()
+            endpoints = None
+            endpoints_down = False
+            if not use_llm_client:
+                ollama_ok, ollama_msg = check_ollama()
+                recommendation = "Chạy lệnh: ollama serve"
+            else:
+                ollama_ok = llm_client.is_available()
+                ollama_msg = "LLM server đang chạy" if ollama_ok else "LLM server không phản hồi"
+                recommendation = f"Khởi động LLM server tại {llm_client.base_url}"
+                # Routing state of the client carrying the traffic (read after
+                # is_available, which ejects endpoints that failed to answer)
+                endpoints = llm_client.endpoint_stats() or None
+                if endpoints:
+                    down = [e["url"] for e in endpoints if not e["healthy"]]
+                    ollama_msg += f" ({len(endpoints) - len(down)}/{len(endpoints)} endpoint hoạt động)"
+                    if down:
+                        endpoints_down = True
+                        recommendation = f"Kiểm tra LLM server tại {', '.join(down)}"
             checks["ollama"] = {
                 "status": "ok" if ollama_ok else "error",
-                "url": SUMMARIZATION.base_url,
+                "backend": SUMMARIZATION.backend,
+                "url": ", ".join(SUMMARIZATION.endpoints) or SUMMARIZATION.base_url,
+                "endpoints": endpoints,
                 "message": ollama_msg,
-                "recommendation": "Chạy lệnh: ollama serve" if not ollama_ok else None
+                "recommendation": recommendation if not ollama_ok or endpoints_down else None
             }
-            if not ollama_ok:
+            if not ollama_ok or endpoints_down:
                 overall_status = "degraded"
         except Exception as e:
             checks["ollama"] = {"status": "error", "message": str(e)}
@@ -162,34 +196,54 @@ class HealthService:
             checks["whisper_model"] = {"status": "error", "message": str(e)}
         
         # 7. Qwen model in Ollama
-        try:
-            import requests
-            response = requests.get(
-                f"{SUMMARIZATION.base_url}/api/tags",
-                timeout=2
-            )
-            if response.status_code == 200:
-                models = response.json().get("models", [])
-                qwen_models = [m for m in models if SUMMARIZATION.model in m.get("name", "")]
+        if use_llm_client:
+            try:
+                model_ok = llm_client.has_model(SUMMARIZATION.model)
                 checks["qwen_model"] = {
-                    "status": "ok" if qwen_models else "missing",
+                    "status": "ok" if model_ok else "missing",
                     "model": SUMMARIZATION.model,
-                    "message": "Model đã cài đặt" if qwen_models else f"Model chưa cài. Chạy: ollama pull {SUMMARIZATION.model}",
-                    "recommendation": f"ollama pull {SUMMARIZATION.model}" if not qwen_models else None
+                    "message": "Model đang được phục vụ" if model_ok else "LLM server không phục vụ model này"
                 }
-                if not qwen_models:
+                if not model_ok:
                     overall_status = "degraded" if overall_status == "healthy" else overall_status
-            else:
+            except Exception as e:
+                checks["qwen_model"] = {"status": "error", "message": f"Không thể kiểm tra: {str(e)}"}
+        else:
+            try:
+                import requests
+                response = requests.get(
+                    f"{SUMMARIZATION.base_url}/api/tags",
+                    timeout=2
+                )
+                if response.status_code == 200:
+                    models = response.json().get("models", [])
+                    qwen_models = [m for m in models if SUMMARIZATION.model in m.get("name", "")]
+                    checks["qwen_model"] = {
+                        "status": "ok" if qwen_models else "missing",
+                        "model": SUMMARIZATION.model,
+                        "message": "Model đã cài đặt" if qwen_models else f"Model chưa cài. Chạy: ollama pull {SUMMARIZATION.model}",
+                        "recommendation": f"ollama pull {SUMMARIZATION.model}" if not qwen_models else None
+                    }
+                    if not qwen_models:
+                        overall_status = "degraded" if overall_status == "healthy" else overall_status
+                else:
+                    checks["qwen_model"] = {
+                        "status": "error",
+                        "message": "Không thể kiểm tra model trong Ollama"
+                    }
+            except Exception as e:
                 checks["qwen_model"] = {
                     "status": "error",
-                    "message": "Không thể kiểm tra model trong Ollama"
+                    "message": f"Không thể kiểm tra: {str(e)}"
                 }
-        except Exception as e:
-            checks["qwen_model"] = {
-                "status": "error",
-                "message": f"Không thể kiểm tra: {str(e)}"
-            }
         
+        if own_client is not None:
+            own_client.close()
+
+        # 8. Whisper residency (loaded/unloaded, load times)
+        if residency is not None:
+            checks["model_residency"] = residency
+
         return {
             "status": overall_status,
             "checks": checks,
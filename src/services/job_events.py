@@ -0,0 +1,161 @@
+"""
+Push channel for job progress (Server-Sent Events)
+File: src/services/job_events.py
+
+Worker threads publish; each SSE connection holds a subscription that keeps
+only the latest progress state plus the transcript segments it has not sent
+yet, so bursts of updates collapse into one event per flush.
+"""
+import asyncio
+import json
+import threading
+from typing import Dict, List, Optional, Any, AsyncIterator
+
+from src.utils.logger import logger
+
+# Events that end the stream
+TERMINAL_EVENTS = ("completed", "failed")
+
+
+class JobSubscription:
+    """Pending (coalesced) events for one connected client"""
+
+    def __init__(self, job_id: str, loop: asyncio.AbstractEventLoop, next_segment: int = 0):
+        self.job_id = job_id
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._lock = threading.Lock()
+
+        self.progress: Optional[Dict[str, Any]] = None
+        self.segments: List[dict] = []
+        self.next_segment = next_segment
+        self.terminal: Optional[tuple] = None
+
+    def push(self, event: str, data: Dict[str, Any]):
+        """Called from any thread"""
+        with self._lock:
+            if event == "progress":
+                self.progress = data  # Only the latest state matters
+            elif event == "segment":
+                if data["index"] >= self.next_segment:
+                    self.segments.append(data)
+                    self.next_segment = data["index"] + 1
+            elif event in TERMINAL_EVENTS:
+                self.terminal = (event, data)
+
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            pass  # Event loop already closed
+
+    def drain(self) -> List[tuple]:
+        """Take pending events in delivery order: progress, segments, terminal"""
+        with self._lock:
+            events = []
+            if self.progress is not None:
+                events.append(("progress", self.progress))
+                self.progress = None
+            if self.segments:
+                events.append(("segments", {
+                    "segments": self.segments,
+                    "next": self.next_segment
+                }))
+                self.segments = []
+            if self.terminal is not None:
+                events.append(self.terminal)
+            self._wake.clear()
+            return events
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class JobEventBus:
+    """Fan out job events from worker threads to SSE subscribers"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[JobSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self,
+        job_id: str,
+        next_segment: int = 0,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> JobSubscription:
+        """Register a subscription consumed on loop (default: the running event loop)"""
+        subscription = JobSubscription(job_id, loop or asyncio.get_running_loop(), next_segment)
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: JobSubscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.job_id, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.job_id, None)
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any]):
+        """Deliver an event to every subscriber of a job (no-op if none)"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, ()))
+        for subscription in subscribers:
+            subscription.push(event, data)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def stream_job_events(
+    bus: JobEventBus,
+    subscription: JobSubscription,
+    initial: List[tuple],
+    coalesce_interval: float = 0.25,
+    keepalive_interval: float = 15.0
+) -> AsyncIterator[str]:
+    """
+    SSE body for one job
+
+    Args:
+        bus: Event bus the subscription belongs to
+        subscription: Subscription created before the initial snapshot was taken
+        initial: (event, data) pairs sent first (current state)
+        coalesce_interval: Minimum seconds between flushes
+        keepalive_interval: Seconds of silence before a comment line is sent
+
+    Yields:
+        SSE-formatted chunks until a completed/failed event has been sent
+    """
+    try:
+        for event, data in initial:
+            yield format_sse(event, data)
+            if event in TERMINAL_EVENTS:
+                return
+
+        while True:
+            if not await subscription.wait(keepalive_interval):
+                yield ": keepalive\n\n"
+                continue
+
+            # Let rapid updates pile up, then send only the latest state
+            await asyncio.sleep(coalesce_interval)
+            for event, data in subscription.drain():
+                yield format_sse(event, data)
+                if event in TERMINAL_EVENTS:
+                    return
+    except asyncio.CancelledError:
+        logger.debug(f"Event stream for job {subscription.job_id} closed by client")
+        raise
+    finally:
+        bus.unsubscribe(subscription)
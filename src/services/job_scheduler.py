@@ -0,0 +1,439 @@
+"""
+Bounded job scheduler with backpressure
+File: src/services/job_scheduler.py
+"""
+import math
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Optional, Tuple, Any
+
+from src.pipeline.meeting_pipeline import STAGES
+from src.utils.logger import logger
+from config.settings import SCHEDULER
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is full (mapped to HTTP 429)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class JobScheduler:
+    """Run jobs on a fixed pool of worker threads fed by a bounded FIFO queue"""
+
+    def __init__(
+        self,
+        handler: Callable[[str, Path], None],
+        config=None
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            handler: Function(job_id, audio_path) that processes one job
+            config: SchedulerConfig instance
+        """
+        self.config = config or SCHEDULER
+        self.handler = handler
+
+        self._pending: Deque[Tuple[str, Path]] = deque()
+        self._running: Dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._workers = []
+        self._started = False
+        self._stopping = False
+
+        # Recent job durations, used for the Retry-After estimate
+        self._durations: Deque[float] = deque(maxlen=20)
+
+    def start(self):
+        """Start worker threads (idempotent)"""
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+            self._stopping = False
+
+        for i in range(max(1, self.config.max_concurrent_jobs)):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"job-worker-{i}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+        logger.info(f"Job scheduler started with {len(self._workers)} workers")
+
+    def shutdown(self, wait: bool = False):
+        """Stop workers after their current job"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def is_full(self) -> bool:
+        with self._cond:
+            return len(self._pending) >= self.config.max_queued_jobs
+
+    def submit(self, job_id: str, audio_path: Path) -> int:
+        """
+        Enqueue a job
+
+        Args:
+            job_id: Job ID
+            audio_path: Uploaded audio file
+
+        Returns:
+            1-based queue position
+
+        Raises:
+            QueueFullError: If the queue already holds max_queued_jobs jobs
+        """
+        self.start()
+
+        with self._cond:
+            if len(self._pending) >= self.config.max_queued_jobs:
+                raise QueueFullError(self._estimate_retry_after())
+
+            self._pending.append((job_id, audio_path))
+            position = len(self._pending)
+            self._cond.notify()
+
+        logger.info(f"Job {job_id} queued at position {position}")
+        return position
+
+    def position(self, job_id: str) -> Optional[int]:
+        """Return 1-based queue position, or None if the job is not waiting"""
+        with self._cond:
+            for index, (queued_id, _) in enumerate(self._pending):
+                if queued_id == job_id:
+                    return index + 1
+        return None
+
+    def locate(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Where the job is: waiting in the queue or running"""
+        position = self.position(job_id)
+        if position is not None:
+            return {"name": "queue", "state": "waiting", "position": position}
+        with self._cond:
+            if job_id in self._running:
+                return {"name": "pipeline", "state": "running", "position": None}
+        return None
+
+    def retry_after(self) -> int:
+        with self._cond:
+            return self._estimate_retry_after()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue state"""
+        with self._cond:
+            return {
+                "mode": "sequential",
+                "queued": len(self._pending),
+                "running": len(self._running),
+                "max_queued_jobs": self.config.max_queued_jobs,
+                "max_concurrent_jobs": self.config.max_concurrent_jobs
+            }
+
+    def _estimate_retry_after(self) -> int:
+        """Estimate seconds until a queue slot frees up (caller holds the lock)"""
+        if not self._durations:
+            return self.config.default_retry_after
+
+        avg_duration = sum(self._durations) / len(self._durations)
+        workers = max(1, self.config.max_concurrent_jobs)
+        return max(1, math.ceil(avg_duration / workers))
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                job_id, audio_path = self._pending.popleft()
+                self._running[job_id] = time.time()
+
+            try:
+                self.handler(job_id, audio_path)
+            except Exception as e:
+                logger.error(f"Worker error on job {job_id}: {e}", exc_info=True)
+            finally:
+                with self._cond:
+                    started = self._running.pop(job_id, None)
+                    if started is not None:
+                        self._durations.append(time.time() - started)
+
+
+class _StageQueue:
+    """Pending jobs and busy-time accounting for one pipeline stage"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = max(1, workers)
+        self.pending: Deque["_StagedJob"] = deque()
+        self.running: Dict[str, float] = {}
+        # Finished here, waiting for room in the next stage (backpressure)
+        self.blocked: Dict[str, float] = {}
+        self.busy_seconds = 0.0
+        self.processed = 0
+        self.failed = 0
+
+    def snapshot(self, elapsed: float) -> Dict[str, Any]:
+        now = time.time()
+        busy = self.busy_seconds + sum(now - t for t in self.running.values())
+        capacity = elapsed * self.workers
+        return {
+            "workers": self.workers,
+            "queue_depth": len(self.pending),
+            "busy_workers": len(self.running),
+            "blocked": len(self.blocked),
+            "processed": self.processed,
+            "failed": self.failed,
+            "avg_seconds": round(self.busy_seconds / self.processed, 2) if self.processed else None,
+            "utilization": round(min(1.0, busy / capacity), 3) if capacity > 0 else 0.0
+        }
+
+
+class _StagedJob:
+    __slots__ = ("job_id", "audio_path", "ctx")
+
+    def __init__(self, job_id: str, audio_path: Path):
+        self.job_id = job_id
+        self.audio_path = audio_path
+        self.ctx = None
+
+
+class StagedJobScheduler:
+    """Pipelined scheduler: one queue and worker pool per pipeline stage
+
+    A job moves ffmpeg -> whisper -> llm -> export, so while job N is in the
+    LLM stage job N+1 can already be transcribed. Same interface as JobScheduler.
+
+    A worker only hands a job on while the next stage has fewer than
+    `stage_buffer` jobs waiting; otherwise it holds the job (and stops taking
+    new ones), which bounds the decoded audio kept in memory between stages.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        on_start: Callable[[str, Path], Any],
+        on_complete: Callable[[str, Any], None],
+        on_error: Callable[[str, Path, Any, Exception], None],
+        config=None
+    ):
+        """
+        Initialize staged scheduler
+
+        Args:
+            pipeline: MeetingPipeline (provides run_stage)
+            on_start: Function(job_id, audio_path) -> PipelineContext
+            on_complete: Function(job_id, ctx) after the last stage
+            on_error: Function(job_id, audio_path, ctx or None, error)
+            config: SchedulerConfig instance
+        """
+        self.config = config or SCHEDULER
+        self.pipeline = pipeline
+        self.on_start = on_start
+        self.on_complete = on_complete
+        self.on_error = on_error
+
+        worker_counts = {
+            "ffmpeg": self.config.ffmpeg_workers,
+            "whisper": self.config.whisper_workers,
+            "llm": self.config.llm_workers,
+            "export": self.config.export_workers
+        }
+        self._stages = [_StageQueue(name, worker_counts.get(name, 1)) for name in STAGES]
+
+        self._cond = threading.Condition()
+        self._workers = []
+        self._started = False
+        self._stopping = False
+        self._started_at = time.time()
+
+    def start(self):
+        """Start worker threads for every stage (idempotent)"""
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+            self._stopping = False
+            self._started_at = time.time()
+
+        for index, stage in enumerate(self._stages):
+            for i in range(stage.workers):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    args=(index,),
+                    name=f"{stage.name}-worker-{i}",
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+        logger.info(
+            "Staged scheduler started: "
+            + ", ".join(f"{s.name}={s.workers}" for s in self._stages)
+        )
+
+    def shutdown(self, wait: bool = False):
+        """Stop workers after their current stage"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _waiting(self) -> int:
+        return sum(len(stage.pending) + len(stage.blocked) for stage in self._stages)
+
+    def is_full(self) -> bool:
+        with self._cond:
+            return self._waiting() >= self.config.max_queued_jobs
+
+    def submit(self, job_id: str, audio_path: Path) -> int:
+        """
+        Enqueue a job at the first stage
+
+        Returns:
+            1-based position in the first stage queue
+
+        Raises:
+            QueueFullError: If max_queued_jobs jobs are already waiting
+        """
+        self.start()
+
+        with self._cond:
+            if self._waiting() >= self.config.max_queued_jobs:
+                raise QueueFullError(self._estimate_retry_after())
+
+            first = self._stages[0]
+            first.pending.append(_StagedJob(job_id, audio_path))
+            position = len(first.pending)
+            self._cond.notify_all()
+
+        logger.info(f"Job {job_id} queued at position {position}")
+        return position
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position in the first stage queue, None once started"""
+        with self._cond:
+            for index, job in enumerate(self._stages[0].pending):
+                if job.job_id == job_id:
+                    return index + 1
+        return None
+
+    def locate(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current stage of a job and whether it is waiting or running"""
+        with self._cond:
+            for stage in self._stages:
+                if job_id in stage.running:
+                    return {"name": stage.name, "state": "running", "position": None}
+                if job_id in stage.blocked:
+                    return {"name": stage.name, "state": "blocked", "position": None}
+                for index, job in enumerate(stage.pending):
+                    if job.job_id == job_id:
+                        return {"name": stage.name, "state": "waiting", "position": index + 1}
+        return None
+
+    def retry_after(self) -> int:
+        with self._cond:
+            return self._estimate_retry_after()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-stage queue depth and utilization"""
+        with self._cond:
+            elapsed = time.time() - self._started_at
+            return {
+                "mode": "staged",
+                "queued": self._waiting(),
+                "running": sum(len(stage.running) for stage in self._stages),
+                "max_queued_jobs": self.config.max_queued_jobs,
+                "stages": {stage.name: stage.snapshot(elapsed) for stage in self._stages}
+            }
+
+    def _hand_off(self, index: int, job: _StagedJob):
+        """Move a job to the next stage, waiting while it is full (caller holds the lock)"""
+        stage = self._stages[index]
+        next_stage = self._stages[index + 1]
+        buffer = self.config.stage_buffer
+
+        if buffer > 0 and len(next_stage.pending) >= buffer:
+            stage.blocked[job.job_id] = time.time()
+            logger.info(f"Job {job.job_id} waiting for room in {next_stage.name} stage")
+            while len(next_stage.pending) >= buffer and not self._stopping:
+                self._cond.wait()
+            stage.blocked.pop(job.job_id, None)
+
+        next_stage.pending.append(job)
+        self._cond.notify_all()
+
+    def _estimate_retry_after(self) -> int:
+        """Throughput is set by the slowest stage (caller holds the lock)"""
+        per_job = [
+            stage.busy_seconds / stage.processed / stage.workers
+            for stage in self._stages if stage.processed
+        ]
+        if not per_job:
+            return self.config.default_retry_after
+        return max(1, math.ceil(max(per_job)))
+
+    def _worker_loop(self, index: int):
+        stage = self._stages[index]
+        is_last = index == len(self._stages) - 1
+
+        while True:
+            with self._cond:
+                while not stage.pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                job = stage.pending.popleft()
+                self._cond.notify_all()  # Room freed for upstream backpressure
+                started = time.time()
+                stage.running[job.job_id] = started
+
+            error = None
+            try:
+                if job.ctx is None:
+                    job.ctx = self.on_start(job.job_id, job.audio_path)
+                self.pipeline.run_stage(stage.name, job.ctx)
+            except Exception as e:
+                error = e
+                logger.error(f"Stage {stage.name} failed for job {job.job_id}: {e}")
+
+            if error is None and is_last:
+                # Export/store errors here must still fail the job, not leave it processing
+                try:
+                    self.on_complete(job.job_id, job.ctx)
+                except Exception as e:
+                    error = e
+                    logger.error(f"Completion handler failed for job {job.job_id}: {e}", exc_info=True)
+
+            if error is not None:
+                try:
+                    self.on_error(job.job_id, job.audio_path, job.ctx, error)
+                except Exception as cb_error:
+                    logger.error(f"Error handler failed for job {job.job_id}: {cb_error}", exc_info=True)
+
+            with self._cond:
+                stage.running.pop(job.job_id, None)
+                stage.busy_seconds += time.time() - started
+                if error is not None:
+                    stage.failed += 1
+                else:
+                    stage.processed += 1
+                    if not is_last:
+                        self._hand_off(index, job)
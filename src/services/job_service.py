@@ -1,94 +1,485 @@
 import time
 import uuid
 import asyncio
-from typing import Dict, Optional, Any
+import threading
+from typing import Dict, Optional, Any, Callable, List, Tuple
 from pathlib import Path
 
-from src.pipeline.meeting_pipeline import MeetingPipeline
+from src.pipeline.meeting_pipeline import MeetingPipeline, PipelineContext
+from src.services.job_scheduler import JobScheduler, StagedJobScheduler, QueueFullError
+from src.services.result_cache import ResultCache
+from src.services.job_events import JobEventBus, JobSubscription
+from src.services.job_store import JobStore
+from src.services.metrics import metrics_registry
+from src.utils.tracing import JobTrace
 from src.utils.logger import logger
+from config.settings import SCHEDULER, APP
+
+# Output files owned by a job (deleted when the job is pruned)
+OUTPUT_KEYS = ("transcript", "summary", "docx")
 
 class JobService:
     def __init__(self):
+        # Durable record of every job; self.jobs only holds queued/processing
+        # jobs, whose progress changes too often to write through
+        self.store = JobStore(APP.jobs_db)
         self.jobs: Dict[str, Dict[str, Any]] = {}
-        self.pipeline = MeetingPipeline()
+        # Live transcript segments while a job is transcribing (kept out of the job dict)
+        self.partials: Dict[str, List[dict]] = {}
+        self.cache = ResultCache()
+        self.events = JobEventBus()
+
+        if SCHEDULER.mode == "staged":
+            # Each stage has its own workers, so no extra per-stage semaphores
+            self.pipeline = MeetingPipeline(cache=self.cache)
+            self.scheduler = StagedJobScheduler(
+                self.pipeline,
+                on_start=self._begin_job,
+                on_complete=self._finish_staged_job,
+                on_error=self._fail_staged_job
+            )
+        else:
+            self.pipeline = MeetingPipeline(stage_limits={
+                "ffmpeg": SCHEDULER.ffmpeg_workers,
+                "whisper": SCHEDULER.whisper_workers,
+                "llm": SCHEDULER.llm_workers,
+                "export": SCHEDULER.export_workers
+            }, cache=self.cache)
+            self.scheduler = JobScheduler(self.process_job)
 
-    def create_job(self, filename: str, file_size: int) -> str:
+    def create_job(self, filename: str, file_size: int, content_hash: Optional[str] = None) -> str:
         """Create a new job and return its ID"""
         job_id = str(uuid.uuid4())
         self.jobs[job_id] = {
             "id": job_id,
             "filename": filename,
             "file_size": file_size,
+            "content_hash": content_hash,
             "status": "queued",
             "progress": 0,
             "message": "Đang chờ xử lý...",
             "created_at": time.time()
         }
+        self.store.save(self.jobs[job_id])
         return job_id
 
+    def _lookup(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Active job (live dict) or finished job from the store"""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job
+        return self.store.get(job_id)
+
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
-        return self.jobs.get(job_id)
+        job = self._lookup(job_id)
+        if job is None:
+            return None
+
+        job = dict(job)
+        if job["status"] == "queued":
+            job["queue_position"] = self.scheduler.position(job_id)
+        if job["status"] in ("queued", "processing"):
+            location = self.scheduler.locate(job_id)
+            if location:
+                job["stage"] = location
+            job["pipeline"] = self.scheduler.stats()
+        return job
+
+    def list_jobs(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        status: Optional[str] = None,
+        before: Optional[float] = None,
+        include_total: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Page of jobs, newest first
+
+        Returns:
+            Tuple of (jobs, total or None without include_total)
+        """
+        jobs, total = self.store.list(
+            limit=limit, offset=offset, status=status, before=before, include_total=include_total
+        )
+        # Active jobs: the live dict has fresher progress than the stored row
+        return [dict(self.jobs.get(job["id"], job)) for job in jobs], total
+
+    def _persist(self, job_id: str):
+        job = self.jobs.get(job_id)
+        if job is not None:
+            self.store.save(job)
+
+    def _release(self, job_id: str):
+        """Persist a finished job and drop it from memory"""
+        self._persist(job_id)
+        self.jobs.pop(job_id, None)
+
+    def recover(self) -> int:
+        """
+        Requeue jobs that were queued or processing when the server stopped
+
+        Returns:
+            Number of jobs requeued
+        """
+        requeued = 0
+        for job in self.store.find_by_status(("queued", "processing")):
+            job_id = job["id"]
+            if job_id in self.jobs:
+                continue
+
+            audio_path = Path(job["audio_path"]) if job.get("audio_path") else None
+            if audio_path is None or not audio_path.exists():
+                job.update({
+                    "status": "failed",
+                    "message": "Lỗi: mất file audio khi khởi động lại",
+                    "error": "Audio file lost on restart",
+                    "failed_at": time.time()
+                })
+                self.store.save(job)
+                continue
+
+            job.update({"status": "queued", "progress": 0, "message": "Đang chờ xử lý (khôi phục)..."})
+            self.jobs[job_id] = job
+            if self.scheduler.is_full():
+                self._fail_job(job_id, audio_path, RuntimeError("Hàng đợi đầy khi khôi phục job"))
+                continue
+            self.submit_job(job_id, audio_path)
+            requeued += 1
+
+        if requeued:
+            logger.info(f"Recovered {requeued} unfinished jobs")
+        return requeued
+
+    def prune_expired(self) -> int:
+        """Delete finished jobs older than APP.job_ttl together with their output files"""
+        removed = self.store.prune(time.time() - APP.job_ttl)
+        for job in removed:
+            for key in OUTPUT_KEYS:
+                if job.get(key):
+                    try:
+                        Path(job[key]).unlink(missing_ok=True)
+                    except OSError as e:
+                        logger.warning(f"Failed to remove {job[key]}: {e}")
+        return len(removed)
+
+    def start_maintenance(self):
+        """Prune expired jobs now and then every APP.job_prune_interval seconds"""
+        def loop():
+            while True:
+                try:
+                    self.prune_expired()
+                except Exception as e:
+                    logger.error(f"Job pruning failed: {e}", exc_info=True)
+                time.sleep(APP.job_prune_interval)
+
+        threading.Thread(target=loop, name="job-pruner", daemon=True).start()
+
+    def is_queue_full(self) -> bool:
+        return self.scheduler.is_full()
+
+    def retry_after(self) -> int:
+        return self.scheduler.retry_after()
+
+    def get_partial_transcript(self, job_id: str, since: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Segments decoded so far for a running job
+
+        Args:
+            job_id: Job ID
+            since: Index of the first segment to return (for incremental polling)
+
+        Returns:
+            Dict with segments, text and next index, or None if job not found
+        """
+        job = self._lookup(job_id)
+        if job is None:
+            return None
+
+        segments = list(self.partials.get(job_id, []))
+        new_segments = segments[since:]
+        return {
+            "status": job["status"],
+            "segments": new_segments,
+            "text": "\n".join(seg["text"] for seg in new_segments),
+            "next": len(segments),
+            "transcribed_seconds": job.get("transcribed_seconds", 0)
+        }
+
+    def subscribe(
+        self,
+        job_id: str,
+        since: int = 0,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> Optional[Tuple[JobSubscription, List[tuple]]]:
+        """
+        Subscribe to a job's push events
+
+        The subscription is registered before the snapshot is taken, so nothing
+        published in between is lost; segment indexes de-duplicate the overlap.
+
+        Args:
+            job_id: Job ID
+            since: Index of the first transcript segment the client needs
+            loop: Event loop that consumes the events (default: the running
+                loop; pass it when calling from a worker thread)
+
+        Returns:
+            Tuple of (subscription, initial (event, data) list), or None if job not found
+        """
+        if self._lookup(job_id) is None:
+            return None
+
+        subscription = self.events.subscribe(job_id, next_segment=since, loop=loop)
+        job = self.get_job(job_id)
+        initial = [("progress", self._progress_event(job))]
+
+        segments = list(self.partials.get(job_id, []))[since:]
+        if segments:
+            subscription.next_segment = max(subscription.next_segment, since + len(segments))
+            initial.append(("segments", {"segments": segments, "next": since + len(segments)}))
+
+        if job["status"] == "completed":
+            initial.append(("completed", self._completed_event(job)))
+        elif job["status"] == "failed":
+            initial.append(("failed", {"error": job.get("error"), "message": job["message"]}))
+        return subscription, initial
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Scheduler metrics (queue depth, stage utilization) and cache counters"""
+        return {
+            "scheduler": self.scheduler.stats(),
+            "cache": self.cache.stats(),
+            "llm_endpoints": self.pipeline.qwen_service.client.endpoint_stats()
+        }
+
+    def get_prometheus_metrics(self) -> str:
+        """Span histograms plus queue, stage and cache gauges and counters in Prometheus text format"""
+        scheduler = self.scheduler.stats()
+        cache = self.cache.stats()
+
+        gauges = [
+            ("jobs_queued", "Jobs waiting in the scheduler", {}, scheduler["queued"]),
+            ("jobs_running", "Jobs currently being processed", {}, scheduler["running"]),
+            ("cache_size_bytes", "Result cache size on disk", {}, cache["size_bytes"]),
+            ("event_subscribers", "Open progress streams", {}, self.events.subscriber_count())
+        ]
+        counters = []
+        for kind in cache["hits"]:
+            counters.append(("cache_hits_total", "Result cache hits since start", {"kind": kind}, cache["hits"][kind]))
+            counters.append(("cache_misses_total", "Result cache misses since start", {"kind": kind}, cache["misses"][kind]))
+        for name, stage in scheduler.get("stages", {}).items():
+            gauges.append(("stage_queue_depth", "Jobs waiting for a stage", {"stage": name}, stage["queue_depth"]))
+            gauges.append(("stage_busy_workers", "Busy workers per stage", {"stage": name}, stage["busy_workers"]))
+            gauges.append(("stage_utilization", "Share of stage worker time spent busy", {"stage": name}, stage["utilization"]))
+        for endpoint in self.pipeline.qwen_service.client.endpoint_stats():
+            labels = {"endpoint": endpoint["url"]}
+            gauges.append(("llm_endpoint_up", "LLM endpoint passing health checks", labels, int(endpoint["healthy"])))
+            gauges.append(("llm_endpoint_outstanding", "Requests in flight per LLM endpoint", labels, endpoint["outstanding"]))
+            counters.append(("llm_endpoint_failures_total", "Failed requests/probes per LLM endpoint", labels, endpoint["failures"]))
+
+        return metrics_registry.render(gauges, counters)
 
-    def list_jobs(self):
-        return list(self.jobs.values())
+    def submit_job(self, job_id: str, audio_path: Path) -> int:
+        """
+        Queue a created job for processing
+
+        Returns:
+            1-based queue position
+
+        Raises:
+            QueueFullError: If the queue is full; the job entry is removed
+        """
+        self.jobs[job_id]["audio_path"] = str(audio_path)
+        try:
+            position = self.scheduler.submit(job_id, audio_path)
+        except QueueFullError:
+            self.jobs.pop(job_id, None)
+            self.store.delete(job_id)
+            raise
+
+        self.jobs[job_id]["message"] = f"Đang chờ xử lý (vị trí {position})..."
+        self._persist(job_id)
+        return position
 
     def process_job(self, job_id: str, audio_path: Path):
-        """Background task logic"""
+        """Background task logic (sequential mode: whole pipeline per worker)"""
         if job_id not in self.jobs:
             logger.error(f"Job {job_id} not found immediately at start of processing")
             return
 
+        trace = JobTrace(job_id)
         try:
-            self.jobs[job_id]["status"] = "processing"
-            self.jobs[job_id]["progress"] = 0
-            self.jobs[job_id]["message"] = "Đang bắt đầu..."
-            
-            def progress_callback(progress: float, status: str):
-                """Update job progress"""
-                if job_id in self.jobs:
-                    self.jobs[job_id]["progress"] = progress
-                    self.jobs[job_id]["message"] = status
-                    self.jobs[job_id]["updated_at"] = time.time()
-                    logger.info(f"Job {job_id}: {progress:.1f}% - {status}")
-            
+            self._mark_processing(job_id)
+
             # Process
-            transcript_path, summary_path, docx_path = self.pipeline.process(
-                audio_file=audio_path,
-                progress_callback=progress_callback
+            ctx = self.pipeline.create_context(
+                audio_path,
+                progress_callback=self._progress_callback(job_id),
+                segment_callback=self._segment_callback(job_id),
+                audio_hash=self.jobs[job_id].get("content_hash"),
+                trace=trace
             )
-
-            # Update job
-            self.jobs[job_id]["status"] = "completed"
-            self.jobs[job_id]["progress"] = 100
-            self.jobs[job_id]["message"] = "Hoàn thành!"
-            self.jobs[job_id]["transcript"] = str(transcript_path)
-            self.jobs[job_id]["summary"] = str(summary_path)
-            self.jobs[job_id]["docx"] = str(docx_path)
-            self.jobs[job_id]["completed_at"] = time.time()
-            
-            logger.info(f"Job {job_id} completed successfully")
-            
-            # Cleanup temp file
-            try:
-                if audio_path.exists():
-                    audio_path.unlink()
-                    logger.info(f"Cleaned up temp file: {audio_path}")
-            except Exception as e:
-                logger.warning(f"Failed to cleanup temp file: {e}")
+            outputs = self.pipeline.run(ctx)
+            self.jobs[job_id]["cached_stages"] = ctx.cached_stages
+            self._attach_trace(job_id, trace)
+            self._complete_job(job_id, audio_path, outputs)
 
         except Exception as e:
-            logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+            self._attach_trace(job_id, trace)
+            self._fail_job(job_id, audio_path, e)
+
+    def _attach_trace(self, job_id: str, trace: JobTrace):
+        """Store per-stage spans (wall/CPU time, peak memory) on the job record"""
+        if job_id in self.jobs:
+            self.jobs[job_id]["spans"] = list(trace.spans)
+            self.jobs[job_id]["timings"] = trace.summary()
+
+    def _progress_callback(self, job_id: str) -> Callable[[float, str], None]:
+        def progress_callback(progress: float, status: str):
+            """Update job progress"""
+            if job_id in self.jobs:
+                self.jobs[job_id]["progress"] = progress
+                self.jobs[job_id]["message"] = status
+                self.jobs[job_id]["updated_at"] = time.time()
+                self.events.publish(job_id, "progress", self._progress_event(self.jobs[job_id]))
+                logger.info(f"Job {job_id}: {progress:.1f}% - {status}")
+
+        return progress_callback
+
+    def _segment_callback(self, job_id: str) -> Callable[[dict], None]:
+        segments = self.partials.setdefault(job_id, [])
+
+        def segment_callback(segment: dict):
+            """Append live transcript segment"""
+            segments.append(segment)
+            self.events.publish(job_id, "segment", {**segment, "index": len(segments) - 1})
             if job_id in self.jobs:
-                self.jobs[job_id]["status"] = "failed"
-                self.jobs[job_id]["message"] = f"Lỗi: {str(e)}"
-                self.jobs[job_id]["error"] = str(e)
-                self.jobs[job_id]["failed_at"] = time.time()
-            
-            # Cleanup temp file on failure
-            try:
-                if audio_path.exists():
-                    audio_path.unlink()
-            except Exception:
-                pass
+                self.jobs[job_id]["segment_count"] = len(segments)
+                self.jobs[job_id]["transcribed_seconds"] = round(segment["end"], 1)
+
+        return segment_callback
+
+    def _mark_processing(self, job_id: str):
+        self.jobs[job_id]["status"] = "processing"
+        self.jobs[job_id]["progress"] = 0
+        self.jobs[job_id]["message"] = "Đang bắt đầu..."
+        self.jobs[job_id]["started_at"] = time.time()
+        self._persist(job_id)
+        self.events.publish(job_id, "progress", self._progress_event(self.jobs[job_id]))
+        self._publish_queue_positions()
+
+    def _publish_queue_positions(self):
+        """A job left the queue: push the new positions to waiting jobs' subscribers"""
+        if not self.events.subscriber_count():
+            return
+        for job_id, job in list(self.jobs.items()):
+            if job["status"] == "queued":
+                event = self._progress_event(job)
+                event["queue_position"] = self.scheduler.position(job_id)
+                self.events.publish(job_id, "progress", event)
+
+    @staticmethod
+    def _progress_event(job: Dict[str, Any]) -> Dict[str, Any]:
+        event = {
+            "status": job["status"],
+            "progress": job["progress"],
+            "message": job["message"]
+        }
+        for key in ("queue_position", "stage", "transcribed_seconds"):
+            if job.get(key) is not None:
+                event[key] = job[key]
+        return event
+
+    @staticmethod
+    def _completed_event(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "downloads": {
+                file_type: f"/api/download/{job['id']}/{file_type}"
+                for file_type in ("transcript", "summary", "docx")
+            },
+            "cached_stages": job.get("cached_stages", [])
+        }
+
+    def _begin_job(self, job_id: str, audio_path: Path) -> PipelineContext:
+        """Staged mode: first stage picked the job up"""
+        if job_id not in self.jobs:
+            raise RuntimeError(f"Job {job_id} not found at start of processing")
+
+        self._mark_processing(job_id)
+        trace = JobTrace(job_id)
+        try:
+            return self.pipeline.create_context(
+                audio_path,
+                progress_callback=self._progress_callback(job_id),
+                segment_callback=self._segment_callback(job_id),
+                audio_hash=self.jobs[job_id].get("content_hash"),
+                trace=trace
+            )
+        except Exception:
+            self._attach_trace(job_id, trace)
+            raise
+
+    def _finish_staged_job(self, job_id: str, ctx: PipelineContext):
+        self.pipeline.finish(ctx)
+        self.jobs[job_id]["cached_stages"] = ctx.cached_stages
+        self._attach_trace(job_id, ctx.trace)
+        self._complete_job(job_id, ctx.audio_file, ctx.outputs)
+
+    def _fail_staged_job(
+        self,
+        job_id: str,
+        audio_path: Path,
+        ctx: Optional[PipelineContext],
+        error: Exception
+    ):
+        if ctx is not None:
+            self.pipeline.finish(ctx)
+            self._attach_trace(job_id, ctx.trace)
+        self._fail_job(job_id, audio_path, error)
+
+    def _complete_job(self, job_id: str, audio_path: Path, outputs):
+        transcript_path, summary_path, docx_path = outputs
+        self.partials.pop(job_id, None)
+
+        # Update job
+        self.jobs[job_id]["status"] = "completed"
+        self.jobs[job_id]["progress"] = 100
+        self.jobs[job_id]["message"] = "Hoàn thành!"
+        self.jobs[job_id]["transcript"] = str(transcript_path)
+        self.jobs[job_id]["summary"] = str(summary_path)
+        self.jobs[job_id]["docx"] = str(docx_path)
+        self.jobs[job_id]["completed_at"] = time.time()
+        self.events.publish(job_id, "progress", self._progress_event(self.jobs[job_id]))
+        self.events.publish(job_id, "completed", self._completed_event(self.jobs[job_id]))
+        self._release(job_id)
+
+        logger.info(f"Job {job_id} completed successfully")
+
+        # Cleanup temp file
+        try:
+            if audio_path.exists():
+                audio_path.unlink()
+                logger.info(f"Cleaned up temp file: {audio_path}")
+        except Exception as e:
+            logger.warning(f"Failed to cleanup temp file: {e}")
+
+    def _fail_job(self, job_id: str, audio_path: Path, error: Exception):
+        logger.error(f"Job {job_id} failed: {error}", exc_info=error)
+        self.partials.pop(job_id, None)
+        if job_id in self.jobs:
+            self.jobs[job_id]["status"] = "failed"
+            self.jobs[job_id]["message"] = f"Lỗi: {str(error)}"
+            self.jobs[job_id]["error"] = str(error)
+            self.jobs[job_id]["failed_at"] = time.time()
+            self.events.publish(job_id, "failed", {"error": str(error), "message": self.jobs[job_id]["message"]})
+            self._release(job_id)
+
+        # Cleanup temp file on failure
+        try:
+            if audio_path.exists():
+                audio_path.unlink()
+        except Exception:
+            pass
 
 job_service = JobService()
@@ -0,0 +1,159 @@
+"""
+Durable job store (SQLite, WAL mode)
+File: src/services/job_store.py
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+
+from src.utils.logger import logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_updated ON jobs (status, updated_at);
+"""
+
+
+class JobStore:
+    """Jobs persisted as JSON rows with indexed id / status / created_at
+
+    One connection per thread; WAL lets the API read while workers write.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Open (and create) the job database
+
+        Args:
+            db_path: SQLite file path
+        """
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, job: Dict[str, Any]):
+        """Insert or replace a job"""
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, status, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+                (
+                    job["id"],
+                    job["status"],
+                    job["created_at"],
+                    time.time(),
+                    json.dumps(job, ensure_ascii=False, default=str)
+                )
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, job_id: str):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def list(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        status: Optional[str] = None,
+        before: Optional[float] = None,
+        include_total: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Newest jobs first
+
+        Args:
+            limit: Page size
+            offset: Rows to skip
+            status: Only jobs with this status
+            before: Keyset cursor - only jobs created before this timestamp
+                (constant cost for deep pages, unlike a large offset)
+            include_total: Count the matching jobs (a scan that grows with
+                the table - skip it for cursor pages)
+
+        Returns:
+            Tuple of (jobs, total matching jobs ignoring limit/offset/before,
+            or None without include_total)
+        """
+        where, params = [], []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        total = None
+        if include_total:
+            count_sql = "SELECT COUNT(*) FROM jobs" + (" WHERE " + " AND ".join(where) if where else "")
+            total = self._conn().execute(count_sql, params).fetchone()[0]
+
+        if before is not None:
+            where.append("created_at < ?")
+            params.append(before)
+        sql = "SELECT data FROM jobs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+
+        rows = self._conn().execute(sql, params + [limit, offset]).fetchall()
+        return [json.loads(row[0]) for row in rows], total
+
+    def find_by_status(self, statuses: Iterable[str]) -> List[Dict[str, Any]]:
+        """Jobs in any of the given statuses, oldest first"""
+        statuses = list(statuses)
+        placeholders = ", ".join("?" for _ in statuses)
+        rows = self._conn().execute(
+            f"SELECT data FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at",
+            statuses
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def prune(self, cutoff: float, statuses: Iterable[str] = ("completed", "failed")) -> List[Dict[str, Any]]:
+        """
+        Delete finished jobs last updated before cutoff
+
+        Returns:
+            The deleted jobs (so the caller can remove their output files)
+        """
+        statuses = list(statuses)
+        placeholders = ", ".join("?" for _ in statuses)
+        conn = self._conn()
+        with conn:
+            rows = conn.execute(
+                f"SELECT data FROM jobs WHERE status IN ({placeholders}) AND updated_at < ?",
+                statuses + [cutoff]
+            ).fetchall()
+            conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({placeholders}) AND updated_at < ?",
+                statuses + [cutoff]
+            )
+
+        if rows:
+            logger.info(f"Pruned {len(rows)} jobs older than {time.ctime(cutoff)}")
+        return [json.loads(row[0]) for row in rows]
@@ -0,0 +1,216 @@
+"""
+Prometheus text exposition for span timings and pipeline gauges
+File: src/services/metrics.py
+"""
+import threading
+from typing import Dict, Any, List, Tuple, Optional
+
+from src.utils import tracing
+
+# Span duration histogram buckets (seconds) - spans range from ms file writes
+# to hour-long transcriptions
+BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+# Time to first LLM token: prompt processing (+ model load on a cold start)
+TTFT_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class _SpanStats:
+    __slots__ = ("count", "errors", "wall_sum", "cpu_sum", "buckets", "peak_rss", "peak_gpu")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.wall_sum = 0.0
+        self.cpu_sum = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.peak_rss = 0
+        self.peak_gpu = 0
+
+
+class MetricsRegistry:
+    """Aggregates finished spans (registered as a tracing listener)"""
+
+    def __init__(self, prefix: str = "voicemeet"):
+        self.prefix = prefix
+        self._spans: Dict[str, _SpanStats] = {}
+        self._ttft_buckets = [0] * len(TTFT_BUCKETS)
+        self._ttft_sum = 0.0
+        self._ttft_count = 0
+        self._eval_tokens = 0
+        self._eval_seconds = 0.0
+        self._llm_stops: Dict[str, int] = {}
+        self._attempts: Dict[str, int] = {}   # Spans carrying an "attempt" attr
+        self._retries: Dict[str, int] = {}
+        self._json_repairs = 0
+        self._prompt_eval_tokens = 0
+        self._prompt_eval_seconds = 0.0
+        self._lock = threading.Lock()
+        tracing.add_listener(self.observe_span)
+
+    def observe_span(self, record: Dict[str, Any]):
+        with self._lock:
+            stats = self._spans.setdefault(record["name"], _SpanStats())
+            stats.count += 1
+            if record.get("status") == "error":
+                stats.errors += 1
+            stats.wall_sum += record["wall_seconds"]
+            stats.cpu_sum += max(0.0, record["cpu_seconds"])
+            for i, bound in enumerate(BUCKETS):
+                if record["wall_seconds"] <= bound:
+                    stats.buckets[i] += 1
+            stats.peak_rss = max(stats.peak_rss, record.get("peak_rss_bytes") or 0)
+            stats.peak_gpu = max(stats.peak_gpu, record.get("peak_gpu_bytes") or 0)
+
+            # LLM calls (llm.generate spans)
+            if record.get("ttft_seconds") is not None:
+                self._ttft_count += 1
+                self._ttft_sum += record["ttft_seconds"]
+                for i, bound in enumerate(TTFT_BUCKETS):
+                    if record["ttft_seconds"] <= bound:
+                        self._ttft_buckets[i] += 1
+            if record.get("eval_tokens"):
+                self._eval_tokens += record["eval_tokens"]
+                self._eval_seconds += record.get("eval_seconds") or 0.0
+            if record.get("prompt_eval_tokens") is not None:
+                self._prompt_eval_tokens += record["prompt_eval_tokens"]
+                self._prompt_eval_seconds += record.get("prompt_eval_seconds") or 0.0
+            if record.get("stopped"):
+                self._llm_stops[record["stopped"]] = self._llm_stops.get(record["stopped"], 0) + 1
+
+            # LLM retry loops (llm.extract.attempt, llm.<style> chunk spans)
+            if record.get("attempt") is not None:
+                name = record["name"]
+                self._attempts[name] = self._attempts.get(name, 0) + 1
+                if record["attempt"] > 1:
+                    self._retries[name] = self._retries.get(name, 0) + 1
+            if record.get("json_repaired"):
+                self._json_repairs += 1
+
+    def render(
+        self,
+        gauges: Optional[List[Tuple[str, str, Dict[str, Any], float]]] = None,
+        counters: Optional[List[Tuple[str, str, Dict[str, Any], float]]] = None
+    ) -> str:
+        """
+        Prometheus text format
+
+        Args:
+            gauges: Extra (name, help, labels, value) samples, e.g. queue depth
+            counters: Extra samples that only ever increase (name ends in _total)
+
+        Returns:
+            Exposition text (version 0.0.4)
+        """
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_span_seconds Wall time of pipeline spans",
+            f"# TYPE {p}_span_seconds histogram"
+        ]
+        with self._lock:
+            spans = sorted(self._spans.items())
+            for name, stats in spans:
+                for bound, count in zip(BUCKETS, stats.buckets):
+                    lines.append(f"{p}_span_seconds_bucket{_labels({'span': name, 'le': bound})} {count}")
+                lines.append(f"{p}_span_seconds_bucket{_labels({'span': name, 'le': '+Inf'})} {stats.count}")
+                lines.append(f"{p}_span_seconds_sum{_labels({'span': name})} {stats.wall_sum:.4f}")
+                lines.append(f"{p}_span_seconds_count{_labels({'span': name})} {stats.count}")
+
+            lines += [
+                f"# HELP {p}_span_cpu_seconds_total Process CPU time spent inside spans",
+                f"# TYPE {p}_span_cpu_seconds_total counter"
+            ]
+            lines += [f"{p}_span_cpu_seconds_total{_labels({'span': n})} {s.cpu_sum:.4f}" for n, s in spans]
+
+            lines += [
+                f"# HELP {p}_span_errors_total Spans that raised",
+                f"# TYPE {p}_span_errors_total counter"
+            ]
+            lines += [f"{p}_span_errors_total{_labels({'span': n})} {s.errors}" for n, s in spans]
+
+            lines += [
+                f"# HELP {p}_span_peak_rss_bytes Highest process RSS observed during a span",
+                f"# TYPE {p}_span_peak_rss_bytes gauge"
+            ]
+            lines += [f"{p}_span_peak_rss_bytes{_labels({'span': n})} {s.peak_rss}" for n, s in spans]
+
+            gpu_spans = [(n, s) for n, s in spans if s.peak_gpu]
+            if gpu_spans:
+                lines += [
+                    f"# HELP {p}_span_peak_gpu_bytes Highest GPU memory in use during a span",
+                    f"# TYPE {p}_span_peak_gpu_bytes gauge"
+                ]
+                lines += [f"{p}_span_peak_gpu_bytes{_labels({'span': n})} {s.peak_gpu}" for n, s in gpu_spans]
+
+            lines += [
+                f"# HELP {p}_llm_ttft_seconds Time to first token of LLM calls",
+                f"# TYPE {p}_llm_ttft_seconds histogram"
+            ]
+            for bound, count in zip(TTFT_BUCKETS, self._ttft_buckets):
+                lines.append(f"{p}_llm_ttft_seconds_bucket{_labels({'le': bound})} {count}")
+            lines += [
+                f"{p}_llm_ttft_seconds_bucket{_labels({'le': '+Inf'})} {self._ttft_count}",
+                f"{p}_llm_ttft_seconds_sum {self._ttft_sum:.4f}",
+                f"{p}_llm_ttft_seconds_count {self._ttft_count}",
+                f"# HELP {p}_llm_generated_tokens_total Tokens generated by the LLM",
+                f"# TYPE {p}_llm_generated_tokens_total counter",
+                f"{p}_llm_generated_tokens_total {self._eval_tokens}",
+                f"# HELP {p}_llm_generation_seconds_total Time spent generating (tokens/sec = ratio of the two rates)",
+                f"# TYPE {p}_llm_generation_seconds_total counter",
+                f"{p}_llm_generation_seconds_total {self._eval_seconds:.4f}",
+                f"# HELP {p}_llm_prompt_eval_tokens_total Prompt tokens evaluated by the LLM (cached prefix excluded)",
+                f"# TYPE {p}_llm_prompt_eval_tokens_total counter",
+                f"{p}_llm_prompt_eval_tokens_total {self._prompt_eval_tokens}",
+                f"# HELP {p}_llm_prompt_eval_seconds_total Time spent evaluating prompts",
+                f"# TYPE {p}_llm_prompt_eval_seconds_total counter",
+                f"{p}_llm_prompt_eval_seconds_total {self._prompt_eval_seconds:.4f}",
+                f"# HELP {p}_llm_early_stops_total LLM streams stopped early, by reason",
+                f"# TYPE {p}_llm_early_stops_total counter"
+            ]
+            lines += [
+                f"{p}_llm_early_stops_total{_labels({'reason': r})} {n}" for r, n in sorted(self._llm_stops.items())
+            ]
+            lines += [
+                f"# HELP {p}_llm_attempts_total LLM request attempts, by span",
+                f"# TYPE {p}_llm_attempts_total counter"
+            ]
+            lines += [f"{p}_llm_attempts_total{_labels({'span': n})} {c}" for n, c in sorted(self._attempts.items())]
+            lines += [
+                f"# HELP {p}_llm_retries_total LLM request attempts after the first, by span",
+                f"# TYPE {p}_llm_retries_total counter"
+            ]
+            lines += [f"{p}_llm_retries_total{_labels({'span': n})} {c}" for n, c in sorted(self._retries.items())]
+            lines += [
+                f"# HELP {p}_llm_json_repairs_total LLM JSON responses repaired locally instead of retried",
+                f"# TYPE {p}_llm_json_repairs_total counter",
+                f"{p}_llm_json_repairs_total {self._json_repairs}"
+            ]
+
+        lines += _samples(p, "gauge", gauges)
+        lines += _samples(p, "counter", counters)
+
+        return "\n".join(lines) + "\n"
+
+
+def _samples(prefix: str, metric_type: str, samples) -> List[str]:
+    """Exposition lines for (name, help, labels, value) samples, grouped by name"""
+    lines = []
+    seen = set()
+    for name, help_text, labels, value in sorted(samples or [], key=lambda g: g[0]):
+        if name not in seen:
+            lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} {metric_type}"]
+            seen.add(name)
+        lines.append(f"{prefix}_{name}{_labels(labels)} {value}")
+    return lines
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,217 @@
+"""
+Content-addressed result cache (transcript / summary / extraction)
+File: src/services/result_cache.py
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from src.utils.logger import logger
+from config.settings import APP, CACHE, TRANSCRIPTION, SUMMARIZATION, FFMPEG
+from config.prompts import get_prompt_fingerprint
+
+
+# Cache kinds and the file suffix each one is stored with
+KINDS = {
+    "transcript": ".txt",
+    "summary": ".txt",
+    "extraction": ".json"
+}
+
+# Config fields that cannot change the transcript / LLM output; every other
+# field is part of the key, so new settings invalidate the cache by default
+_TRANSCRIPTION_IGNORED = ("cpu_threads",)
+_LLM_IGNORED = (
+    "base_url", "endpoints", "health_check_interval", "api_key",
+    "max_parallel_chunks", "chunk_retries", "chunk_timeout",
+    "http_pool_size", "connect_timeout", "read_timeout", "http_retries",
+    "retry_backoff", "model_check_ttl", "stream", "keep_alive"
+)
+
+
+def _settings(config, ignored) -> Dict[str, Any]:
+    return {name: value for name, value in asdict(config).items() if name not in ignored}
+
+
+def hash_file(path: Path, block_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _digest(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Disk cache keyed on content hash + relevant config, with size-bounded LRU eviction
+
+    Transcript key  = hash(audio bytes, TranscriptionConfig, FFmpegConfig)
+    Summary key     = hash(transcript text, SummarizationConfig, prompt version)
+    Extraction key  = hash(transcript text, SummarizationConfig, prompt version)
+    """
+
+    def __init__(self, config=None, cache_dir: Optional[Path] = None):
+        """
+        Initialize result cache
+
+        Args:
+            config: CacheConfig instance
+            cache_dir: Directory for cache entries (default: APP.cache_dir)
+        """
+        self.config = config or CACHE
+        self.cache_dir = cache_dir or APP.cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._hits = {kind: 0 for kind in KINDS}
+        self._misses = {kind: 0 for kind in KINDS}
+        self._size = sum(p.stat().st_size for p in self._entries())
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    # ---------- keys ----------
+
+    def transcript_key(self, audio_hash: str) -> str:
+        return _digest("transcript", audio_hash, _settings(TRANSCRIPTION, _TRANSCRIPTION_IGNORED), asdict(FFMPEG))
+
+    def summary_key(self, transcript: str) -> str:
+        return self._llm_key("summary", transcript)
+
+    def extraction_key(self, transcript: str) -> str:
+        return self._llm_key("extraction", transcript)
+
+    def _llm_key(self, kind: str, transcript: str) -> str:
+        settings = _settings(SUMMARIZATION, _LLM_IGNORED)
+        transcript_hash = hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+        return _digest(kind, transcript_hash, settings, get_prompt_fingerprint())
+
+    # ---------- get / put ----------
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """
+        Look up a cached result
+
+        Returns:
+            str for transcript/summary, dict for extraction, or None on miss
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path(kind, key)
+        try:
+            raw = path.read_text(encoding="utf-8")
+            value = json.loads(raw) if kind == "extraction" else raw
+            os.utime(path)  # LRU: mark as recently used
+        except OSError:
+            with self._lock:
+                self._misses[kind] += 1
+            return None
+        except ValueError as e:
+            # Truncated / corrupt entry (or old format): drop it and recompute
+            logger.warning(f"Corrupt cache entry {kind} {key[:12]} removed: {e}")
+            with self._lock:
+                self._remove(path)
+                self._misses[kind] += 1
+            return None
+
+        with self._lock:
+            self._hits[kind] += 1
+        logger.info(f"Cache hit: {kind} {key[:12]}")
+        return value
+
+    def put(self, kind: str, key: str, value: Any):
+        """Store a result and evict least-recently-used entries over the size limit"""
+        if not self.enabled:
+            return
+
+        path = self._path(kind, key)
+        data = json.dumps(value, ensure_ascii=False) if kind == "extraction" else value
+
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a unique temp name first so readers never see partial
+            # entries and concurrent writers of the same key don't collide
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=path.parent, prefix=path.name, suffix=".tmp", delete=False
+            ) as tmp:
+                tmp_path = Path(tmp.name)
+                tmp.write(data)
+
+            with self._lock:
+                old_size = path.stat().st_size if path.exists() else 0
+                os.replace(tmp_path, path)
+                self._size += path.stat().st_size - old_size
+                if self._size > self.config.max_size_bytes:
+                    self._evict()
+        except OSError as e:
+            logger.warning(f"Cache write failed ({kind}): {e}")
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size_bytes": self._size,
+                "max_size_bytes": self.config.max_size_bytes,
+                "hits": dict(self._hits),
+                "misses": dict(self._misses)
+            }
+
+    # ---------- internals ----------
+
+    def _path(self, kind: str, key: str) -> Path:
+        return self.cache_dir / kind / key[:2] / f"{key}{KINDS[kind]}"
+
+    def _entries(self):
+        for kind, suffix in KINDS.items():
+            kind_dir = self.cache_dir / kind
+            if kind_dir.exists():
+                yield from kind_dir.rglob(f"*{suffix}")
+
+    def _remove(self, path: Path):
+        """Delete one entry (caller holds the lock)"""
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            self._size -= size
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Delete oldest entries until under 90% of the limit (caller holds the lock)"""
+        target = int(self.config.max_size_bytes * 0.9)
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            try:
+                path.unlink()
+                self._size -= size
+                removed += 1
+            except OSError:
+                continue
+
+        logger.info(f"Cache eviction: removed {removed} entries, size now {self._size} bytes")
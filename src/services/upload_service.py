@@ -0,0 +1,396 @@
+"""
+Streaming and resumable uploads: write to disk chunk by chunk with size
+enforcement and an incremental content hash
+File: src/services/upload_service.py
+"""
+import hashlib
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Any, Callable
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from src.utils.logger import logger
+from config.settings import APP
+
+
+class UploadTooLargeError(Exception):
+    """Upload exceeded APP.max_file_size"""
+
+
+class UploadOffsetError(Exception):
+    """Resumable chunk does not start where the previous one ended"""
+
+    def __init__(self, expected: int):
+        super().__init__(f"Chunk offset mismatch, expected offset {expected}")
+        self.expected = expected
+
+
+class UploadBusyError(Exception):
+    """Another request is writing to or completing the same upload session"""
+
+
+class MultipartFormatError(Exception):
+    """Request body is not multipart/form-data with a file part"""
+
+
+class StreamingUpload:
+    """Temp file that is written incrementally while hashing and counting bytes"""
+
+    def __init__(
+        self,
+        path: Path,
+        max_size: int,
+        expected_size: Optional[int] = None,
+        size: int = 0,
+        hasher=None
+    ):
+        """
+        Open the temp file
+
+        Args:
+            path: Temp file path
+            max_size: Upload size limit in bytes
+            expected_size: Declared total size (resumable uploads)
+            size: Bytes already in the file (resume; anything after is truncated)
+            hasher: SHA-256 state of those bytes (updated in place)
+        """
+        self.path = path
+        self.max_size = max_size
+        self.expected_size = expected_size
+        self.size = size
+        self._hash = hasher if hasher is not None else hashlib.sha256()
+        self._file = open(path, "r+b" if size else "wb")
+        if size:
+            # Drop the tail of a write that failed halfway (not in the hash)
+            self._file.seek(size)
+            self._file.truncate()
+
+    def write(self, chunk: bytes):
+        """
+        Append a chunk
+
+        Raises:
+            UploadTooLargeError: As soon as the limit is exceeded
+        """
+        limit = self.max_size if self.expected_size is None else min(self.max_size, self.expected_size)
+        if self.size + len(chunk) > limit:
+            raise UploadTooLargeError(f"Upload exceeds {limit} bytes")
+
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self):
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+class MultipartUpload:
+    """
+    Incremental multipart/form-data parser that streams one file field into a
+    StreamingUpload as the body arrives (nothing is spooled beforehand)
+    """
+
+    def __init__(
+        self,
+        content_type: str,
+        path: Path,
+        max_size: int,
+        field_name: str = "file",
+        check_filename: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialize parser
+
+        Args:
+            content_type: Content-Type header of the request
+            path: Temp file for the file field
+            max_size: Upload size limit in bytes
+            field_name: Form field holding the file
+            check_filename: Called with the filename before any byte is written
+                (raise to reject the upload)
+
+        Raises:
+            MultipartFormatError: Not multipart/form-data or no boundary
+        """
+        content_type, params = parse_options_header(content_type or "")
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise MultipartFormatError("Expected multipart/form-data with a boundary")
+
+        self.path = path
+        self.max_size = max_size
+        self.field_name = field_name
+        self.check_filename = check_filename
+        self.filename: Optional[str] = None
+        self.upload: Optional[StreamingUpload] = None
+
+        self._header_field = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._in_file = False
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end
+        })
+
+    def _on_part_begin(self):
+        self._disposition = b""
+        self._header_field = self._header_value = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        filename = options.get(b"filename")
+        self._in_file = name == self.field_name and filename is not None and self.upload is None
+        if not self._in_file:
+            return
+
+        self.filename = Path(filename.decode("utf-8", errors="replace")).name
+        if self.check_filename is not None:
+            self.check_filename(self.filename)
+        self.upload = StreamingUpload(self.path, max_size=self.max_size)
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._in_file:
+            self.upload.write(data[start:end])
+
+    def _on_part_end(self):
+        self._in_file = False
+
+    def feed(self, data: bytes):
+        """
+        Parse the next piece of the request body
+
+        Raises:
+            UploadTooLargeError: As soon as the file part exceeds max_size
+            MultipartFormatError: Malformed body
+        """
+        try:
+            self._parser.write(data)
+        except ValueError as e:  # python-multipart parse errors
+            raise MultipartFormatError(str(e))
+
+    def finish(self) -> StreamingUpload:
+        """
+        End of body: close the file
+
+        Returns:
+            The written file part
+
+        Raises:
+            MultipartFormatError: No file field in the body, or body cut short
+        """
+        try:
+            self._parser.finalize()
+        except ValueError as e:
+            raise MultipartFormatError(str(e))
+        if self.upload is None:
+            raise MultipartFormatError(f"No file in form field {self.field_name!r}")
+        self.upload.close()
+        return self.upload
+
+    def discard(self):
+        if self.upload is not None:
+            self.upload.discard()
+
+
+class UploadService:
+    """
+    Resumable upload sessions (init -> PUT chunks at offsets -> complete)
+
+    A session keeps only its size and hash state between requests; the temp
+    file is open while a PUT is being received, so idle sessions hold no
+    file handles. A completed session stays until its job is queued, so
+    /complete can be retried after a 429 without re-uploading.
+    """
+
+    def __init__(self):
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create_session(self, filename: str, file_size: int) -> Dict[str, Any]:
+        """Start a resumable upload of a file with known total size"""
+        self._expire_sessions()
+
+        upload_id = uuid.uuid4().hex
+        APP.temp_dir.mkdir(exist_ok=True)
+        path = APP.temp_dir / f"upload_{upload_id}.part"
+        path.touch()
+
+        session = {
+            "id": upload_id,
+            "filename": filename,
+            "file_size": file_size,
+            "path": path,
+            "size": 0,
+            "hash": hashlib.sha256(),
+            "writer": None,  # StreamingUpload of the PUT in progress
+            "completing": False,
+            "lock": threading.Lock(),
+            "updated_at": time.time()
+        }
+        with self._lock:
+            self.sessions[upload_id] = session
+
+        logger.info(f"Upload session {upload_id} created for {filename} ({file_size} bytes)")
+        return self.describe(upload_id)
+
+    def describe(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        session = self.sessions.get(upload_id)
+        if session is None:
+            return None
+        return {
+            "upload_id": upload_id,
+            "filename": session["filename"],
+            "file_size": session["file_size"],
+            "received": session["size"],
+            "chunk_size": APP.upload_chunk_size
+        }
+
+    def open_chunk(self, upload_id: str, offset: int) -> StreamingUpload:
+        """
+        Start receiving a chunk at the given offset
+
+        Every opened chunk must be closed with close_chunk().
+
+        Returns:
+            Writer for the chunk's bytes (limited to the declared file size)
+
+        Raises:
+            KeyError: Unknown session
+            UploadBusyError: Another chunk is being received, or the session is completing
+            UploadOffsetError: offset != bytes received so far
+        """
+        session = self.sessions[upload_id]
+        with session["lock"]:
+            if session["writer"] is not None or session["completing"]:
+                raise UploadBusyError(f"Upload {upload_id} is busy")
+            if offset != session["size"]:
+                raise UploadOffsetError(session["size"])
+            session["writer"] = StreamingUpload(
+                session["path"],
+                max_size=APP.max_file_size,
+                expected_size=session["file_size"],
+                size=session["size"],
+                hasher=session["hash"]
+            )
+            return session["writer"]
+
+    def close_chunk(self, upload_id: str) -> int:
+        """
+        Finish receiving a chunk (also after an error: keeps what was written)
+
+        Returns:
+            Bytes received so far
+        """
+        session = self.sessions.get(upload_id)
+        if session is None:
+            return 0
+        with session["lock"]:
+            writer = session["writer"]
+            if writer is not None:
+                writer.close()
+                session["size"] = writer.size
+                session["writer"] = None
+            session["updated_at"] = time.time()
+            return session["size"]
+
+    def complete(self, upload_id: str) -> Dict[str, Any]:
+        """
+        Claim a fully received session for job creation
+
+        Follow with finish() once the job is queued, or release() if it
+        could not be (the file is kept for a retry).
+
+        Returns:
+            Dict with path, filename, size and sha256 of the assembled file
+
+        Raises:
+            KeyError: Unknown session
+            UploadBusyError: A chunk is being received, or already completing
+            UploadOffsetError: Not all bytes received yet
+        """
+        session = self.sessions[upload_id]
+        with session["lock"]:
+            if session["writer"] is not None or session["completing"]:
+                raise UploadBusyError(f"Upload {upload_id} is busy")
+            if session["size"] != session["file_size"]:
+                raise UploadOffsetError(session["size"])
+            session["completing"] = True
+
+        return {
+            "path": session["path"],
+            "filename": session["filename"],
+            "size": session["size"],
+            "sha256": session["hash"].hexdigest()
+        }
+
+    def finish(self, upload_id: str):
+        """Forget a completed session (its file now belongs to a job)"""
+        with self._lock:
+            self.sessions.pop(upload_id, None)
+
+    def release(self, upload_id: str):
+        """Make a claimed session completable again (job could not be queued)"""
+        session = self.sessions.get(upload_id)
+        if session is not None:
+            with session["lock"]:
+                session["completing"] = False
+                session["updated_at"] = time.time()
+
+    def abort(self, upload_id: str) -> bool:
+        with self._lock:
+            session = self.sessions.pop(upload_id, None)
+        if session is None:
+            return False
+        with session["lock"]:
+            if session["writer"] is not None:
+                session["writer"].close()
+        session["path"].unlink(missing_ok=True)
+        return True
+
+    def _expire_sessions(self):
+        """Drop sessions idle for longer than APP.upload_session_ttl"""
+        cutoff = time.time() - APP.upload_session_ttl
+        with self._lock:
+            expired = [
+                sid for sid, s in self.sessions.items()
+                if s["updated_at"] < cutoff and s["writer"] is None and not s["completing"]
+            ]
+        for upload_id in expired:
+            logger.info(f"Upload session {upload_id} expired")
+            self.abort(upload_id)
+
+
+upload_service = UploadService()
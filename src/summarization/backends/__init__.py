@@ -0,0 +1,53 @@
+"""
+LLM inference backends (selected by SummarizationConfig.backend)
+File: src/summarization/backends/__init__.py
+"""
+import dataclasses
+
+from .base import LLMBackend
+from .ollama import OllamaClient
+from .openai_compat import OpenAICompatibleClient
+from .balancer import BalancedBackend
+
+BACKENDS = {
+    "ollama": OllamaClient,
+    "openai": OpenAICompatibleClient
+}
+
+
+def create_backend(config) -> LLMBackend:
+    """
+    Client for the server type named by config.backend
+
+    Several config.endpoints are load balanced (BalancedBackend); otherwise
+    the single endpoint, or config.base_url, is used directly.
+
+    Args:
+        config: SummarizationConfig instance
+
+    Returns:
+        LLMBackend instance
+
+    Raises:
+        ValueError: If config.backend is unknown
+    """
+    try:
+        backend_class = BACKENDS[config.backend]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend {config.backend!r} (expected one of: {', '.join(BACKENDS)})")
+
+    if len(config.endpoints) > 1:
+        return BalancedBackend(config, backend_class)
+    if config.endpoints:
+        return backend_class(dataclasses.replace(config, base_url=config.endpoints[0], endpoints=[]))
+    return backend_class(config)
+
+
+__all__ = [
+    "LLMBackend",
+    "OllamaClient",
+    "OpenAICompatibleClient",
+    "BalancedBackend",
+    "BACKENDS",
+    "create_backend"
+]
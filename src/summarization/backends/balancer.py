@@ -0,0 +1,264 @@
+"""
+Client-side load balancing over several LLM servers
+File: src/summarization/backends/balancer.py
+
+Each request goes to the healthy endpoint with the fewest outstanding
+requests. A background thread probes every endpoint's model list
+(/api/tags, /v1/models) and ejects endpoints that fail until a probe
+succeeds again; a connection error or 5xx during a request ejects the
+endpoint immediately. Generations are stateless, so a request that fails
+that way is retried on another endpoint (streams only before the first
+piece was received).
+"""
+import dataclasses
+import threading
+from typing import Optional, List, Dict, Any, Iterator, Callable, Tuple, TypeVar
+
+import requests
+
+from ...utils.logger import logger
+from .base import LLMBackend
+
+T = TypeVar("T")
+
+def _is_endpoint_failure(error: Exception) -> bool:
+    """Connection errors and 5xx mean the server is down or overloaded, not that the request is bad"""
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500
+    return False
+
+
+class _Endpoint:
+    """One server with its own client and routing state"""
+
+    def __init__(self, client: LLMBackend):
+        self.client = client
+        self.url = client.base_url
+        self.healthy = True
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+
+class BalancedBackend(LLMBackend):
+    """LLMBackend spreading requests over config.endpoints (one backend client per URL)"""
+
+    def __init__(self, config, backend_class):
+        """
+        Initialize one client per endpoint
+
+        Args:
+            config: SummarizationConfig instance (config.endpoints: base URLs)
+            backend_class: LLMBackend subclass for every endpoint (same API)
+        """
+        self.config = config
+        self.name = backend_class.name
+        self.base_url = ", ".join(config.endpoints)
+        # Failing over to another endpoint replaces retrying the same one
+        self.endpoints = [
+            _Endpoint(backend_class(dataclasses.replace(config, base_url=url, endpoints=[], http_retries=0)))
+            for url in config.endpoints
+        ]
+        self._lock = threading.Lock()
+        self._next = 0  # Round-robin start among equally loaded endpoints
+        self._stop = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+
+    # ---- routing ----
+
+    def _ensure_prober(self):
+        if self._prober is None and self.config.health_check_interval > 0:
+            with self._lock:
+                if self._prober is None:
+                    self._prober = threading.Thread(target=self._probe_loop, name="llm-health", daemon=True)
+                    self._prober.start()
+
+    def _acquire(self, exclude: List[_Endpoint]) -> Optional[_Endpoint]:
+        """Healthy endpoint with the fewest outstanding requests (None if all were tried)"""
+        self._ensure_prober()
+        with self._lock:
+            candidates = [e for e in self.endpoints if e not in exclude]
+            healthy = [e for e in candidates if e.healthy]
+            # Every probe failing may be stale: better to try than fail outright
+            pool = healthy or candidates
+            if not pool:
+                return None
+            start = self._next
+            self._next = (self._next + 1) % len(self.endpoints)
+            endpoint = min(
+                pool,
+                key=lambda e: (e.outstanding, (self.endpoints.index(e) - start) % len(self.endpoints))
+            )
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _release(self, endpoint: _Endpoint):
+        with self._lock:
+            endpoint.outstanding -= 1
+
+    def _eject(self, endpoint: _Endpoint, error: Exception):
+        with self._lock:
+            endpoint.failures += 1
+            endpoint.last_error = str(error)
+            was_healthy, endpoint.healthy = endpoint.healthy, False
+        if was_healthy:
+            logger.warning(f"LLM endpoint {endpoint.url} ejected: {error}")
+
+    def _readmit(self, endpoint: _Endpoint):
+        with self._lock:
+            was_healthy, endpoint.healthy = endpoint.healthy, True
+        if not was_healthy:
+            logger.info(f"LLM endpoint {endpoint.url} healthy again")
+
+    def probe(self):
+        """Check every endpoint's model list now, ejecting or readmitting it"""
+        for endpoint in self.endpoints:
+            try:
+                endpoint.client.list_models(use_cache=False)
+                self._readmit(endpoint)
+            except Exception as e:
+                self._eject(endpoint, e)
+
+    def _probe_loop(self):
+        while not self._stop.wait(self.config.health_check_interval):
+            self.probe()
+
+    # ---- LLMBackend ----
+
+    def generate(self, payload: Dict[str, Any], read_timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Non-streamed generation, retried on another endpoint after a connection error / 5xx"""
+        tried: List[_Endpoint] = []
+        while True:
+            endpoint = self._acquire(tried)
+            tried.append(endpoint)
+            try:
+                return endpoint.client.generate(payload, read_timeout=read_timeout)
+            except Exception as e:
+                if not _is_endpoint_failure(e):
+                    raise
+                self._eject(endpoint, e)
+                if len(tried) >= len(self.endpoints):
+                    raise
+                logger.warning(f"Generation failed on {endpoint.url}, retrying on another endpoint")
+            finally:
+                self._release(endpoint)
+
+    def generate_stream(
+        self,
+        payload: Dict[str, Any],
+        read_timeout: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Streamed generation; moves to another endpoint only if nothing was received yet"""
+        tried: List[_Endpoint] = []
+        while True:
+            endpoint = self._acquire(tried)
+            tried.append(endpoint)
+            stream = endpoint.client.generate_stream(payload, read_timeout=read_timeout)
+            try:
+                try:
+                    first = next(stream)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    if not _is_endpoint_failure(e):
+                        raise
+                    self._eject(endpoint, e)
+                    if len(tried) >= len(self.endpoints):
+                        raise
+                    logger.warning(f"Generation failed on {endpoint.url}, retrying on another endpoint")
+                    continue
+
+                yield first
+                yield from stream
+                return
+            finally:
+                stream.close()
+                self._release(endpoint)
+
+    def _ask_healthy(self, func: Callable[[LLMBackend], T]) -> List[Tuple[LLMBackend, T]]:
+        """
+        Call func on every healthy endpoint's client, ejecting endpoints that fail
+
+        Returns:
+            (client, result) of the endpoints that answered
+
+        Raises:
+            The first error if no endpoint answered
+        """
+        self._ensure_prober()
+        with self._lock:
+            endpoints = [e for e in self.endpoints if e.healthy] or list(self.endpoints)
+
+        answers, errors = [], []
+        for endpoint in endpoints:
+            try:
+                answers.append((endpoint.client, func(endpoint.client)))
+            except Exception as e:
+                self._eject(endpoint, e)
+                errors.append(e)
+        if not answers:
+            raise errors[0]
+        return answers
+
+    def list_models(self, use_cache: bool = True) -> List[str]:
+        """Models served by every healthy endpoint"""
+        answers = self._ask_healthy(lambda client: client.list_models(use_cache=use_cache))
+        models = answers[0][1]
+        for _, served in answers[1:]:
+            models = [m for m in models if m in served]
+        return models
+
+    def has_model(self, model: str) -> bool:
+        return all(found for _, found in self._ask_healthy(lambda client: client.has_model(model)))
+
+    def context_length(self, model: str) -> Optional[int]:
+        """Smallest context window reported by an endpoint (chunks must fit everywhere)"""
+        try:
+            answers = self._ask_healthy(lambda client: client.context_length(model))
+        except Exception:
+            return None
+        lengths = [length for _, length in answers if length]
+        return min(lengths) if lengths else None
+
+    def pull(self, model: str):
+        """Pull onto every healthy endpoint that doesn't have the model"""
+        for client, found in self._ask_healthy(lambda client: client.has_model(model)):
+            if not found:
+                logger.info(f"Pulling {model} on {client.base_url}")
+                client.pull(model)
+
+    def unload(self, model: str):
+        for endpoint in self.endpoints:
+            try:
+                endpoint.client.unload(model)
+            except Exception as e:
+                logger.warning(f"Could not unload model on {endpoint.url}: {e}")
+
+    def parallel_endpoints(self) -> int:
+        """Healthy endpoints (chunk parallelism scales with them)"""
+        with self._lock:
+            return max(1, sum(1 for e in self.endpoints if e.healthy))
+
+    def endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Routing state per endpoint (health checks, metrics)"""
+        with self._lock:
+            return [
+                {
+                    "url": e.url,
+                    "healthy": e.healthy,
+                    "outstanding": e.outstanding,
+                    "requests": e.requests,
+                    "failures": e.failures,
+                    "last_error": e.last_error
+                }
+                for e in self.endpoints
+            ]
+
+    def close(self):
+        self._stop.set()
+        for endpoint in self.endpoints:
+            endpoint.client.close()
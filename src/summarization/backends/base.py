@@ -0,0 +1,181 @@
+"""
+LLM backend interface shared by every inference server
+File: src/summarization/backends/base.py
+
+LLMService builds requests in Ollama's /api/generate shape (model, system,
+prompt, options, format, stream, keep_alive) and reads responses in that
+shape (response, done, eval_count, prompt_eval_count, ...). A backend
+translates both to and from its server's API, so chunking, streamed JSON
+validation, retries and metrics behave the same on every server.
+"""
+import threading
+import time
+from typing import Optional, List, Dict, Any, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Transient statuses worth retrying (server restarting / overloaded proxy)
+RETRY_STATUSES = (502, 503, 504)
+
+
+class _ModelListCache:
+    """TTL cache for the model list so availability isn't rechecked on every call"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._models: Optional[List[str]] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[List[str]]:
+        with self._lock:
+            if self._models is not None and time.monotonic() - self._fetched_at < self.ttl:
+                return self._models
+        return None
+
+    def set(self, models: List[str]):
+        with self._lock:
+            self._models = models
+            self._fetched_at = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._models = None
+
+
+def create_session(config) -> requests.Session:
+    """
+    Keep-alive session with a connection pool of config.http_pool_size
+
+    Failed connections (nothing was sent) are retried with exponential
+    backoff for every method; 502-504 only for GET (model list, probes).
+    A generation POST is never replayed here: LLMService.map_chunks and the
+    extractor retry it, and stacking both layers would multiply attempts,
+    each re-sending the full prompt. Read timeouts are not retried either
+    (the request may still be generating).
+
+    Args:
+        config: SummarizationConfig instance
+
+    Returns:
+        requests.Session
+    """
+    retry = Retry(
+        total=config.http_retries,
+        connect=config.http_retries,
+        read=0,  # Never replay a request that timed out mid-generation
+        status=config.http_retries,
+        backoff_factor=config.retry_backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),  # Connect retries apply to any method
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=config.http_pool_size,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class LLMBackend:
+    """Synchronous client for one inference server (thread-safe, pooled)"""
+
+    # Shown in logs and error messages
+    name = "LLM server"
+
+    def __init__(self, config):
+        """
+        Initialize client
+
+        Args:
+            config: SummarizationConfig instance
+        """
+        self.config = config
+        self.base_url = config.base_url.rstrip("/")
+        self._models = _ModelListCache(config.model_check_ttl)
+        self.session = create_session(config)
+
+    def _timeout(self, read_timeout: Optional[float]):
+        return (self.config.connect_timeout, read_timeout or self.config.read_timeout)
+
+    def generate(self, payload: Dict[str, Any], read_timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run one non-streamed generation
+
+        Args:
+            payload: Request in /api/generate shape
+            read_timeout: Seconds to wait for the response (default: config.read_timeout)
+
+        Returns:
+            Response in /api/generate shape ("response", "done" and the
+            eval / prompt_eval counters the server reports)
+
+        Raises:
+            requests.exceptions.RequestException on HTTP/connection errors
+        """
+        raise NotImplementedError
+
+    def generate_stream(
+        self,
+        payload: Dict[str, Any],
+        read_timeout: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run one streamed generation
+
+        Yields {"response": piece, "done": False} per piece, then one
+        {"done": True, ...counters} object. Closing the generator closes the
+        connection, which makes the server stop generating.
+
+        Raises:
+            requests.exceptions.RequestException on HTTP/connection errors
+        """
+        raise NotImplementedError
+
+    def list_models(self, use_cache: bool = True) -> List[str]:
+        """Model names served (cached for config.model_check_ttl seconds)"""
+        raise NotImplementedError
+
+    def is_available(self) -> bool:
+        """True if the server answered the model list (recently, or right now)"""
+        try:
+            self.list_models()
+            return True
+        except Exception:
+            return False
+
+    def has_model(self, model: str) -> bool:
+        return model in self.list_models()
+
+    def context_length(self, model: str) -> Optional[int]:
+        """
+        Context window of a model as reported by the server
+
+        Returns:
+            Token count, or None if the server doesn't report it
+        """
+        return None
+
+    def pull(self, model: str):
+        """Download a model onto the server"""
+        raise RuntimeError(f"{self.name} cannot download models - start it with {model} loaded")
+
+    def unload(self, model: str):
+        """Release the model's (V)RAM now, if the server supports it"""
+
+    def parallel_endpoints(self) -> int:
+        """Servers requests are spread over (see BalancedBackend)"""
+        return 1
+
+    def endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint routing state; empty for a single server"""
+        return []
+
+    def close(self):
+        self.session.close()
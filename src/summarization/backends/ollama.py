@@ -0,0 +1,138 @@
+"""
+Connection-pooled Ollama HTTP client
+File: src/summarization/backends/ollama.py
+"""
+import json
+from typing import Optional, List, Dict, Any, Iterator
+
+from ...utils.logger import logger
+from .base import LLMBackend
+
+
+class OllamaClient(LLMBackend):
+    """Synchronous Ollama client sharing one keep-alive connection pool"""
+
+    name = "Ollama"
+
+    def __init__(self, config):
+        """
+        Initialize client
+
+        Args:
+            config: SummarizationConfig instance
+        """
+        super().__init__(config)
+        self._context_lengths: Dict[str, Optional[int]] = {}
+
+    def generate(self, payload: Dict[str, Any], read_timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        POST /api/generate (non-streaming)
+
+        Raises:
+            requests.exceptions.RequestException on HTTP/connection errors
+        """
+        response = self.session.post(
+            f"{self.base_url}/api/generate",
+            json=payload,
+            timeout=self._timeout(read_timeout)
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def generate_stream(
+        self,
+        payload: Dict[str, Any],
+        read_timeout: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        POST /api/generate with stream=true, yielding each NDJSON object
+
+        Closing the generator (break / exception in the consumer) closes the
+        connection, which makes Ollama stop generating.
+
+        Raises:
+            requests.exceptions.RequestException on HTTP/connection errors
+        """
+        response = self.session.post(
+            f"{self.base_url}/api/generate",
+            json={**payload, "stream": True},
+            stream=True,
+            timeout=self._timeout(read_timeout)
+        )
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise RuntimeError(f"Ollama error: {data['error']}")
+                    yield data
+        finally:
+            response.close()
+
+    def list_models(self, use_cache: bool = True) -> List[str]:
+        """Installed model names from /api/tags (cached for model_check_ttl seconds)"""
+        if use_cache:
+            cached = self._models.get()
+            if cached is not None:
+                return cached
+
+        response = self.session.get(
+            f"{self.base_url}/api/tags",
+            timeout=(self.config.connect_timeout, 10)
+        )
+        response.raise_for_status()
+        models = [m["name"] for m in response.json().get("models", [])]
+        self._models.set(models)
+        return models
+
+    def context_length(self, model: str) -> Optional[int]:
+        """
+        Trained context window of a model from /api/show (cached per model)
+
+        Returns:
+            Token count, or None if Ollama doesn't report it
+        """
+        if model in self._context_lengths:
+            return self._context_lengths[model]
+
+        length = None
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/show",
+                json={"model": model},
+                timeout=(self.config.connect_timeout, 10)
+            )
+            response.raise_for_status()
+            for key, value in (response.json().get("model_info") or {}).items():
+                if key.endswith(".context_length"):
+                    length = int(value)
+                    break
+        except Exception as e:
+            logger.debug(f"Could not read context length of {model}: {e}")
+            return None  # Not cached: retry once Ollama is up
+
+        self._context_lengths[model] = length
+        return length
+
+    def pull(self, model: str):
+        """POST /api/pull, streaming progress to the debug log"""
+        response = self.session.post(
+            f"{self.base_url}/api/pull",
+            json={"name": model},
+            stream=True,
+            timeout=(self.config.connect_timeout, 3600)
+        )
+        response.raise_for_status()
+
+        for line in response.iter_lines():
+            if line:
+                data = json.loads(line)
+                logger.debug(f"Model pull: {data.get('status', '')}")
+
+        self._models.invalidate()
+
+    def unload(self, model: str):
+        """Ask Ollama to release the model from VRAM now (keep_alive=0)"""
+        self.generate({"model": model, "keep_alive": 0, "stream": False}, read_timeout=30)
+
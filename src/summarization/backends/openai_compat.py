@@ -0,0 +1,224 @@
+"""
+OpenAI-compatible chat completions client (vLLM, llama.cpp server, LM Studio, ...)
+File: src/summarization/backends/openai_compat.py
+
+Continuous-batching servers generate many requests at once, so with this
+backend max_parallel_chunks can be raised to the server's slot count.
+Context size, model residency and downloads are server-side settings:
+options.num_ctx and keep_alive are not sent and pull() is unsupported.
+"""
+import json
+import time
+from typing import Optional, List, Dict, Any, Iterator
+
+from ...utils.logger import logger
+from .base import LLMBackend
+
+
+def _usage_counters(usage: Optional[dict], timings: Optional[dict]) -> Dict[str, Any]:
+    """
+    Ollama-style counters from an OpenAI `usage` block or llama.cpp `timings`
+
+    prompt_eval_count counts evaluated tokens only (prefix-cache hits excluded),
+    like Ollama's.
+    """
+    if timings:  # llama.cpp server: exact per-phase numbers
+        return {
+            "prompt_eval_count": timings.get("prompt_n", 0),
+            "prompt_eval_duration": int(timings.get("prompt_ms", 0) * 1e6),
+            "eval_count": timings.get("predicted_n", 0),
+            "eval_duration": int(timings.get("predicted_ms", 0) * 1e6)
+        }
+    if usage:
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        return {
+            "prompt_eval_count": max(0, (usage.get("prompt_tokens") or 0) - cached),
+            "eval_count": usage.get("completion_tokens") or 0
+        }
+    return {}
+
+
+class OpenAICompatibleClient(LLMBackend):
+    """Client for /v1/chat/completions servers, speaking /api/generate shapes to LLMService"""
+
+    name = "OpenAI-compatible server"
+
+    def __init__(self, config):
+        """
+        Initialize client
+
+        Args:
+            config: SummarizationConfig instance (base_url with or without /v1)
+        """
+        super().__init__(config)
+        if self.base_url.endswith("/v1"):
+            self.base_url = self.base_url[:-len("/v1")]
+        if config.api_key:
+            self.session.headers["Authorization"] = f"Bearer {config.api_key}"
+        self._model_info: Dict[str, dict] = {}
+
+    def _chat_body(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Translate an /api/generate request into a chat completions request"""
+        messages = []
+        if payload.get("system"):
+            messages.append({"role": "system", "content": payload["system"]})
+        messages.append({"role": "user", "content": payload.get("prompt", "")})
+
+        options = payload.get("options") or {}
+        body = {
+            "model": payload["model"],
+            "messages": messages,
+            "stream": bool(payload.get("stream")),
+            "temperature": options.get("temperature"),
+            "top_p": options.get("top_p"),
+            "max_tokens": options.get("num_predict") if (options.get("num_predict") or 0) > 0 else None
+        }
+        body = {key: value for key, value in body.items() if value is not None}
+
+        fmt = payload.get("format")
+        if isinstance(fmt, dict):
+            body["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "schema": fmt}
+            }
+        elif fmt == "json":
+            body["response_format"] = {"type": "json_object"}
+
+        if body["stream"]:
+            body["stream_options"] = {"include_usage": True}
+        return body
+
+    def generate(self, payload: Dict[str, Any], read_timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        POST /v1/chat/completions (non-streaming)
+
+        Raises:
+            requests.exceptions.RequestException on HTTP/connection errors
+        """
+        started = time.perf_counter()
+        response = self.session.post(
+            f"{self.base_url}/v1/chat/completions",
+            json=self._chat_body({**payload, "stream": False}),
+            timeout=self._timeout(read_timeout)
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        choice = (data.get("choices") or [{}])[0]
+        return {
+            "model": data.get("model", payload["model"]),
+            "response": (choice.get("message") or {}).get("content") or "",
+            "done": True,
+            "done_reason": choice.get("finish_reason"),
+            "total_duration": int((time.perf_counter() - started) * 1e9),
+            **_usage_counters(data.get("usage"), data.get("timings"))
+        }
+
+    def generate_stream(
+        self,
+        payload: Dict[str, Any],
+        read_timeout: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        POST /v1/chat/completions with stream=true (server-sent events)
+
+        Closing the generator closes the connection, which cancels the
+        request on vLLM and llama.cpp.
+
+        Raises:
+            requests.exceptions.RequestException on HTTP/connection errors
+        """
+        started = time.perf_counter()
+        first_token: Optional[float] = None
+        usage = timings = finish_reason = None
+
+        response = self.session.post(
+            f"{self.base_url}/v1/chat/completions",
+            json=self._chat_body({**payload, "stream": True}),
+            stream=True,
+            timeout=self._timeout(read_timeout)
+        )
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                line = line[len(b"data:"):].strip()
+                if line == b"[DONE]":
+                    break
+
+                data = json.loads(line)
+                if data.get("error"):
+                    raise RuntimeError(f"{self.name} error: {data['error']}")
+                usage = data.get("usage") or usage
+                timings = data.get("timings") or timings
+
+                for choice in data.get("choices") or []:
+                    finish_reason = choice.get("finish_reason") or finish_reason
+                    piece = (choice.get("delta") or {}).get("content")
+                    if piece:
+                        if first_token is None:
+                            first_token = time.perf_counter()
+                        yield {"response": piece, "done": False}
+
+            now = time.perf_counter()
+            final = {
+                "model": payload["model"],
+                "response": "",
+                "done": True,
+                "done_reason": finish_reason,
+                "total_duration": int((now - started) * 1e9)
+            }
+            counters = _usage_counters(usage, timings)
+            if first_token is not None and "eval_duration" not in counters:
+                # No server timings: time to first token ~ prompt evaluation
+                counters["prompt_eval_duration"] = int((first_token - started) * 1e9)
+                counters["eval_duration"] = int((now - first_token) * 1e9)
+            final.update(counters)
+            yield final
+        finally:
+            response.close()
+
+    def list_models(self, use_cache: bool = True) -> List[str]:
+        """Model ids from /v1/models (cached for model_check_ttl seconds)"""
+        if use_cache:
+            cached = self._models.get()
+            if cached is not None:
+                return cached
+
+        response = self.session.get(
+            f"{self.base_url}/v1/models",
+            timeout=(self.config.connect_timeout, 10)
+        )
+        response.raise_for_status()
+        entries = response.json().get("data", [])
+        self._model_info = {m["id"]: m for m in entries}
+        models = list(self._model_info)
+        self._models.set(models)
+        return models
+
+    def has_model(self, model: str) -> bool:
+        models = self.list_models()
+        # Single-model servers (llama.cpp) answer any model name
+        return model in models or len(models) == 1
+
+    def context_length(self, model: str) -> Optional[int]:
+        """
+        Context window from /v1/models (vLLM max_model_len, llama.cpp meta.n_ctx_train)
+
+        Returns:
+            Token count, or None if the server doesn't report it
+        """
+        try:
+            self.list_models()
+        except Exception as e:
+            logger.debug(f"Could not read context length of {model}: {e}")
+            return None
+
+        info = self._model_info.get(model)
+        if info is None and len(self._model_info) == 1:
+            info = next(iter(self._model_info.values()))
+        if not info:
+            return None
+        length = info.get("max_model_len") or (info.get("meta") or {}).get("n_ctx_train")
+        return int(length) if length else None
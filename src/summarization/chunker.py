@@ -4,26 +4,27 @@ File: src/summarization/chunker.py
 """
 from typing import List
 from ..utils.logger import logger
-from ..utils.text_processor import chunk_text as _chunk_text_util
+from ..utils.text_processor import chunk_text as _chunk_text_util, estimate_tokens
 
 
 class TextChunker:
     """Handle text chunking for long transcripts"""
 
-    def __init__(self, max_chunk_size: int = 15000, overlap: int = 500):
+    def __init__(self, max_chunk_tokens: int = 6000, overlap_tokens: int = 100):
         """
         Initialize text chunker
 
         Args:
-            max_chunk_size: Maximum size of each chunk in characters
-            overlap: Number of overlapping characters between chunks
+            max_chunk_tokens: Maximum estimated tokens per chunk
+                (LLMService.token_budget() gives the value for the current model)
+            overlap_tokens: Estimated tokens repeated between consecutive chunks
         """
-        self.max_chunk_size = max_chunk_size
-        self.overlap = overlap
+        self.max_chunk_tokens = max_chunk_tokens
+        self.overlap_tokens = overlap_tokens
 
     def should_chunk(self, text: str) -> bool:
         """
-        Check if text needs chunking (threshold: 20k chars)
+        Check if text needs chunking (more than max_chunk_tokens)
 
         Args:
             text: Input text to check
@@ -31,11 +32,11 @@ class TextChunker:
         Returns:
             True if text should be chunked, False otherwise
         """
-        return len(text) > 20000
+        return estimate_tokens(text) > self.max_chunk_tokens
 
     def chunk(self, text: str) -> List[str]:
         """
-        Split text into overlapping chunks at sentence boundaries
+        Split text into overlapping chunks at segment/paragraph boundaries
 
         Args:
             text: Full transcript text
@@ -46,8 +47,7 @@ class TextChunker:
         if not self.should_chunk(text):
             return [text]
 
-        # Use existing chunk_text utility
-        chunks = _chunk_text_util(text, self.max_chunk_size, self.overlap)
+        chunks = _chunk_text_util(text, self.max_chunk_tokens, self.overlap_tokens, length=estimate_tokens)
 
         logger.info(f"Split transcript into {len(chunks)} chunks")
         return chunks
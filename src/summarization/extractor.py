@@ -2,11 +2,21 @@
 Meeting information extraction from transcript
 File: src/summarization/extractor.py
 """
-import json
-import re
-from typing import Optional, Callable
+from typing import Optional, Callable, List, Tuple
 from ..utils.logger import logger
-from config.prompts import EXTRACTION_PROMPT, get_extraction_schema_json
+from ..utils.tracing import span, annotate
+from ..utils.text_processor import chunk_text, estimate_tokens, render_summary
+from .qwen_service import JSON_NUM_PREDICT
+from .merge import merge_extractions
+from .json_repair import repair
+from config.prompts import (
+    EXTRACTION_PROMPT,
+    COMBINED_PROMPT,
+    EXTRACTION_JSON_SCHEMA,
+    COMBINED_JSON_SCHEMA,
+    get_extraction_schema_json,
+    get_combined_schema_json
+)
 
 
 class MeetingExtractor:
@@ -30,14 +40,64 @@ class MeetingExtractor:
         """
         Extract meeting info to structured JSON
 
+        Transcripts that don't fit one request are split into token-budgeted
+        chunks, extracted in parallel (each retried config.chunk_retries times)
+        and merged with near-duplicate removal. Chunks that still fail are
+        skipped; the fallback structure is only used if every chunk fails.
+
         Args:
             transcript: Meeting transcript text
-            max_retries: Number of retry attempts if extraction fails
+            max_retries: Number of attempts when the transcript fits one request
             progress_callback: Progress update callback function
 
         Returns:
             Validated JSON dict or fallback structure
         """
+        template = EXTRACTION_PROMPT.format(schema=get_extraction_schema_json(), transcript="")
+        chunks = self._chunk(transcript, template)
+
+        if len(chunks) == 1:
+            data = self._extract_whole(transcript, max_retries, progress_callback)
+        else:
+            logger.info(f"Extracting from {len(chunks)} chunks")
+            results = self.qwen.map_chunks(
+                self._extract_chunk,
+                chunks,
+                progress_callback=progress_callback,
+                progress_range=(85, 95),
+                label="Extracting info",
+                span_name="llm.extract.chunk",
+                return_exceptions=True
+            )
+            parts = [r for r in results if not isinstance(r, Exception)]
+            if len(parts) < len(chunks):
+                logger.warning(f"Extraction failed for {len(chunks) - len(parts)}/{len(chunks)} chunks")
+            data = merge_extractions(parts) if parts else None
+
+        if data:
+            return data
+
+        # Fallback if all attempts fail
+        logger.warning("All extraction attempts failed, using fallback")
+        return self._fallback_extraction(transcript)
+
+    def _chunk(self, transcript: str, template: str) -> List[str]:
+        """Split the transcript so each prompt built from template fits the context window"""
+        budget = self.qwen.token_budget(prompt=template, response_tokens=JSON_NUM_PREDICT)
+        return chunk_text(
+            transcript,
+            budget,
+            overlap=self.qwen.config.chunk_overlap_tokens,
+            length=estimate_tokens
+        )
+
+    def _extract_whole(
+        self,
+        transcript: str,
+        max_retries: int,
+        progress_callback: Optional[Callable]
+    ) -> Optional[dict]:
+        """Single-request extraction with retries; None if every attempt fails"""
         for attempt in range(max_retries):
             try:
                 if progress_callback:
@@ -53,10 +113,12 @@ class MeetingExtractor:
                 )
 
                 # Call LLM
-                response = self.qwen.extract_json(prompt)
+                with span("llm.extract.attempt", attempt=attempt + 1) as record:
+                    response = self.qwen.extract_json(prompt, schema=EXTRACTION_JSON_SCHEMA)
 
-                # Validate JSON
-                data = self._validate_json(response)
+                    # Validate JSON (repairing it locally where possible)
+                    data = self._validate_json(response, EXTRACTION_JSON_SCHEMA)
+                    record["valid"] = data is not None
                 if data:
                     logger.info("JSON extraction successful")
                     return data
@@ -64,46 +126,90 @@ class MeetingExtractor:
             except Exception as e:
                 logger.warning(f"Extraction attempt {attempt + 1} failed: {e}")
 
-        # Fallback if all attempts fail
-        logger.warning("All extraction attempts failed, using fallback")
-        return self._fallback_extraction(transcript)
+        return None
+
+    def _extract_chunk(self, chunk: str) -> dict:
+        """One extraction call; raises on invalid JSON so map_chunks retries"""
+        prompt = EXTRACTION_PROMPT.format(schema=get_extraction_schema_json(), transcript=chunk)
+        return self._request_json(prompt, EXTRACTION_JSON_SCHEMA)
 
-    def _validate_json(self, response: str) -> Optional[dict]:
+    def extract_combined(
+        self,
+        transcript: str,
+        progress_callback: Optional[Callable] = None
+    ) -> Tuple[str, dict]:
         """
-        Parse and validate JSON response from LLM
+        Summary and structured data from one JSON call per chunk (llm_mode="combined")
+
+        The transcript is sent once instead of twice; the markdown summary is
+        rendered locally from the returned summary points, decisions and
+        action items. If a chunk keeps returning invalid JSON, falls back to
+        the separate summarize + extract passes.
 
         Args:
-            response: Raw LLM response text
+            transcript: Meeting transcript text
+            progress_callback: Progress update callback function
 
         Returns:
-            Parsed dict if valid, None if invalid
+            (summary markdown, extracted data dict)
         """
-        try:
-            # Clean response - remove markdown code blocks if present
-            cleaned = response.strip()
-
-            # Remove ```json and ``` markers if present
-            cleaned = re.sub(r'^```json\s*', '', cleaned)
-            cleaned = re.sub(r'^```\s*', '', cleaned)
-            cleaned = re.sub(r'\s*```$', '', cleaned)
+        template = COMBINED_PROMPT.format(schema=get_combined_schema_json(), transcript="")
+        chunks = self._chunk(transcript, template)
+        logger.info(f"Combined summary + extraction: {len(chunks)} chunk(s)")
 
-            # Parse JSON
-            data = json.loads(cleaned)
+        try:
+            parts = self.qwen.map_chunks(
+                self._extract_combined_chunk,
+                chunks,
+                progress_callback=progress_callback,
+                progress_range=(80, 95),
+                label="Summarizing",
+                span_name="llm.combined.chunk"
+            )
+        except Exception as e:
+            logger.warning(f"Combined extraction failed ({e}), falling back to separate passes")
+            summary = self.qwen.summarize(transcript, progress_callback=progress_callback)
+            return summary, self.extract(transcript, progress_callback=progress_callback)
+
+        data = merge_extractions(parts)
+        return render_summary(data), data
+
+    def _extract_combined_chunk(self, chunk: str) -> dict:
+        """One combined JSON call; raises on invalid JSON so map_chunks retries"""
+        prompt = COMBINED_PROMPT.format(schema=get_combined_schema_json(), transcript=chunk)
+        return self._request_json(prompt, COMBINED_JSON_SCHEMA)
+
+    def _request_json(self, prompt: str, schema: dict) -> dict:
+        data = self._validate_json(self.qwen.extract_json(prompt, schema=schema), schema)
+        if data is None:
+            raise ValueError("Invalid JSON response")
+        return data
+
+    def _validate_json(self, response: str, schema: dict = EXTRACTION_JSON_SCHEMA) -> Optional[dict]:
+        """
+        Parse, repair and validate JSON response from LLM
 
-            # Basic schema validation - check required top-level keys
-            required_keys = ['meeting_info', 'discussions', 'decisions', 'action_items']
-            if all(key in data for key in required_keys):
-                logger.info("JSON validation passed")
-                return data
+        Truncated output is closed, missing keys are filled, wrong types are
+        coerced and enum values normalized (see json_repair), so only output
+        that isn't the expected object at all needs another LLM call.
 
-            logger.warning(f"Missing required keys in JSON response. Found: {list(data.keys())}")
-            return None
+        Args:
+            response: Raw LLM response text
+            schema: JSON Schema of the expected object
 
-        except json.JSONDecodeError as e:
-            logger.warning(f"JSON parse error: {e}")
+        Returns:
+            Conforming dict if usable, None if invalid
+        """
+        data, repaired = repair(response, schema)
+        if data is None:
+            logger.warning("LLM response is not a usable JSON object")
             logger.debug(f"Raw response: {response[:500]}...")  # Log first 500 chars
             return None
 
+        annotate(json_repaired=repaired)
+        logger.info("JSON validation passed" + (" (repaired)" if repaired else ""))
+        return data
+
     def _fallback_extraction(self, transcript: str) -> dict:
         """
         Basic extraction when LLM fails - returns minimal valid structure
@@ -143,5 +249,6 @@ class MeetingExtractor:
             ],
             "decisions": [],
             "action_items": [],
-            "other_notes": "Lưu ý: Extraction tự động không thành công. Vui lòng xem transcript đầy đủ để biết chi tiết cuộc họp."
+            "other_notes": "Lưu ý: Extraction tự động không thành công. Vui lòng xem transcript đầy đủ để biết chi tiết cuộc họp.",
+            "_fallback": True  # Marker: not an LLM result (never cached)
         }
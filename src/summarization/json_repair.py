@@ -0,0 +1,219 @@
+"""
+Local repair of LLM JSON output against a JSON Schema
+File: src/summarization/json_repair.py
+
+Fixing output locally is far cheaper than re-sending the transcript:
+- parse: strip markdown fences, close JSON cut off by num_predict
+- coerce: fill missing keys, wrap/unwrap values of the wrong type and map
+  enum synonyms (Vietnamese/English variants of `type` / `priority`)
+"""
+import json
+import re
+import unicodedata
+from typing import Any, Optional, List, Tuple
+
+from ..utils.logger import logger
+
+_FENCE_START_RE = re.compile(r"^```(?:json)?\s*", re.IGNORECASE)
+_FENCE_END_RE = re.compile(r"\s*```\s*$")
+
+# Values the model writes instead of the schema's enum members
+ENUM_ALIASES = {
+    # discussions[].points[].type
+    "y kien": "opinion", "ý kiến": "opinion", "comment": "opinion", "statement": "opinion",
+    "đề xuất": "proposal", "de xuat": "proposal", "suggestion": "proposal", "proposed": "proposal",
+    "câu hỏi": "question", "cau hoi": "question", "ask": "question",
+    "trả lời": "answer", "tra loi": "answer", "response": "answer", "reply": "answer",
+    "quyết định": "decision", "quyet dinh": "decision", "decided": "decision",
+    # action_items[].priority
+    "cao": "high", "urgent": "high", "khẩn": "high", "gấp": "high",
+    "trung bình": "medium", "trung binh": "medium", "normal": "medium", "med": "medium",
+    "thấp": "low", "thap": "low", "minor": "low",
+}
+
+
+def _strip_fences(text: str) -> str:
+    text = text.strip()
+    text = _FENCE_START_RE.sub("", text)
+    return _FENCE_END_RE.sub("", text)
+
+
+def _scan(text: str) -> Tuple[bool, List[str], List[int]]:
+    """String state at the end, open brackets, and cut points (commas/openers outside strings)"""
+    in_string = escape = False
+    stack: List[str] = []
+    cuts: List[int] = []
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+            cuts.append(i + 1)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == ",":
+            cuts.append(i)
+    return in_string, stack, cuts
+
+
+def _close(text: str) -> str:
+    """Terminate an open string and close every open bracket"""
+    in_string, stack, _ = _scan(text)
+    if in_string:
+        if text.endswith("\\"):
+            text = text[:-1]
+        text += '"'
+    text = text.rstrip()
+    if text.endswith(","):
+        text = text[:-1]
+    elif text.endswith(":"):
+        text += " null"
+    return text + "".join("}" if b == "{" else "]" for b in reversed(stack))
+
+
+def parse_json(text: str, max_cuts: int = 50) -> Tuple[Optional[Any], bool]:
+    """
+    Parse LLM output, closing truncated JSON if needed
+
+    Truncated output is closed at the end; if that isn't valid (cut inside a
+    key or after a colon), it is cut back to earlier commas/openers until it
+    parses, so only the unfinished last item is lost.
+
+    Args:
+        text: Raw model output
+        max_cuts: Cut points to try before giving up
+
+    Returns:
+        (parsed value or None, whether a repair was needed)
+    """
+    cleaned = _strip_fences(text)
+    try:
+        return json.loads(cleaned), False
+    except json.JSONDecodeError:
+        pass
+
+    start = min((i for i in (cleaned.find("{"), cleaned.find("[")) if i >= 0), default=-1)
+    if start < 0:
+        return None, False
+    cleaned = cleaned[start:]
+
+    candidates = [cleaned] + [cleaned[:cut] for cut in reversed(_scan(cleaned)[2][-max_cuts:])]
+    for candidate in candidates:
+        try:
+            return json.loads(_close(candidate)), True
+        except json.JSONDecodeError:
+            continue
+    return None, False
+
+
+def _types(schema: dict) -> List[str]:
+    value = schema.get("type", [])
+    return value if isinstance(value, list) else [value]
+
+
+def _normalize_enum(value: Any, schema: dict) -> Any:
+    options = [o for o in schema["enum"] if o is not None]
+    nullable = None in schema["enum"]
+    if value is None:
+        return None if nullable else options[0]
+
+    key = unicodedata.normalize("NFC", str(value)).strip().lower()
+    if key in options:
+        return key
+    alias = ENUM_ALIASES.get(key)
+    if alias in options:
+        return alias
+    for option in options:
+        if option in key:  # "high priority", "proposal/decision"
+            return option
+    return None if nullable else options[0]
+
+
+def _default(schema: dict) -> Any:
+    types = _types(schema)
+    if "null" in types:
+        return None
+    if "array" in types:
+        return []
+    if "object" in types:
+        return coerce({}, schema)
+    return ""
+
+
+def coerce(value: Any, schema: dict) -> Any:
+    """
+    Make a parsed value conform to a JSON Schema (as built by config.prompts.build_json_schema)
+
+    Args:
+        value: Parsed JSON value
+        schema: JSON Schema for it
+
+    Returns:
+        Coerced value (missing keys filled, types fixed, enums normalized)
+    """
+    if "enum" in schema:
+        return _normalize_enum(value, schema)
+
+    types = _types(schema)
+    if value is None:
+        return _default(schema)
+
+    if "object" in types:
+        if not isinstance(value, dict):
+            return _default(schema)
+        result = dict(value)
+        for key, prop in schema.get("properties", {}).items():
+            result[key] = coerce(value.get(key), prop) if key in value else _default(prop)
+        return result
+
+    if "array" in types:
+        if isinstance(value, dict) and schema.get("items", {}).get("type") != "object":
+            value = list(value.values())
+        if not isinstance(value, list):
+            value = [value]
+        items = schema.get("items") or {}
+        return [coerce(item, items) for item in value if item is not None]
+
+    if "string" in types:
+        if isinstance(value, str):
+            return value
+        if isinstance(value, list):
+            return ", ".join(str(v) for v in value if v is not None)
+        if isinstance(value, dict):
+            return json.dumps(value, ensure_ascii=False)
+        return str(value)
+
+    return value
+
+
+def repair(text: str, schema: dict) -> Tuple[Optional[dict], bool]:
+    """
+    Parse and coerce an LLM JSON response
+
+    Args:
+        text: Raw model output
+        schema: JSON Schema of the expected object
+
+    Returns:
+        (conforming dict or None if unusable, whether anything was repaired)
+    """
+    data, closed = parse_json(text)
+    if not isinstance(data, dict):
+        return None, False
+    if not any(key in data for key in schema.get("properties", {})):
+        # Some other object entirely - filling every key would fake an empty result
+        return None, False
+
+    coerced = coerce(data, schema)
+    repaired = closed or coerced != data
+    if repaired:
+        logger.debug(f"Repaired LLM JSON (truncated: {closed})")
+    return coerced, repaired
@@ -0,0 +1,177 @@
+"""
+Incremental JSON validation for streamed LLM output
+File: src/summarization/json_stream.py
+
+Fed the response piece by piece, the validator tracks the JSON grammar
+(nesting, strings, keys/colons/commas, literals) so a stream can be aborted
+as soon as the output can no longer become valid JSON, or as soon as the
+top-level object is complete (anything after it is discarded).
+"""
+import re
+from typing import Optional
+
+PARTIAL = "partial"
+COMPLETE = "complete"
+INVALID = "invalid"
+
+# Allowed before the top-level value: whitespace and a ```json fence
+_FENCE = "```json"
+_MAX_PREFIX = 32
+_LITERAL_RE = re.compile(r"-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?|true|false|null")
+_LITERAL_CHARS = set("0123456789+-.eEtrufalsn")
+
+# What the parser expects next
+_VALUE = "value"                  # any value
+_VALUE_OR_END = "value_or_end"    # after "["
+_KEY_OR_END = "key_or_end"        # after "{"
+_KEY = "key"                      # after "," in an object
+_COLON = "colon"
+_COMMA_OR_END = "comma_or_end"
+_DONE = "done"
+
+
+class JsonStreamValidator:
+    """Push-down validator for a single JSON value arriving in pieces"""
+
+    def __init__(self, require_object: bool = True):
+        """
+        Args:
+            require_object: Top-level value must be an object (extraction schema)
+        """
+        self.require_object = require_object
+        self.status = PARTIAL
+        self.error: Optional[str] = None
+        self.truncated = False   # Output ended mid-value (e.g. num_predict reached)
+        self._chars = []         # Accepted output up to and including the top-level value
+        self._prefix = ""
+        self._started = False
+        self._stack = []         # "{" / "["
+        self._expect = _VALUE
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._literal = ""
+
+    @property
+    def text(self) -> str:
+        """The JSON value so far, without any fence before it or text after it"""
+        return "".join(self._chars)
+
+    def feed(self, piece: str) -> str:
+        """
+        Consume the next piece of output
+
+        Returns:
+            PARTIAL, COMPLETE or INVALID (see self.error)
+        """
+        for ch in piece:
+            if self.status != PARTIAL:
+                break
+            self._consume(ch)
+        return self.status
+
+    def finish(self) -> str:
+        """Mark end of stream: an unfinished value becomes INVALID"""
+        if self.status == PARTIAL:
+            if self._literal and not self._stack:
+                self._end_literal()
+            if self.status == PARTIAL:
+                self.truncated = self._started
+                self._fail("output ended before the JSON value was complete")
+        return self.status
+
+    def _fail(self, message: str):
+        self.status = INVALID
+        self.error = f"{message} (at char {len(self._chars)})"
+
+    def _consume(self, ch: str):
+        if not self._started:
+            if ch in "{[":
+                if self.require_object and ch == "[":
+                    self._fail("expected a JSON object")
+                    return
+                self._started = True
+            else:
+                self._prefix += ch
+                stripped = self._prefix.strip().lower()
+                if len(self._prefix) > _MAX_PREFIX or not _FENCE.startswith(stripped[:len(_FENCE)]) \
+                        or stripped[len(_FENCE):].strip():
+                    self._fail(f"unexpected text before JSON: {self._prefix.strip()[:20]!r}")
+                return
+
+        self._chars.append(ch)
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                self._expect = _COLON if self._string_is_key else self._after_value()
+            elif ch < " ":
+                self._fail("control character in string")
+            return
+
+        if self._literal:
+            if ch in _LITERAL_CHARS:
+                self._literal += ch
+                return
+            self._end_literal()
+            if self.status != PARTIAL:
+                return
+
+        if ch in " \t\r\n":
+            return
+
+        expect = self._expect
+        if ch == '"':
+            if expect in (_KEY, _KEY_OR_END):
+                self._string_is_key = True
+            elif expect in (_VALUE, _VALUE_OR_END):
+                self._string_is_key = False
+            else:
+                self._fail(f"unexpected string (expected {expect})")
+                return
+            self._in_string = True
+        elif ch in "{[":
+            if expect not in (_VALUE, _VALUE_OR_END):
+                self._fail(f"unexpected {ch!r} (expected {expect})")
+                return
+            self._stack.append(ch)
+            self._expect = _KEY_OR_END if ch == "{" else _VALUE_OR_END
+        elif ch in "}]":
+            opener = "{" if ch == "}" else "["
+            allowed = (_KEY_OR_END, _COMMA_OR_END) if ch == "}" else (_VALUE_OR_END, _COMMA_OR_END)
+            if not self._stack or self._stack[-1] != opener or expect not in allowed:
+                self._fail(f"unexpected {ch!r} (expected {expect})")
+                return
+            self._stack.pop()
+            self._expect = self._after_value()
+        elif ch == ":":
+            if expect != _COLON:
+                self._fail(f"unexpected ':' (expected {expect})")
+                return
+            self._expect = _VALUE
+        elif ch == ",":
+            if expect != _COMMA_OR_END:
+                self._fail(f"unexpected ',' (expected {expect})")
+                return
+            self._expect = _KEY if self._stack[-1] == "{" else _VALUE
+        elif ch in _LITERAL_CHARS and expect in (_VALUE, _VALUE_OR_END):
+            self._literal = ch
+        else:
+            self._fail(f"unexpected {ch!r} (expected {expect})")
+
+    def _end_literal(self):
+        literal, self._literal = self._literal, ""
+        if not _LITERAL_RE.fullmatch(literal):
+            self._fail(f"invalid literal {literal!r}")
+            return
+        self._expect = self._after_value()
+
+    def _after_value(self) -> str:
+        if self._stack:
+            return _COMMA_OR_END
+        self.status = COMPLETE
+        return _DONE
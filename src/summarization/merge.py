@@ -0,0 +1,153 @@
+"""
+Deterministic merging of per-chunk extraction results
+File: src/summarization/merge.py
+
+Chunks overlap and the same decision or task is often restated across a
+meeting, so items are de-duplicated by normalized-text similarity rather than
+exact equality. Results are merged in transcript order: the first occurrence
+of an item is kept and only filled in (missing assignee, deadline, ...) by
+later near-duplicates, so the same inputs always give the same output.
+"""
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import List, Optional, Iterable, Any
+
+from config.settings import SUMMARIZATION
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+# Japanese/Vietnamese honorifics that don't change who is meant
+_HONORIFIC_RE = re.compile(r"[-\s]?(san|sama|kun|chan|さん|様|くん|ちゃん)$")
+_TITLE_RE = re.compile(r"^(anh|chị|chi|em|ông|ong|bà|ba|cô|co)\s+")
+
+
+def normalize(text: Any) -> str:
+    """Lowercase, NFC, strip punctuation and collapse whitespace"""
+    text = unicodedata.normalize("NFC", str(text or "")).lower()
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", text)).strip()
+
+
+def normalize_name(name: Any) -> str:
+    """Person name without Vietnamese titles or Japanese honorifics ("Tanaka-san" -> "tanaka")"""
+    name = unicodedata.normalize("NFC", str(name or "")).strip().lower()
+    name = _TITLE_RE.sub("", _HONORIFIC_RE.sub("", name))
+    return normalize(name)
+
+
+def similar(a: str, b: str, threshold: float) -> bool:
+    """True if two normalized strings are near-identical"""
+    if a == b:
+        return True
+    if not a or not b:
+        return False
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    # quick_ratio is an upper bound, so most pairs are rejected cheaply
+    return matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+
+def _fill_missing(target: dict, source: dict):
+    """Copy fields the kept item lacks (null/empty) from a later duplicate"""
+    for key, value in source.items():
+        if value and not target.get(key):
+            target[key] = value
+
+
+def _dedupe(items: Iterable[Any], key, threshold: float, merge=None) -> List[Any]:
+    """
+    Keep the first of each group of near-identical items
+
+    Args:
+        items: Items in transcript order
+        key: Function(item) -> normalized comparison string
+        threshold: Similarity ratio counted as duplicate
+        merge: Function(kept, duplicate) to combine details (default: fill missing fields)
+
+    Returns:
+        De-duplicated items
+    """
+    kept: List[Any] = []
+    keys: List[str] = []
+    for item in items:
+        if not item:
+            continue
+        item_key = key(item)
+        for i, existing in enumerate(keys):
+            if similar(item_key, existing, threshold):
+                if merge is not None:
+                    merge(kept[i], item)
+                elif isinstance(item, dict):
+                    _fill_missing(kept[i], item)
+                break
+        else:
+            kept.append(dict(item) if isinstance(item, dict) else item)
+            keys.append(item_key)
+    return kept
+
+
+def merge_extractions(parts: List[dict], threshold: Optional[float] = None) -> dict:
+    """
+    Merge per-chunk extraction results (in transcript order) into one
+
+    - discussions: same topic merged, points de-duplicated, first conclusion kept
+    - decisions / action_items: near-identical content or task merged
+    - participants / topics: de-duplicated (names ignore titles and honorifics)
+    - main purpose: first non-empty; other notes joined
+
+    Args:
+        parts: Validated per-chunk dicts (EXTRACTION_SCHEMA or COMBINED_SCHEMA)
+        threshold: Similarity ratio for duplicates (default: config.dedup_similarity)
+
+    Returns:
+        Merged dict with the same keys
+    """
+    threshold = SUMMARIZATION.dedup_similarity if threshold is None else threshold
+    if len(parts) == 1:
+        return parts[0]
+
+    def merge_discussion(kept: dict, other: dict):
+        kept["points"] = _dedupe(
+            (kept.get("points") or []) + (other.get("points") or []),
+            lambda p: normalize(p.get("content")),
+            threshold
+        )
+        _fill_missing(kept, {"conclusion": other.get("conclusion")})
+
+    infos = [p.get("meeting_info") or {} for p in parts]
+
+    def collect(key):
+        return [item for p in parts for item in p.get(key) or []]
+
+    discussions = _dedupe(
+        collect("discussions"),
+        lambda d: normalize(d.get("topic")),
+        threshold,
+        merge=merge_discussion
+    )
+    for discussion in discussions:
+        discussion["points"] = _dedupe(discussion.get("points") or [], lambda p: normalize(p.get("content")), threshold)
+
+    notes = _dedupe((p.get("other_notes") for p in parts), normalize, threshold)
+    merged = {
+        "meeting_info": {
+            "main_purpose": next((i["main_purpose"] for i in infos if i.get("main_purpose")), None),
+            "topics_discussed": _dedupe(
+                (t for i in infos for t in i.get("topics_discussed") or []), normalize, threshold
+            ),
+            "participants_mentioned": _dedupe(
+                (n for i in infos for n in i.get("participants_mentioned") or []), normalize_name, threshold
+            )
+        },
+        "discussions": discussions,
+        "decisions": _dedupe(collect("decisions"), lambda d: normalize(d.get("content")), threshold),
+        "action_items": _dedupe(collect("action_items"), lambda a: normalize(a.get("task")), threshold),
+        "other_notes": " ".join(notes) or None
+    }
+
+    # Combined-mode fields
+    if any("summary_points" in p for p in parts):
+        merged["summary_points"] = _dedupe(collect("summary_points"), normalize, threshold)
+    if any("terminology" in p for p in parts):
+        merged["terminology"] = _dedupe(collect("terminology"), normalize, threshold)
+
+    return merged
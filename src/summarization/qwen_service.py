@@ -1,18 +1,28 @@
 """
-LLM summarization service via Ollama (Gemma 4 / Qwen - profile-aware)
+LLM summarization service via Ollama or an OpenAI-compatible server (Gemma 4 / Qwen - profile-aware)
 """
 import requests
-from typing import Optional, Callable
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Callable, List, Tuple, TypeVar
+import threading
 import time
 
 from ..utils.logger import logger
-from ..utils.text_processor import chunk_text
+from ..utils.text_processor import chunk_text, estimate_tokens
+from ..utils.tracing import span, run_in_context
+from .backends import create_backend
+from .json_stream import JsonStreamValidator, COMPLETE, INVALID
 from config.settings import SUMMARIZATION
+from config.prompts import SYSTEM_PROMPT, SUMMARY_PROMPTS
+
+T = TypeVar("T")
+
+# Response budget of JSON calls (extraction output is longer than a summary)
+JSON_NUM_PREDICT = 4000
 
 
 class LLMService:
-    """Handle summarization using LLM via Ollama.
+    """Handle summarization using LLM via Ollama (or config.backend, see backends/).
 
     Works with both Gemma 4 (optimized profile) and Qwen 2.5 (legacy profile).
     Profile is determined by config/settings.py ACTIVE_PROFILE.
@@ -27,6 +37,7 @@ class LLMService:
         """
         self.config = config or SUMMARIZATION
         self.base_url = self.config.base_url
+        self.client = create_backend(self.config)
     
     def summarize(
         self,
@@ -46,40 +57,47 @@ class LLMService:
         logger.info("Starting summarization")
         start_time = time.time()
         
-        # Check if Ollama is available
+        # Check if the LLM server is available
         if not self._check_ollama():
-            logger.error("Ollama is not running")
-            raise RuntimeError("Ollama not running. Please start: ollama serve")
+            logger.error(f"{self.client.name} is not running")
+            raise RuntimeError(self._server_down_message())
         
         # Check if model is available
         self._ensure_model_exists()
         
-        # Chunk transcript if too long
-        max_length = 20000  # Approximate token limit
-        if len(transcript) > max_length:
-            logger.info("Transcript too long, chunking...")
-            chunks = chunk_text(transcript, max_length - 1000, overlap=200)
-            
-            # Summarize chunks first
-            chunk_summaries = []
-            for i, chunk in enumerate(chunks):
-                if progress_callback:
-                    progress = 80 + (i / len(chunks)) * 15
-                    progress_callback(progress, f"Summarizing... ({i+1}/{len(chunks)})")
-                
-                chunk_summary = self._summarize_chunk(chunk)
-                chunk_summaries.append(chunk_summary)
-            
-            # Combine and summarize again
-            combined = "\n".join(chunk_summaries)
+        # Chunk transcript if it doesn't fit the model's context window
+        transcript_tokens = estimate_tokens(transcript)
+        if transcript_tokens > self.token_budget("complete"):
+            chunks = chunk_text(
+                transcript,
+                self.token_budget("chunk"),
+                overlap=self.config.chunk_overlap_tokens,
+                length=estimate_tokens
+            )
+            logger.info(f"Transcript ~{transcript_tokens} tokens, split into {len(chunks)} chunks")
+
+            # Summarize chunks concurrently (order preserved)
+            chunk_summaries = self.map_chunks(
+                self._summarize_chunk,
+                chunks,
+                progress_callback=progress_callback,
+                progress_range=(80, 90),
+                label="Summarizing",
+                span_name="llm.summarize.chunk"
+            )
+
+            # Reduce level by level until one final call fits the context
+            combined = self.reduce_summaries(chunk_summaries, progress_callback, progress_range=(90, 95))
             if progress_callback:
                 progress_callback(95, "Finalizing summary...")
-            
-            final_summary = self._summarize_final(combined)
+
+            with span("llm.summarize.final"):
+                final_summary = self._summarize_final(combined)
         else:
             if progress_callback:
                 progress_callback(85, "Summarizing...")
-            final_summary = self._summarize_complete(transcript)
+            with span("llm.summarize"):
+                final_summary = self._summarize_complete(transcript)
         
         summarize_time = time.time() - start_time
         logger.info(f"Summarization completed in {summarize_time:.2f}s")
@@ -88,12 +106,207 @@ class LLMService:
 
         return final_summary
 
-    def extract_json(self, prompt: str) -> str:
+    def context_window(self) -> int:
+        """Tokens available per request: config.num_ctx, capped at the model's trained context"""
+        trained = self.client.context_length(self.config.model)
+        return min(self.config.num_ctx, trained) if trained else self.config.num_ctx
+
+    def token_budget(
+        self,
+        style: str = "chunk",
+        prompt: Optional[str] = None,
+        response_tokens: Optional[int] = None
+    ) -> int:
+        """
+        Transcript tokens that fit in one request
+
+        Args:
+            style: Summary prompt style ("complete", "chunk", "merge" or "final")
+            prompt: Prompt template without the transcript (overrides style)
+            response_tokens: num_predict of the call (default: config.max_tokens)
+
+        Returns:
+            Context window minus the response, system prompt and prompt
+            template, less config.chunk_safety_margin
+        """
+        if prompt is None:
+            prompt = self._build_summary_prompt("", style)
+        response_tokens = response_tokens or self.config.max_tokens
+        prompt_tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt)
+        available = self.context_window() - response_tokens - prompt_tokens
+        return max(256, int(available * (1 - self.config.chunk_safety_margin)))
+
+    def _options(self, **overrides) -> dict:
+        """Generation options shared by every call (same num_ctx avoids model reloads)"""
+        options = {
+            "temperature": self.config.temperature,
+            "num_predict": self.config.max_tokens,
+            "num_ctx": self.context_window()
+        }
+        options.update(overrides)
+        return options
+
+    def map_chunks(
+        self,
+        func: Callable[[str], T],
+        chunks: List[str],
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        progress_range: Tuple[float, float] = (80, 95),
+        label: str = "Processing",
+        span_name: str = "llm.chunk",
+        return_exceptions: bool = False
+    ) -> List[T]:
+        """
+        Apply an LLM call to every chunk concurrently
+
+        Runs up to config.max_parallel_chunks requests at once per healthy
+        endpoint (Ollama serves them in parallel with OLLAMA_NUM_PARALLEL),
+        retries each chunk up to config.chunk_retries times, and reports
+        progress per completed chunk.
+
+        Args:
+            func: Function(chunk) -> result, e.g. self._summarize_chunk
+            chunks: Input chunks
+            progress_callback: Callback function(progress: float, status: str)
+            progress_range: (start, end) progress percentage for this stage
+            label: Status text prefix
+            span_name: Timing span recorded per chunk attempt
+            return_exceptions: Put the final exception of a failed chunk in its
+                result slot and keep going, instead of aborting all chunks
+
+        Returns:
+            Results in the same order as chunks
+        """
+        total = len(chunks)
+        if total == 0:
+            return []
+
+        start_pct, end_pct = progress_range
+        results: List[Optional[T]] = [None] * total
+        done = 0
+        lock = threading.Lock()
+
+        def run(index: int) -> T:
+            for attempt in range(self.config.chunk_retries + 1):
+                try:
+                    with span(span_name, chunk=index, attempt=attempt + 1):
+                        return func(chunks[index])
+                except Exception as e:
+                    if attempt >= self.config.chunk_retries:
+                        raise
+                    delay = 2 ** attempt
+                    logger.warning(
+                        f"Chunk {index + 1}/{total} failed (attempt {attempt + 1}): {e}, "
+                        f"retrying in {delay}s"
+                    )
+                    time.sleep(delay)
+
+        if progress_callback:
+            progress_callback(start_pct, f"{label}... (0/{total})")
+
+        # Load-balanced endpoints each take max_parallel_chunks requests
+        workers = max(1, min(self.config.max_parallel_chunks * self.client.parallel_endpoints(), total))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-chunk") as executor:
+            # Workers inherit the job's trace so chunk spans land on it
+            futures = {executor.submit(run_in_context(run, i)): i for i in range(total)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        # Don't start the remaining chunks once one has failed for good
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+                    results[index] = e
+                    logger.warning(f"Chunk {index + 1}/{total} failed for good: {e}")
+
+                with lock:
+                    done += 1
+                    if progress_callback:
+                        progress = start_pct + (done / total) * (end_pct - start_pct)
+                        progress_callback(progress, f"{label}... ({done}/{total})")
+
+        return results
+
+    def reduce_summaries(
+        self,
+        summaries: List[str],
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        progress_range: Tuple[float, float] = (90, 95)
+    ) -> str:
+        """
+        Tree-reduce chunk summaries until they fit one final summary request
+
+        Each level packs consecutive summaries into groups of at most
+        config.reduce_fan_in that fit the context window, and merges every
+        group with one LLM call (groups run in parallel via map_chunks).
+
+        Args:
+            summaries: Chunk summaries in transcript order
+            progress_callback: Callback function(progress: float, status: str)
+            progress_range: (start, end) progress percentage for all levels
+
+        Returns:
+            Combined text for _summarize_final
+        """
+        fan_in = max(2, self.config.reduce_fan_in)
+        start_pct, end_pct = progress_range
+        level = 0
+
+        while True:
+            combined = "\n\n".join(summaries)
+            if len(summaries) <= fan_in and estimate_tokens(combined) <= self.token_budget("final"):
+                return combined
+
+            level += 1
+            groups = self._group_summaries(summaries, self.token_budget("merge"), fan_in)
+            logger.info(f"Reduce level {level}: {len(summaries)} summaries -> {len(groups)}")
+
+            # Levels shrink geometrically, so give each half of the remaining range
+            level_end = start_pct + (end_pct - start_pct) / 2
+            summaries = self.map_chunks(
+                self._summarize_merge,
+                ["\n\n".join(group) for group in groups],
+                progress_callback=progress_callback,
+                progress_range=(start_pct, level_end),
+                label=f"Merging summaries (level {level})",
+                span_name="llm.summarize.reduce"
+            )
+            start_pct = level_end
+
+    @staticmethod
+    def _group_summaries(summaries: List[str], budget: int, fan_in: int) -> List[List[str]]:
+        """Pack consecutive summaries into groups within the token budget and fan-in (at least two per group)"""
+        groups: List[List[str]] = []
+        group: List[str] = []
+        size = 0
+
+        for summary in summaries:
+            tokens = estimate_tokens(summary)
+            if len(group) >= 2 and (len(group) >= fan_in or size + tokens > budget):
+                groups.append(group)
+                group, size = [], 0
+            group.append(summary)
+            size += tokens
+
+        if group:
+            # A lone trailing summary joins the previous group so every call reduces
+            if len(group) == 1 and groups and len(groups[-1]) < fan_in:
+                groups[-1].extend(group)
+            else:
+                groups.append(group)
+        return groups
+
+    def extract_json(self, prompt: str, schema: Optional[dict] = None) -> str:
         """
         Extract structured JSON from transcript using LLM
 
         Args:
             prompt: Formatted extraction prompt with schema
+            schema: JSON Schema to constrain the output to (Ollama structured
+                outputs); plain JSON mode if None or config.structured_output is off
 
         Returns:
             Raw JSON string response from LLM
@@ -101,16 +314,16 @@ class LLMService:
         logger.info("Starting JSON extraction")
         start_time = time.time()
 
-        # Check if Ollama is available
+        # Check if the LLM server is available
         if not self._check_ollama():
-            logger.error("Ollama is not running")
-            raise RuntimeError("Ollama not running. Please start: ollama serve")
+            logger.error(f"{self.client.name} is not running")
+            raise RuntimeError(self._server_down_message())
 
         # Check if model is available
         self._ensure_model_exists()
 
         # Call Ollama with JSON-optimized parameters
-        response = self._call_ollama_json(prompt)
+        response = self._call_ollama_json(prompt, schema=schema)
 
         extract_time = time.time() - start_time
         logger.info(f"JSON extraction completed in {extract_time:.2f}s")
@@ -142,9 +355,22 @@ class LLMService:
             Chunk summary
         """
         prompt = self._build_summary_prompt(chunk, style="chunk")
-        response = self._call_ollama(prompt)
+        response = self._call_ollama(prompt, timeout=self.config.chunk_timeout)
         return response
     
+    def _summarize_merge(self, summaries: str) -> str:
+        """
+        Merge a group of partial summaries into one (intermediate reduce level)
+
+        Args:
+            summaries: Partial summaries joined by blank lines
+
+        Returns:
+            Merged summary
+        """
+        prompt = self._build_summary_prompt(summaries, style="merge")
+        return self._call_ollama(prompt, timeout=self.config.chunk_timeout)
+
     def _summarize_final(self, combined_summaries: str) -> str:
         """
         Create final summary from combined chunk summaries
@@ -160,137 +386,243 @@ class LLMService:
         return response
     
     def _build_summary_prompt(self, text: str, style: str = "complete") -> str:
-        """Build bilingual Việt-Nhật summary prompt (Gemma 4 / Qwen compatible)"""
-        base_instruction = """Bạn là trợ lý chuyên nghiệp tóm tắt cuộc họp song ngữ Việt-Nhật.
-Đây là cuộc họp marketing của công ty F&B (thực phẩm Việt Nam) tại thị trường Nhật Bản.
-
-QUY TẮC:
-1. Tóm tắt bằng tiếng Việt
-2. Giữ nguyên thuật ngữ tiếng Nhật quan trọng kèm nghĩa Việt trong ngoặc (ví dụ: 売上 - doanh thu)
-3. Giữ nguyên tên riêng, tên công ty, địa danh
-4. Số liệu (doanh thu, %, ngân sách) → ghi chính xác
-
-# TÓM TẮT CUỘC HỌP
-
-## NỘI DUNG CHÍNH
-[Tóm tắt 3-5 điểm chính: vấn đề gì được bàn, ai nói gì]
-
-## CÁC QUYẾT ĐỊNH
-[Quyết định cụ thể nào được đưa ra? Số liệu? Timeline?]
+        """
+        Build bilingual Việt-Nhật summary prompt (Gemma 4 / Qwen compatible)
 
-## HÀNH ĐỘNG CẦN LÀM
-[Ai làm gì, deadline khi nào - format: "- Người: Công việc (deadline)"]
+        Instructions come first and the text last, so calls of the same style
+        share their prefix (see config.prompts); the role and rules are sent
+        separately as the system prompt.
 
-## THUẬT NGỮ CHUYÊN NGÀNH
-[Liệt kê thuật ngữ Nhật-Việt quan trọng xuất hiện trong cuộc họp]
+        Args:
+            text: Transcript, chunk or partial summaries
+            style: "complete", "chunk", "merge" or "final"
 
-Chỉ trả về nội dung tóm tắt, không giải thích thêm."""
+        Returns:
+            Prompt text
+        """
+        return SUMMARY_PROMPTS[style].format(text=text)
 
-        if style == "complete":
-            return f"{base_instruction}\n\nNội dung cuộc họp:\n{text}"
-        elif style == "chunk":
-            return (
-                "Tóm tắt ngắn gọn đoạn cuộc họp song ngữ Việt-Nhật sau bằng tiếng Việt.\n"
-                "Giữ thuật ngữ tiếng Nhật kèm nghĩa Việt trong ngoặc.\n\n"
-                f"{text}"
-            )
-        else:  # final
-            return f"{base_instruction}\n\nCác tóm tắt phụ:\n{text}"
-    
-    def _call_ollama(self, prompt: str) -> str:
+    def _call_ollama(self, prompt: str, timeout: Optional[float] = None) -> str:
         """
         Call Ollama API
 
         Args:
             prompt: Input prompt
+            timeout: Time limit in seconds (default: config.read_timeout)
 
         Returns:
             Model response
         """
-        url = f"{self.base_url}/api/generate"
-
         payload = {
             "model": self.config.model,
+            "system": SYSTEM_PROMPT,  # Stable prefix: its KV cache is reused across calls
             "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": self.config.temperature,
-                "num_predict": self.config.max_tokens
-            }
+            "stream": self.config.stream,
+            "keep_alive": self.config.keep_alive,
+            "options": self._options()
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=300)
-            response.raise_for_status()
-
-            result = response.json()
-            return result.get("response", "").strip()
+            return self._generate(payload, timeout)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Ollama API error: {e}")
             raise RuntimeError(f"Ollama API error: {e}")
 
-    def _call_ollama_json(self, prompt: str) -> str:
+    def _call_ollama_json(
+        self,
+        prompt: str,
+        timeout: Optional[float] = None,
+        schema: Optional[dict] = None
+    ) -> str:
         """
         Call Ollama API with JSON-optimized parameters
 
+        The output is validated while it streams: generation is aborted as
+        soon as it can no longer be valid JSON, or once the top-level object
+        is complete.
+
         Args:
             prompt: Input prompt for JSON extraction
+            timeout: Time limit in seconds (default: config.read_timeout)
+            schema: JSON Schema sent as `format` (structured outputs)
 
         Returns:
-            Raw JSON string response
-        """
-        url = f"{self.base_url}/api/generate"
+            Raw JSON string response (possibly truncated, see _generate)
 
+        Raises:
+            ValueError: If the output is not a well-formed JSON object
+        """
         payload = {
             "model": self.config.model,
+            "system": SYSTEM_PROMPT,
             "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.1,  # Lower temperature for more deterministic JSON output
-                "num_predict": 4000,  # Longer context for structured data
-                "top_p": 0.9
-            },
-            "format": "json"  # Request JSON format output from Ollama
+            "stream": self.config.stream,
+            "keep_alive": self.config.keep_alive,
+            "options": self._options(
+                temperature=0.1,  # Lower temperature for more deterministic JSON output
+                num_predict=JSON_NUM_PREDICT,
+                top_p=0.9
+            ),
+            # Schema-constrained decoding when supported, else plain JSON mode
+            "format": schema if schema is not None and self.config.structured_output else "json"
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=300)
-            response.raise_for_status()
-
-            result = response.json()
-            return result.get("response", "").strip()
+            return self._generate(payload, timeout, validator=JsonStreamValidator())
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Ollama JSON API error: {e}")
             raise RuntimeError(f"Ollama JSON API error: {e}")
-    
+
+    def _generate(
+        self,
+        payload: dict,
+        timeout: Optional[float] = None,
+        validator: Optional[JsonStreamValidator] = None
+    ) -> str:
+        """
+        Run one generation, streamed or not, recording an llm.generate span
+
+        The span carries time to first token, generated tokens and tokens/sec
+        (Ollama's eval_count / eval_duration when the call ran to completion).
+
+        Args:
+            payload: /api/generate request body
+            timeout: Time limit in seconds (default: config.read_timeout)
+            validator: Incremental JSON validator for format=json calls
+
+        Returns:
+            Response text (for JSON calls, exactly the top-level object)
+        """
+        timeout = timeout or self.config.read_timeout
+        with span("llm.generate", streamed=bool(payload["stream"]), json=validator is not None) as record:
+            if payload["stream"]:
+                text = self._generate_streamed(payload, timeout, validator, record)
+            else:
+                result = self.client.generate(payload, read_timeout=timeout)
+                text = result.get("response", "")
+                # Non-streamed: time to first token = model load + prompt processing
+                record["ttft_seconds"] = round(
+                    (result.get("load_duration", 0) + result.get("prompt_eval_duration", 0)) / 1e9, 4
+                )
+                self._record_rate(record, result, result.get("eval_count", 0), None)
+                if validator is not None:
+                    validator.feed(text)
+
+            if validator is not None:
+                record["json_valid"] = validator.finish() == COMPLETE
+                if validator.truncated:
+                    # Cut off by num_predict: the caller can close it (json_repair)
+                    record["json_truncated"] = True
+                elif validator.status == INVALID:
+                    raise ValueError(f"Invalid JSON from model: {validator.error}")
+                return validator.text
+
+            return text.strip()
+
+    def _generate_streamed(
+        self,
+        payload: dict,
+        timeout: float,
+        validator: Optional[JsonStreamValidator],
+        record: dict
+    ) -> str:
+        """Consume /api/generate as a stream, stopping early on complete or invalid JSON"""
+        started = time.perf_counter()
+        first_token: Optional[float] = None
+        pieces: List[str] = []
+        final: dict = {}
+        stream = self.client.generate_stream(payload, read_timeout=timeout)
+
+        try:
+            for data in stream:
+                if data.get("done"):
+                    final = data
+                    break
+
+                piece = data.get("response", "")
+                if not piece:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter()
+                    record["ttft_seconds"] = round(first_token - started, 4)
+                pieces.append(piece)
+
+                if validator is not None:
+                    # Stop as soon as the object closes: format=json models can pad
+                    # with whitespace up to num_predict, or stall before "done"
+                    # (Ollama's eval counters are lost; chunk counts are used instead)
+                    status = validator.feed(piece)
+                    if status == COMPLETE:
+                        record["stopped"] = "json_complete"
+                        break
+                    if status == INVALID:
+                        record["stopped"] = "invalid_json"
+                        break
+
+                if time.perf_counter() - started > timeout:
+                    record["stopped"] = "timeout"
+                    raise RuntimeError(f"Ollama generation exceeded {timeout:.0f}s")
+        finally:
+            stream.close()  # Disconnecting stops generation on the server
+            self._record_rate(record, final, len(pieces), first_token)
+
+        return "".join(pieces)
+
+    @staticmethod
+    def _record_rate(record: dict, final: dict, chunks: int, first_token: Optional[float]):
+        """Generated tokens, tokens/sec and prompt evaluation from Ollama's counters, else from streamed chunks"""
+        if final.get("eval_count") and final.get("eval_duration"):
+            tokens = final["eval_count"]
+            seconds = final["eval_duration"] / 1e9
+        else:
+            # Aborted stream: Ollama sends one token per chunk
+            tokens = chunks
+            seconds = time.perf_counter() - first_token if first_token is not None else 0.0
+
+        record["eval_tokens"] = tokens
+        record["eval_seconds"] = round(seconds, 4)
+        record["tokens_per_second"] = round(tokens / seconds, 1) if seconds > 0 else None
+        if "prompt_eval_count" in final:
+            # Tokens Ollama had to evaluate: the prefix cached from earlier calls is not counted
+            record["prompt_eval_tokens"] = final["prompt_eval_count"]
+            record["prompt_eval_seconds"] = round(final.get("prompt_eval_duration", 0) / 1e9, 4)
+        logger.debug(
+            f"LLM call: ttft {record.get('ttft_seconds')}s, {tokens} tokens, "
+            f"{record['tokens_per_second']} tok/s"
+        )
+
+    def unload_model(self):
+        """
+        Ask the server to release the model from VRAM now (Ollama: keep_alive=0)
+        """
+        try:
+            self.client.unload(self.config.model)
+            logger.info(f"{self.client.name} model {self.config.model} unloaded")
+        except Exception as e:
+            logger.warning(f"Could not unload {self.client.name} model: {e}")
+
     def _check_ollama(self) -> bool:
         """
-        Check if Ollama is running
+        Check if the LLM server is running (uses the cached model list)
         
         Returns:
             True if running
         """
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
-            return response.status_code == 200
-        except:
-            return False
+        return self.client.is_available()
+
+    def _server_down_message(self) -> str:
+        if self.config.backend == "ollama":
+            return "Ollama not running. Please start: ollama serve"
+        return f"{self.client.name} not running at {self.config.base_url}"
     
     def _ensure_model_exists(self):
         """
-        Check and pull model if not exists
+        Check and pull model if not exists (cached for config.model_check_ttl)
         """
         try:
-            # Check available models
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
-            response.raise_for_status()
-            
-            models = response.json().get("models", [])
-            model_names = [m["name"] for m in models]
-            
-            if self.config.model not in model_names:
+            if not self.client.has_model(self.config.model):
                 logger.info(f"Model {self.config.model} not found, pulling...")
                 self._pull_model()
         except Exception as e:
@@ -298,21 +630,11 @@ Chỉ trả về nội dung tóm tắt, không giải thích thêm."""
     
     def _pull_model(self):
         """
-        Pull model from Ollama
+        Pull model from Ollama (other backends raise)
         """
-        url = f"{self.base_url}/api/pull"
-        payload = {"name": self.config.model}
-        
         try:
-            response = requests.post(url, json=payload, stream=True, timeout=3600)
-            response.raise_for_status()
-            
             logger.info("Downloading model...")
-            for line in response.iter_lines():
-                if line:
-                    data = json.loads(line)
-                    logger.debug(f"Model pull: {data.get('status', '')}")
-            
+            self.client.pull(self.config.model)
             logger.info("Model downloaded successfully")
         except Exception as e:
             logger.error(f"Failed to pull model: {e}")
@@ -6,7 +6,10 @@ import tempfile
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
 from ..utils.logger import logger
+from ..utils.file_handler import get_audio_duration
 from config.settings import FFMPEG
 
 
@@ -67,17 +70,88 @@ class AudioProcessor:
             logger.error("FFmpeg not found. Please install FFmpeg.")
             raise RuntimeError("FFmpeg không được cài đặt")
     
+    def load_pcm(self, input_path: Path, block_size: int = 1024 * 1024) -> np.ndarray:
+        """
+        Decode audio straight into memory (no intermediate WAV)
+
+        FFmpeg writes raw s16le PCM to stdout; it is read in blocks and converted
+        into a preallocated float32 array, which faster-whisper accepts directly.
+
+        Args:
+            input_path: Input audio file
+            block_size: Bytes read from the pipe per iteration
+
+        Returns:
+            Mono float32 samples in [-1, 1] at config.sample_rate
+        """
+        logger.info(f"Decoding audio to memory: {input_path.name}")
+
+        cmd = self._build_ffmpeg_command(input_path, None)
+
+        count = 0
+        leftover = b""
+
+        try:
+            # Preallocate from ffprobe duration (+1s slack); grown if it was off
+            duration = get_audio_duration(input_path)
+            capacity = int((duration + 1) * self.config.sample_rate * self.config.channels)
+            samples = np.empty(capacity, dtype=np.float32)
+
+            with tempfile.TemporaryFile() as stderr_file:
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+                try:
+                    while True:
+                        block = process.stdout.read(block_size)
+                        if not block:
+                            break
+
+                        # Keep int16 alignment across reads
+                        block = leftover + block
+                        usable = len(block) - (len(block) % 2)
+                        leftover = block[usable:]
+                        pcm = np.frombuffer(block[:usable], dtype=np.int16)
+
+                        if count + len(pcm) > len(samples):
+                            grown = np.empty(max(len(samples) * 2, count + len(pcm)), dtype=np.float32)
+                            grown[:count] = samples[:count]
+                            samples = grown
+
+                        samples[count:count + len(pcm)] = pcm
+                        count += len(pcm)
+                finally:
+                    process.stdout.close()
+                    returncode = process.wait()
+
+                if returncode != 0:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read().decode("utf-8", errors="replace")
+                    logger.error(f"FFmpeg error: {stderr}")
+                    raise RuntimeError(f"Failed to preprocess audio: {stderr}")
+
+        except FileNotFoundError:
+            logger.error("FFmpeg not found. Please install FFmpeg.")
+            raise RuntimeError("FFmpeg không được cài đặt")
+
+        samples = samples[:count]
+        samples *= 1.0 / 32768.0
+
+        logger.info(
+            f"Audio decoded: {count / self.config.sample_rate:.1f}s "
+            f"({samples.nbytes / (1024 * 1024):.1f} MB in memory)"
+        )
+        return samples
+
     def _build_ffmpeg_command(
         self,
         input_path: Path,
-        output_path: Path
+        output_path: Optional[Path]
     ) -> list:
         """
         Build FFmpeg command with filters
         
         Args:
             input_path: Input file
-            output_path: Output file
+            output_path: Output file, or None for raw s16le PCM on stdout
             
         Returns:
             FFmpeg command list
@@ -104,7 +178,10 @@ class AudioProcessor:
         if filters:
             cmd.extend(['-af', ','.join(filters)])
         
-        cmd.append(str(output_path))
+        if output_path is None:
+            cmd.extend(['-f', 's16le', '-loglevel', 'error', 'pipe:1'])
+        else:
+            cmd.append(str(output_path))
         
         return cmd
     
@@ -0,0 +1,125 @@
+"""
+Split long audio into windows at VAD silences for parallel transcription
+File: src/transcription/chunking.py
+"""
+from dataclasses import dataclass
+from typing import List, Dict, Iterable, Iterator
+
+import numpy as np
+
+from ..utils.logger import logger
+
+
+@dataclass
+class AudioWindow:
+    """One transcription window (all positions in samples)
+
+    [start, end) is the part of the timeline this window owns; the model is fed
+    the padded range [pad_start, pad_end) so words at a hard cut are not lost.
+    """
+    index: int
+    start: int
+    end: int
+    pad_start: int
+    pad_end: int
+
+    def owns(self, seconds: float, sample_rate: int) -> bool:
+        """True if a global timestamp belongs to this window"""
+        return self.start <= seconds * sample_rate < self.end
+
+
+def detect_speech(samples: np.ndarray, sample_rate: int, min_silence_ms: int = 500) -> List[Dict[str, int]]:
+    """
+    Speech regions via faster-whisper's Silero VAD
+
+    Returns:
+        List of {'start', 'end'} sample offsets
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    options = VadOptions(min_silence_duration_ms=min_silence_ms, speech_pad_ms=200)
+    return get_speech_timestamps(samples, options, sampling_rate=sample_rate)
+
+
+def plan_windows(
+    speech: Iterable[Dict[str, int]],
+    total_samples: int,
+    sample_rate: int,
+    window_seconds: float,
+    overlap_seconds: float
+) -> List[AudioWindow]:
+    """
+    Group speech regions into windows of at most window_seconds
+
+    Cuts are placed in the middle of the silence between two speech regions.
+    A single region longer than a window is cut hard; the overlap padding
+    then lets both neighbours see the words at the cut.
+
+    Args:
+        speech: Speech regions from detect_speech()
+        total_samples: Length of the audio
+        sample_rate: Samples per second
+        window_seconds: Target maximum window length
+        overlap_seconds: Padding added on both sides of every window
+
+    Returns:
+        Windows covering [0, total_samples) in order; silence-only windows are dropped
+    """
+    max_len = max(1, int(window_seconds * sample_rate))
+    pad = int(overlap_seconds * sample_rate)
+
+    speech = list(speech)
+    cuts = [0]
+    window_start = 0
+    last_end = 0
+
+    for region in speech:
+        if region["end"] - window_start > max_len and last_end > window_start:
+            cut = (last_end + region["start"]) // 2
+            cuts.append(cut)
+            window_start = cut
+
+        while region["end"] - window_start > max_len:
+            window_start += max_len
+            cuts.append(window_start)
+
+        last_end = region["end"]
+
+    cuts.append(total_samples)
+
+    windows = []
+    for start, end in zip(cuts, cuts[1:]):
+        if end <= start:
+            continue
+        if not any(r["end"] > start and r["start"] < end for r in speech):
+            continue
+        windows.append(AudioWindow(
+            index=len(windows),
+            start=start,
+            end=end,
+            pad_start=max(0, start - pad),
+            pad_end=min(total_samples, end + pad)
+        ))
+
+    logger.info(
+        f"Planned {len(windows)} windows for {total_samples / sample_rate:.0f}s audio "
+        f"({len(speech)} speech regions)"
+    )
+    return windows
+
+
+def stitch_segments(windows_segments: Iterable[List[dict]]) -> Iterator[dict]:
+    """
+    Merge per-window segments (already in global time) into one ordered stream
+
+    Each window only keeps segments whose midpoint it owns, so most overlap is
+    gone already; this drops the remaining case of the same sentence decoded
+    by both neighbours across a cut.
+    """
+    prev = None
+    for segments in windows_segments:
+        for seg in segments:
+            if prev is not None and seg["start"] < prev["end"] and seg["text"] == prev["text"]:
+                continue
+            yield seg
+            prev = seg
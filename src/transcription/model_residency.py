@@ -0,0 +1,164 @@
+"""
+Whisper model residency (keep warm / unload) and VRAM handoff with Ollama
+File: src/transcription/model_residency.py
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, Any
+
+from ..utils.logger import logger
+from config.settings import RESIDENCY
+
+
+# Residency policies
+ALWAYS_RESIDENT = "always"
+IDLE_TIMEOUT = "idle_timeout"
+UNLOAD_BEFORE_LLM = "unload_before_llm"
+POLICIES = (ALWAYS_RESIDENT, IDLE_TIMEOUT, UNLOAD_BEFORE_LLM)
+
+
+class ModelResidencyManager:
+    """Decide when the Whisper model is loaded/unloaded
+
+    Policies:
+      - always: load once (preload at startup) and keep it resident
+      - idle_timeout: unload after `whisper_idle_timeout` seconds without jobs
+      - unload_before_llm: free VRAM for the LLM stage when no job is transcribing
+    """
+
+    def __init__(self, whisper_service, llm_service=None, config=None):
+        """
+        Initialize residency manager
+
+        Args:
+            whisper_service: WhisperService instance
+            llm_service: LLMService instance (for handing VRAM back from Ollama)
+            config: ResidencyConfig instance
+        """
+        self.config = config or RESIDENCY
+        if self.config.whisper_policy not in POLICIES:
+            raise ValueError(
+                f"Unknown residency policy: {self.config.whisper_policy}. "
+                f"Use one of: {', '.join(POLICIES)}"
+            )
+
+        self.whisper_service = whisper_service
+        self.llm = llm_service
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._llm_active = 0
+        self._last_used = time.time()
+        self._load_count = 0
+        self._unload_count = 0
+        self._monitor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Preload (if configured) and start the idle monitor"""
+        if self.config.preload_on_startup:
+            try:
+                self._load()
+                self._last_used = time.time()
+            except Exception as e:
+                logger.error(f"Whisper preload failed: {e}", exc_info=True)
+
+        if self.config.whisper_policy == IDLE_TIMEOUT and self._monitor is None:
+            self._monitor = threading.Thread(
+                target=self._idle_loop,
+                name="whisper-residency",
+                daemon=True
+            )
+            self._monitor.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @contextmanager
+    def use_whisper(self):
+        """Mark the Whisper model as in use for the duration of a transcription"""
+        with self._lock:
+            self._active += 1
+            # Staged mode: another job may be summarizing right now
+            unload_llm = self.config.unload_llm_before_whisper and self.llm is not None and not self._llm_active
+
+        if unload_llm:
+            self.llm.unload_model()
+        try:
+            self._load()
+            yield self.whisper_service
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._last_used = time.time()
+
+    @contextmanager
+    def use_llm(self):
+        """Mark the LLM as in use for the duration of the summarize/extract stage"""
+        self.before_llm()
+        with self._lock:
+            self._llm_active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._llm_active -= 1
+
+    def before_llm(self):
+        """Called before the LLM stage: apply unload_before_llm policy"""
+        if self.config.whisper_policy != UNLOAD_BEFORE_LLM:
+            return
+
+        with self._lock:
+            # Staged mode: another job may be transcribing right now
+            if self._active > 0:
+                return
+            self._unload()
+
+    def status(self) -> Dict[str, Any]:
+        """Current residency, for /api/health"""
+        with self._lock:
+            loaded = self.whisper_service.is_loaded()
+            return {
+                "status": "ok",
+                "policy": self.config.whisper_policy,
+                "resident": loaded,
+                "device": self.whisper_service.loaded_device,
+                "active_jobs": self._active,
+                "active_llm_jobs": self._llm_active,
+                "idle_seconds": round(time.time() - self._last_used, 1) if not self._active else 0,
+                "idle_timeout": self.config.whisper_idle_timeout if self.config.whisper_policy == IDLE_TIMEOUT else None,
+                "load_count": self._load_count,
+                "unload_count": self._unload_count,
+                "last_load_seconds": _round(self.whisper_service.last_load_seconds),
+                "last_unload_seconds": _round(self.whisper_service.last_unload_seconds),
+                "ollama_keep_alive": self.llm.config.keep_alive if self.llm is not None else None
+            }
+
+    def _load(self):
+        if self.whisper_service.is_loaded():
+            return
+        self.whisper_service.load_model()
+        with self._lock:
+            self._load_count += 1
+
+    def _unload(self):
+        """Unload Whisper (caller holds the lock)"""
+        if not self.whisper_service.is_loaded():
+            return
+        self.whisper_service.unload_model()
+        self._unload_count += 1
+
+    def _idle_loop(self):
+        interval = max(1.0, min(30.0, self.config.whisper_idle_timeout / 4))
+        while not self._stop.wait(interval):
+            with self._lock:
+                idle = time.time() - self._last_used
+                if self._active == 0 and idle >= self.config.whisper_idle_timeout and self.whisper_service.is_loaded():
+                    logger.info(f"Whisper idle for {idle:.0f}s, unloading")
+                    self._unload()
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
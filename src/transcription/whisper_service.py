@@ -3,11 +3,16 @@ Faster-Whisper transcription service - Robust Version
 """
 import os
 import sys
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Callable
+from types import SimpleNamespace
+from typing import Optional, Callable, Iterator, Tuple, Any, Union, List
 import time
 
+import numpy as np
+
 # Suppress warnings
 warnings.filterwarnings('ignore')
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
@@ -23,7 +28,15 @@ except:
     from faster_whisper import WhisperModel
 
 from ..utils.logger import logger
-from config.settings import TRANSCRIPTION, APP
+from ..utils.tracing import span
+from ..utils.file_handler import get_audio_duration
+from .chunking import AudioWindow, detect_speech, plan_windows, stitch_segments
+from config.settings import TRANSCRIPTION, FFMPEG, APP
+
+# File path or 16 kHz mono float32 PCM samples
+AudioInput = Union[Path, np.ndarray]
+
+INFERENCE_MODES = ("sequential", "batched")
 
 def _setup_cudnn_path():
     """Setup cuDNN path"""
@@ -48,13 +61,35 @@ class WhisperService:
     def __init__(self, config=None):
         self.config = config or TRANSCRIPTION
         self.model = None
+        self._batched = None
         self.model_path = APP.models_cache / self.config.model
+        self._load_lock = threading.Lock()
+
+        # Residency info (reported by ModelResidencyManager)
+        self.loaded_device: Optional[str] = None
+        self.last_load_seconds: Optional[float] = None
+        self.last_unload_seconds: Optional[float] = None
         
     def load_model(self):
-        """Load Whisper model"""
+        """Load Whisper model (thread-safe, loads once)"""
         if self.model is not None:
             return
-        
+
+        with self._load_lock:
+            if self.model is None:
+                with span("whisper.load_model"):
+                    self._load_model()
+
+    def _chunking_enabled(self) -> bool:
+        """Whether parallel-window transcription can be used at all"""
+        # Batched inference already parallelizes across speech segments
+        return (
+            self.config.inference_mode != "batched"
+            and self.config.chunked_mode != "off"
+            and self.config.num_workers >= 2
+        )
+
+    def _load_model(self):
         _setup_cudnn_path()
         
         logger.info(f"Loading Whisper model: {self.config.model}")
@@ -86,10 +121,13 @@ class WhisperService:
                 self.config.model,
                 device=device,
                 compute_type=compute_type,
-                download_root=str(self.model_path.parent)
+                download_root=str(self.model_path.parent),
+                **self._worker_kwargs(device)
             )
             
             load_time = time.time() - start_time
+            self.loaded_device = device
+            self.last_load_seconds = load_time
             logger.info(f"Model loaded on {device.upper()} in {load_time:.2f}s")
             
         except Exception as e:
@@ -99,50 +137,228 @@ class WhisperService:
                     self.config.model,
                     device="cpu",
                     compute_type="float32",
-                    download_root=str(self.model_path.parent)
+                    download_root=str(self.model_path.parent),
+                    **self._worker_kwargs("cpu")
                 )
+                self.loaded_device = "cpu"
+                self.last_load_seconds = time.time() - start_time
                 logger.warning("Model loaded on CPU (fallback)")
             else:
                 raise
     
+    def _worker_kwargs(self, device: str) -> dict:
+        """num_workers / cpu_threads for WhisperModel
+
+        Each worker is a model replica, so GPU stays at 1 to keep VRAM flat.
+        On CPU the layout is fixed for the process: with chunking enabled the
+        cores are split across num_workers replicas (a single transcription
+        runs on one of them); otherwise one worker keeps CTranslate2's
+        default threads. The same model then serves both paths, and is never
+        reloaded while windows are still being transcribed.
+        """
+        if device != "cpu" or not self._chunking_enabled():
+            return {}
+
+        workers = max(1, self.config.num_workers)
+        threads = self.config.cpu_threads or max(1, (os.cpu_count() or 1) // workers)
+        return {"num_workers": workers, "cpu_threads": threads}
+
+    def use_chunked(self, audio: AudioInput) -> bool:
+        """Whether to transcribe in parallel windows (see TranscriptionConfig.chunked_mode)"""
+        mode = self.config.chunked_mode
+        if not self._chunking_enabled():
+            return False
+        if mode == "on":
+            return True
+
+        if self.model is None:
+            self.load_model()
+        if self.loaded_device != "cpu":
+            return False
+
+        if isinstance(audio, np.ndarray):
+            duration = len(audio) / FFMPEG.sample_rate
+        else:
+            duration = get_audio_duration(audio)
+        return duration >= self.config.chunk_min_duration
+
+    def iter_segments(self, audio: AudioInput) -> Tuple[Iterator[dict], Any]:
+        """
+        Start transcription and return a lazy segment iterator
+
+        Args:
+            audio: WAV/audio file path, or 16 kHz mono float32 samples
+
+        faster-whisper decodes on demand, so each segment is available as soon
+        as its window is decoded instead of after the whole file.
+
+        Returns:
+            Tuple of (iterator of {'start', 'end', 'text'} dicts, TranscriptionInfo)
+        """
+        if self.model is None:
+            self.load_model()
+
+        logger.info("Calling model.transcribe()...")
+        segments_iter, info = self._model_transcribe(audio)
+
+        def _iter():
+            for seg in segments_iter:
+                text = seg.text.strip()
+                if text:
+                    yield {'start': seg.start, 'end': seg.end, 'text': text}
+
+        return _iter(), info
+
+    def iter_segments_chunked(self, audio: AudioInput) -> Tuple[Iterator[dict], Any]:
+        """
+        Transcribe long audio as VAD-cut windows on num_workers parallel workers
+
+        Windows are submitted all at once and consumed in order, so segments are
+        still yielded in timeline order (with global timestamps).
+
+        Args:
+            audio: Audio file path, or 16 kHz mono float32 samples
+
+        Returns:
+            Tuple of (iterator of {'start', 'end', 'text'} dicts, info with
+            language, language_probability and duration)
+        """
+        if self.model is None:
+            self.load_model()
+
+        sample_rate = FFMPEG.sample_rate
+        if isinstance(audio, np.ndarray):
+            samples = audio
+        else:
+            from faster_whisper import decode_audio
+            samples = decode_audio(str(audio), sampling_rate=sample_rate)
+
+        windows = plan_windows(
+            detect_speech(samples, sample_rate),
+            len(samples),
+            sample_rate,
+            self.config.chunk_length,
+            self.config.chunk_overlap
+        )
+        workers = max(1, self.config.num_workers)
+        logger.info(f"Chunked transcription: {len(windows)} windows on {workers} workers")
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper-window")
+        futures = [
+            executor.submit(self._transcribe_window, samples, window, sample_rate)
+            for window in windows
+        ]
+
+        info = SimpleNamespace(
+            language=self.config.language,
+            language_probability=1.0 if self.config.language else 0.0,
+            duration=len(samples) / sample_rate
+        )
+        if futures:
+            # Report the first window's detected language
+            first_info = futures[0].result()[1]
+            info.language = first_info.language
+            info.language_probability = first_info.language_probability
+
+        def _results():
+            try:
+                for future in futures:
+                    yield future.result()[0]
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        return stitch_segments(_results()), info
+
+    def _transcribe_window(
+        self,
+        samples: np.ndarray,
+        window: AudioWindow,
+        sample_rate: int
+    ) -> Tuple[List[dict], Any]:
+        """Transcribe one window; keep the segments it owns, in global time"""
+        offset = window.pad_start / sample_rate
+        segments_iter, info = self._model_transcribe(samples[window.pad_start:window.pad_end])
+
+        segments = []
+        for seg in segments_iter:
+            text = seg.text.strip()
+            start, end = seg.start + offset, seg.end + offset
+            if text and window.owns((start + end) / 2, sample_rate):
+                segments.append({'start': start, 'end': end, 'text': text})
+        return segments, info
+
+    def _model_transcribe(self, audio: AudioInput):
+        mode = self.config.inference_mode
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode: {mode}. Use one of: {', '.join(INFERENCE_MODES)}")
+
+        options = dict(
+            beam_size=self.config.beam_size,
+            language=self.config.language,  # None = auto-detect for bilingual meetings
+            task="transcribe",
+            vad_filter=self.config.vad_filter,
+            vad_parameters=dict(
+                threshold=0.5,
+                min_speech_duration_ms=250,
+                min_silence_duration_ms=1500,  # Reduced for fast-paced marketing dialogue
+                speech_pad_ms=400
+            ),
+            initial_prompt=self.config.initial_prompt,
+            word_timestamps=False
+        )
+        source = audio if isinstance(audio, np.ndarray) else str(audio)
+
+        if mode == "batched":
+            # Speech segments are decoded independently, so no previous-text conditioning
+            return self._batched_pipeline().transcribe(
+                source,
+                batch_size=self.config.batch_size,
+                **options
+            )
+
+        return self.model.transcribe(source, condition_on_previous_text=True, **options)
+
+    def _batched_pipeline(self):
+        """BatchedInferencePipeline around the loaded model (created once)"""
+        if self._batched is None or self._batched.model is not self.model:
+            from faster_whisper import BatchedInferencePipeline
+            self._batched = BatchedInferencePipeline(model=self.model)
+        return self._batched
+
     def transcribe(
         self,
-        audio_path: Path,
-        progress_callback: Optional[Callable[[float, str], None]] = None
+        audio: AudioInput,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        segment_callback: Optional[Callable[[dict], None]] = None
     ) -> str:
         """
-        Transcribe with robust segment processing
+        Transcribe audio, consuming segments as they are decoded
+
+        Args:
+            audio: Preprocessed audio file, or 16 kHz mono float32 samples
+                from AudioProcessor.load_pcm() (no intermediate WAV)
+            progress_callback: Callback function(progress: float, status: str),
+                driven by seg.end / duration (10% -> 80%)
+            segment_callback: Called with each {'start', 'end', 'text'} segment
+                as soon as it is decoded (live partial transcript)
+
+        Returns:
+            Full transcript text
         """
-        if self.model is None:
-            self.load_model()
-        
-        logger.info(f"Starting transcription: {audio_path.name}")
+        source = f"{len(audio)} samples (in memory)" if isinstance(audio, np.ndarray) else audio.name
+        logger.info(f"Starting transcription: {source}")
         start_time = time.time()
-        
+
+        # Suppress stderr completely
+        import io
+        _stderr_backup = sys.stderr
+        sys.stderr = io.StringIO()
+
         try:
-            # Suppress stderr completely
-            import io
-            _stderr_backup = sys.stderr
-            sys.stderr = io.StringIO()
-            
-            # Step 1: Get segments iterator
-            logger.info("Calling model.transcribe()...")
-            segments_iter, info = self.model.transcribe(
-                str(audio_path),
-                beam_size=self.config.beam_size,
-                language=self.config.language,  # None = auto-detect for bilingual meetings
-                task="transcribe",
-                vad_filter=self.config.vad_filter,
-                vad_parameters=dict(
-                    threshold=0.5,
-                    min_speech_duration_ms=250,
-                    min_silence_duration_ms=1500,  # Reduced for fast-paced marketing dialogue
-                    speech_pad_ms=400
-                ),
-                initial_prompt=self.config.initial_prompt,
-                word_timestamps=False,
-                condition_on_previous_text=True
-            )
+            if self.use_chunked(audio):
+                segments, info = self.iter_segments_chunked(audio)
+            else:
+                segments, info = self.iter_segments(audio)
 
             detected_lang = info.language
             lang_prob = info.language_probability
@@ -151,93 +367,64 @@ class WhisperService:
             else:
                 logger.info(f"Language: {detected_lang} ({lang_prob:.2f})")
             logger.info(f"Duration: {info.duration:.2f}s")
-            
-            # Step 2: Convert to list immediately (safer than iterating)
-            logger.info("Converting segments to list...")
-            segments_list = []
-            
-            try:
-                # Use list() to consume iterator - faster and safer
-                raw_segments = list(segments_iter)
-                logger.info(f"Got {len(raw_segments)} raw segments")
-                
-                # Convert to our format
-                for seg in raw_segments:
-                    try:
-                        segments_list.append({
-                            'start': seg.start,
-                            'end': seg.end,
-                            'text': seg.text.strip()
-                        })
-                    except:
-                        continue
-                
-            except Exception as e:
-                logger.error(f"Error converting segments: {e}")
-                # If list() fails, try manual iteration with timeout
-                logger.info("Trying manual iteration...")
-                segment_count = 0
-                last_update = time.time()
-                
-                for seg in segments_iter:
+
+            # Build text incrementally - only the lines are kept, not the Segment objects
+            lines = []
+            prev_end = 0.0
+            segment_count = 0
+            last_update = 0.0
+
+            for seg in segments:
+                if seg['start'] - prev_end > 3.0:
+                    lines.append("")
+                lines.append(seg['text'])
+                prev_end = seg['end']
+                segment_count += 1
+
+                if segment_callback:
                     try:
-                        segments_list.append({
-                            'start': seg.start,
-                            'end': seg.end,
-                            'text': seg.text.strip()
-                        })
-                        segment_count += 1
-                        
-                        # Progress update every 1 second
-                        current = time.time()
-                        if progress_callback and current - last_update >= 1.0:
-                            if info.duration:
-                                pct = min(75, (seg.end / info.duration) * 75)
-                                progress_callback(10 + pct, f"Processing... {seg.end/60:.1f} min")
-                            last_update = current
-                        
-                        # Safety: Break if taking too long
-                        if time.time() - start_time > 600:  # 10 min timeout
-                            logger.warning("Timeout, breaking")
-                            break
-                            
-                    except StopIteration:
-                        break
-                    except Exception as e2:
-                        logger.warning(f"Segment error: {e2}")
-                        continue
-            
-            # Restore stderr
-            sys.stderr = _stderr_backup
-            
-            logger.info(f"Processed {len(segments_list)} segments")
-            
-            if not segments_list:
+                        segment_callback(seg)
+                    except Exception as e:
+                        logger.warning(f"Segment callback error: {e}")
+
+                # Progress update at most once per second
+                current = time.time()
+                if progress_callback and info.duration and current - last_update >= 1.0:
+                    pct = min(1.0, seg['end'] / info.duration)
+                    progress_callback(
+                        10 + pct * 70,
+                        f"Transcribing... {seg['end']/60:.1f}/{info.duration/60:.1f} min"
+                    )
+                    last_update = current
+
+            logger.info(f"Processed {segment_count} segments")
+
+            if not segment_count:
                 logger.error("No segments!")
                 return ""
-            
-            # Combine
-            full_text = self._combine_segments(segments_list)
-            
+
+            full_text = '\n'.join(lines).strip()
+
             transcribe_time = time.time() - start_time
             logger.info(f"Completed in {transcribe_time:.2f}s")
-            
+
             if info.duration:
                 logger.info(f"Speed: {info.duration/transcribe_time:.1f}x")
-            
+
             if progress_callback:
-                progress_callback(85.0, "Transcription completed")
-            
+                progress_callback(80.0, "Transcription completed")
+
             return full_text
-            
+
         except KeyboardInterrupt:
-            sys.stderr = _stderr_backup
             logger.warning("Interrupted")
             raise
         except Exception as e:
-            sys.stderr = _stderr_backup
             logger.error(f"FATAL: {e}", exc_info=True)
             raise RuntimeError(f"Transcription failed: {e}")
+        finally:
+            # Restore stderr
+            sys.stderr = _stderr_backup
     
     def _combine_segments(self, segments: list) -> str:
         """Combine segments into text"""
@@ -255,19 +442,31 @@ class WhisperService:
         
         return '\n'.join(lines).strip()
     
+    def is_loaded(self) -> bool:
+        return self.model is not None
+
     def unload_model(self):
-        """Unload model"""
-        if self.model is not None:
+        """Unload model and release (V)RAM"""
+        with self._load_lock:
+            if self.model is None:
+                return
+
             logger.info("Unloading model")
+            start_time = time.time()
             del self.model
             self.model = None
+            self._batched = None
             
             import gc
             gc.collect()
             
-            if self.config.device == "cuda":
+            if self.loaded_device == "cuda":
                 try:
                     import torch
                     torch.cuda.empty_cache()
                 except:
-                    pass
\ No newline at end of file
+                    pass
+
+            self.loaded_device = None
+            self.last_unload_seconds = time.time() - start_time
+            logger.info(f"Model unloaded in {self.last_unload_seconds:.2f}s")
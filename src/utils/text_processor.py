@@ -1,49 +1,135 @@
 """
 Text processing utilities
 """
-from typing import List
+import math
+import re
+from functools import lru_cache
+from typing import List, Tuple, Callable
 
-def chunk_text(text: str, chunk_size: int, overlap: int = 200) -> List[str]:
+# Han, Hiragana/Katakana, CJK punctuation and full-width forms: tokenizers
+# (Gemma/Qwen) spend about one token per character on these
+_CJK_RE = re.compile(r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]")
+_SPACE_RE = re.compile(r"\s")
+CJK_TOKENS_PER_CHAR = 1.0
+# Vietnamese (Latin + diacritics) averages ~2.5 characters per token
+LATIN_TOKENS_PER_CHAR = 0.4
+
+# Transcript lines (one segment each, blank line between turns) and sentences
+_LINE_RE = re.compile(r"[^\n]*\n+|[^\n]+")
+_SENTENCE_RE = re.compile(r"[^.!?。！？]*[.!?。！？]+\s*|[^.!?。！？]+")
+
+
+@lru_cache(maxsize=8192)
+def estimate_tokens(text: str) -> int:
     """
-    Split text into chunks with overlap
-    
+    Estimate the LLM token count of mixed Vietnamese/Japanese text
+
+    Counts CJK characters and other non-space characters separately, since
+    Japanese costs several times more tokens per character than Vietnamese.
+    Results are cached, so re-measuring the same segments is free.
+
     Args:
         text: Input text
-        chunk_size: Maximum chunk size in characters
-        overlap: Overlap between chunks in characters
-        
+
+    Returns:
+        Estimated token count (rounded up)
+    """
+    cjk = len(_CJK_RE.findall(text))
+    other = len(text) - cjk - len(_SPACE_RE.findall(text))
+    return math.ceil(cjk * CJK_TOKENS_PER_CHAR + other * LATIN_TOKENS_PER_CHAR)
+
+
+def _split_units(text: str, chunk_size: int, length: Callable[[str], int]) -> List[Tuple[str, int]]:
+    """Split text into (piece, size) units no larger than chunk_size: lines, then sentences, then words"""
+    units = []
+    for line in _LINE_RE.findall(text):
+        size = length(line)
+        if size <= chunk_size:
+            units.append((line, size))
+            continue
+
+        for sentence in _SENTENCE_RE.findall(line):
+            size = length(sentence)
+            while size > chunk_size:
+                # Hard cut, at a space if there is one in the second half
+                cut = max(1, int(len(sentence) * chunk_size / size))
+                space = sentence.rfind(" ", cut // 2, cut)
+                cut = space + 1 if space > 0 else cut
+                units.append((sentence[:cut], length(sentence[:cut])))
+                sentence = sentence[cut:]
+                size = length(sentence)
+            if sentence:
+                units.append((sentence, size))
+    return units
+
+
+def chunk_text(
+    text: str,
+    chunk_size: int,
+    overlap: int = 200,
+    length: Callable[[str], int] = len
+) -> List[str]:
+    """
+    Split text into overlapping chunks at segment boundaries
+
+    Chunks are built from whole transcript lines; a chunk closes at the last
+    paragraph (speaker turn) break when one falls in its second half. Lines
+    longer than a chunk are split at sentence ends (. ! ? 。), then words.
+
+    Args:
+        text: Input text
+        chunk_size: Maximum chunk size, in units of `length`
+        overlap: Overlap carried into the next chunk, in units of `length`
+        length: Size function - len (characters) or estimate_tokens (tokens)
+
     Returns:
         List of text chunks
     """
-    if len(text) <= chunk_size:
+    if length(text) <= chunk_size:
         return [text]
-    
+
+    overlap = min(overlap, chunk_size // 4)
     chunks = []
-    start = 0
-    
-    while start < len(text):
-        end = start + chunk_size
-        
-        if end >= len(text):
-            chunks.append(text[start:])
-            break
-        
-        # Try to break at sentence end
-        sentence_end = text.rfind('.', start, end)
-        if sentence_end > start + chunk_size // 2:
-            end = sentence_end + 1
-        else:
-            # Try to break at word boundary
-            word_end = text.rfind(' ', start, end)
-            if word_end > start + chunk_size // 2:
-                end = word_end
-        
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        
-        start = end - overlap
-    
+    current: List[Tuple[str, int]] = []
+    size = 0
+
+    for unit, unit_size in _split_units(text, chunk_size, length):
+        if current and size + unit_size > chunk_size:
+            # Prefer ending at a paragraph break in the second half of the chunk
+            cut = len(current)
+            running = size
+            for i in range(len(current) - 1, 0, -1):
+                running -= current[i][1]
+                if running < chunk_size // 2:
+                    break
+                if current[i - 1][0].endswith("\n\n"):
+                    cut = i
+                    break
+
+            chunk = "".join(u for u, _ in current[:cut]).strip()
+            if chunk:
+                chunks.append(chunk)
+
+            # Carry trailing units (up to `overlap`) plus anything after the cut
+            tail = current[cut:]
+            carried = 0
+            for item in reversed(current[:cut]):
+                if carried + item[1] > overlap:
+                    break
+                tail.insert(0, item)
+                carried += item[1]
+            current = tail
+            size = sum(s for _, s in current)
+
+            while current and size + unit_size > chunk_size:
+                size -= current.pop(0)[1]
+
+        current.append((unit, unit_size))
+        size += unit_size
+
+    chunk = "".join(u for u, _ in current).strip()
+    if chunk:
+        chunks.append(chunk)
     return chunks
 
 def clean_text(text: str) -> str:
@@ -77,7 +163,8 @@ def clean_text(text: str) -> str:
 def format_summary(
     content: str,
     decisions: str = "",
-    actions: str = ""
+    actions: str = "",
+    terms: str = ""
 ) -> str:
     """
     Format summary with sections
@@ -86,6 +173,7 @@ def format_summary(
         content: Main content
         decisions: Decisions made
         actions: Action items
+        terms: Japanese-Vietnamese terminology
         
     Returns:
         Formatted summary
@@ -102,9 +190,46 @@ def format_summary(
     if actions:
         sections.append("\n## HÀNH ĐỘNG CẦN LÀM")
         sections.append(actions)
+
+    if terms:
+        sections.append("\n## THUẬT NGỮ CHUYÊN NGÀNH")
+        sections.append(terms)
     
     return "\n".join(sections)
 
+def render_summary(data: dict) -> str:
+    """
+    Render the markdown summary from a combined summary + extraction result
+
+    Args:
+        data: Dict following config.prompts.COMBINED_SCHEMA
+
+    Returns:
+        Summary in the same layout as the LLM-written one
+    """
+    points = data.get("summary_points") or []
+    if not points:
+        purpose = (data.get("meeting_info") or {}).get("main_purpose")
+        points = [purpose] if purpose else []
+    content = "\n".join(f"- {p}" for p in points if p)
+
+    decisions = []
+    for item in data.get("decisions") or []:
+        if item.get("content"):
+            by = f" ({item['made_by']})" if item.get("made_by") else ""
+            decisions.append(f"- {item['content']}{by}")
+
+    actions = []
+    for item in data.get("action_items") or []:
+        if item.get("task"):
+            who = f"{item['assignee']}: " if item.get("assignee") else ""
+            deadline = f" ({item['deadline']})" if item.get("deadline") else ""
+            actions.append(f"- {who}{item['task']}{deadline}")
+
+    terms = "\n".join(f"- {t}" for t in data.get("terminology") or [] if t)
+
+    return format_summary(content, "\n".join(decisions), "\n".join(actions), terms)
+
 def estimate_word_count(text: str) -> int:
     """
     Estimate word count (Vietnamese-friendly)
@@ -0,0 +1,209 @@
+"""
+Per-job timing spans: wall time, CPU time, peak RSS and GPU memory
+File: src/utils/tracing.py
+
+A JobTrace is bound to the current context with `activate()`; any code running
+in that context (including worker threads started through `run_in_context`)
+can then open spans with `span(name)` without the trace being passed around.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Callable
+
+import psutil
+
+from .logger import logger
+
+_current_trace: contextvars.ContextVar[Optional["JobTrace"]] = contextvars.ContextVar("job_trace", default=None)
+_current_span: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("job_span", default=None)
+_current_record: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("job_span_record", default=None)
+
+# Called with every finished span dict (e.g. the Prometheus aggregator)
+_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+_process = psutil.Process()
+
+
+def add_listener(listener: Callable[[Dict[str, Any]], None]):
+    _listeners.append(listener)
+
+
+def _cpu_seconds() -> float:
+    """Process CPU time including finished child processes (FFmpeg)"""
+    t = _process.cpu_times()
+    return t.user + t.system + getattr(t, "children_user", 0.0) + getattr(t, "children_system", 0.0)
+
+
+class _GpuMemory:
+    """
+    Device-wide used GPU memory through NVML (pynvml / nvidia-ml-py)
+
+    NVML reads the driver's counters without creating a CUDA context, so
+    sampling does not pin VRAM in this process (torch.cuda.mem_get_info
+    would). Covers CTranslate2 and Ollama as well as torch. Disabled for
+    good after the first failure (no driver, no pynvml).
+    """
+
+    def __init__(self, device_index: int = 0):
+        self.device_index = device_index
+        self._nvml = None
+        self._handle = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    def used_bytes(self) -> Optional[int]:
+        if self._disabled:
+            return None
+        try:
+            with self._lock:
+                if self._handle is None:
+                    import pynvml
+                    pynvml.nvmlInit()
+                    self._nvml = pynvml
+                    self._handle = pynvml.nvmlDeviceGetHandleByIndex(self.device_index)
+            return int(self._nvml.nvmlDeviceGetMemoryInfo(self._handle).used)
+        except Exception as e:
+            self._disabled = True
+            logger.debug(f"GPU memory sampling disabled: {e}")
+            return None
+
+
+_gpu_memory = _GpuMemory()
+
+
+def _gpu_used_bytes() -> Optional[int]:
+    """Device-wide used GPU memory, None without an NVIDIA driver or pynvml"""
+    return _gpu_memory.used_bytes()
+
+
+class _ResourceSampler:
+    """Background thread that tracks peak RSS / GPU memory for open spans"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._open: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, record: Dict[str, Any]):
+        with self._lock:
+            self._open[id(record)] = record
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="span-sampler", daemon=True)
+                self._thread.start()
+        self._sample([record])
+
+    def release(self, record: Dict[str, Any]):
+        self._sample([record])
+        with self._lock:
+            self._open.pop(id(record), None)
+
+    def _sample(self, records):
+        rss = _process.memory_info().rss
+        gpu = _gpu_used_bytes()
+        for record in records:
+            record["peak_rss_bytes"] = max(record.get("peak_rss_bytes") or 0, rss)
+            if gpu is not None:
+                record["peak_gpu_bytes"] = max(record.get("peak_gpu_bytes") or 0, gpu)
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                records = list(self._open.values())
+            if records:
+                try:
+                    self._sample(records)
+                except Exception as e:
+                    logger.debug(f"Resource sampling failed: {e}")
+
+
+_sampler = _ResourceSampler()
+
+
+class JobTrace:
+    """Finished spans of one job, in completion order"""
+
+    def __init__(self, job_id: Optional[str] = None):
+        self.job_id = job_id
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        """Make this the current trace for span() calls in this context"""
+        token = _current_trace.set(self)
+        try:
+            yield self
+        finally:
+            _current_trace.reset(token)
+
+    def add(self, record: Dict[str, Any]):
+        with self._lock:
+            self.spans.append(record)
+
+    def summary(self) -> Dict[str, float]:
+        """Total wall seconds per span name"""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for record in self.spans:
+                totals[record["name"]] = round(totals.get(record["name"], 0.0) + record["wall_seconds"], 3)
+        return totals
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Time a block and record it on the current trace
+
+    Metrics are still aggregated (listeners) when no trace is active.
+    CPU time is process-wide, so it includes other work running concurrently.
+
+    Args:
+        name: Span name, e.g. "whisper.transcribe"
+        **attrs: Extra fields stored with the span (chunk index, attempt, ...)
+    """
+    trace = _current_trace.get()
+    record: Dict[str, Any] = {"name": name, "parent": _current_span.get(), **attrs}
+    token = _current_span.set(name)
+    record_token = _current_record.set(record)
+    _sampler.track(record)
+
+    wall_start = time.perf_counter()
+    cpu_start = _cpu_seconds()
+    record["started_at"] = time.time()
+    try:
+        yield record
+        record["status"] = "ok"
+    except BaseException:
+        record["status"] = "error"
+        raise
+    finally:
+        record["wall_seconds"] = round(time.perf_counter() - wall_start, 4)
+        record["cpu_seconds"] = round(_cpu_seconds() - cpu_start, 4)
+        _sampler.release(record)
+        _current_span.reset(token)
+        _current_record.reset(record_token)
+
+        if trace is not None:
+            trace.add(record)
+        for listener in _listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                logger.debug(f"Span listener failed: {e}")
+
+
+def annotate(**attrs):
+    """Add fields to the innermost open span (no-op outside a span)"""
+    record = _current_record.get()
+    if record is not None:
+        record.update(attrs)
+
+
+def run_in_context(func: Callable, *args, **kwargs):
+    """Wrap func so it runs with the caller's trace (for executor.submit)"""
+    ctx = contextvars.copy_context()
+    return lambda: ctx.run(func, *args, **kwargs)